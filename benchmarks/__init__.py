@@ -0,0 +1 @@
+# Offline benchmarks for AI PM Resume Analyzer
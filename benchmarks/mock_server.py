@@ -0,0 +1,372 @@
+"""
+Mock LLM server
+Speaks enough of the OpenAI, Anthropic and Gemini HTTP APIs for the
+analyzer's SDK clients, with configurable latency (fixed plus per output
+token), error rate and canned JSON
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from pipeline.compact import compact_analysis
+
+
+DECISIONS = [(48, 'Strong Screen'), (36, 'Screen'), (24, 'Maybe'), (0, 'No Screen')]
+LEVELS = ['Developing', 'Functional', 'Proficient', 'Advanced', 'Expert']
+
+_RESUME_RE = re.compile(r'# RESUME(?: TO EVALUATE)?\n(.*?)(?:\n# EVALUATION METHODOLOGY|\nReturn ONLY this JSON|$)', re.S)
+_NAME_RE = re.compile(r'^\s*([A-Z][a-z]+ [A-Z][a-z]+)')
+
+
+def _resume_part(prompt):
+    """The resume text inside a full-analysis or prefilter prompt (whole prompt when not found)"""
+    match = _RESUME_RE.search(prompt)
+    return match.group(1).strip() if match else prompt
+
+
+def approx_tokens(text):
+    """Rough token count (~4 characters per token) for usage reporting"""
+    return max(1, len(text) // 4)
+
+
+def canned_analysis(prompt):
+    """
+    Deterministic analysis JSON for a prompt.
+
+    Scores are derived from a hash of the resume text, so the same resume always
+    gets the same result and a corpus gets a realistic spread of decisions.
+    """
+    resume = _resume_part(prompt)
+    digest = hashlib.sha256(resume.encode('utf-8', 'replace')).digest()
+    rng = random.Random(digest)
+    name_match = _NAME_RE.search(resume)
+    pillars = {}
+    for index in range(1, 7):
+        score = rng.randint(3, 10)
+        pillars[f"pillar_{index}"] = {
+            'name': f"Pillar {index}",
+            'score': score,
+            'level': LEVELS[min(4, score // 2)],
+            'evidence': f"Synthetic evidence for pillar {index}",
+            'strengths': [f"Pillar {index} strength {n}" for n in range(1, 3)],
+            'gaps': [f"Pillar {index} gap"],
+        }
+    total = sum(p['score'] for p in pillars.values())
+    decision = next(label for floor, label in DECISIONS if total >= floor)
+    return {
+        'candidate_name': name_match.group(1) if name_match else f"Candidate {digest.hex()[:6]}",
+        'minimum_thresholds_met': {'personal_ai_projects': True, 'building_in_public': rng.random() > 0.3,
+                                   'resume_creativity': rng.random() > 0.5, 'all_met': rng.random() > 0.4},
+        'red_flags_found': ['Only corporate AI experience'] if rng.random() < 0.2 else [],
+        'yellow_flags_found': ['No links or verifiable work products'] if rng.random() < 0.3 else [],
+        'critical_questions_analysis': {'paradigm_shift_examples': ['Synthetic example'],
+                                        'future_proofing_examples': [], 'magic_wand_examples': []},
+        'pillars': pillars,
+        'must_have_signals': {'signals_found': ['At least 1 personal AI project with evidence'],
+                              'signals_missing': [], 'all_present': True},
+        'differentiation_signals': {'signals_found': ['Ships weekly'], 'count': 1,
+                                    'sufficient_for_strong_screen': False},
+        'total_score': total,
+        'decision': decision,
+        'decision_rationale': 'Synthetic rationale from the benchmark mock server.',
+        'top_strengths': ['Hands-on building', 'Clear metrics', 'AI depth'],
+        'top_concerns': ['Limited public presence', 'Short tenures', 'Few evals'],
+        'recommendation': 'Synthetic recommendation.',
+        'suitable_roles': ['AI Product Manager'],
+        'interview_focus_areas': ['Evaluation strategy'],
+    }
+
+
+def canned_screen(prompt):
+    """Deterministic --cascade prefilter reply, consistent with canned_analysis for the same resume"""
+    full = canned_analysis(prompt)
+    pillar_3 = full['pillars']['pillar_3']['score']
+    return {
+        'candidate_name': full['candidate_name'],
+        'minimum_thresholds_met': full['minimum_thresholds_met'],
+        'red_flags_found': full['red_flags_found'],
+        'pillar_3': {'score': pillar_3, 'evidence': 'Synthetic evidence for pillar 3'},
+        'estimated_total_score': full['total_score'],
+        'confidence': 0.9 if abs(pillar_3 - 6) > 1 else 0.6,
+    }
+
+
+_PACKED_RE = re.compile(r'^=== RESUME (\S+) ===\n(.*?)\n=== END RESUME \1 ===$', re.S | re.M)
+
+
+def canned_pack(prompt, compact=False):
+    """Deterministic --pack reply: one canned_analysis per delimited resume, identical to its single-call result"""
+    analyses = []
+    for resume_id, text in _PACKED_RE.findall(prompt):
+        analysis = canned_analysis(f"# RESUME\n{text}")
+        analyses.append({'resume_id': resume_id, **(compact_analysis(analysis) if compact else analysis)})
+    return {'analyses': analyses}
+
+
+_ROLE_RE = re.compile(r'^# ROLE (\S+): ', re.M)
+
+
+def canned_roles(prompt, compact=False):
+    """Deterministic --roles reply; the ai_pm role matches the single-call result, other roles vary with their id"""
+    resume = _resume_part(prompt.split('\n# ROLE ', 1)[0])
+    roles = {}
+    for role_id in _ROLE_RE.findall(prompt):
+        analysis = canned_analysis(f"# RESUME\n{resume}" + ('' if role_id == 'ai_pm' else f"\n{role_id}"))
+        for pillar in analysis['pillars'].values():
+            del pillar['name']
+        roles[role_id] = compact_analysis(analysis) if compact else analysis
+    return {'roles': roles}
+
+
+_PILLAR_RE = re.compile(r'^# PILLAR (\d):', re.M)
+_TOTAL_RE = re.compile(r'^Total score: (\d+(?:\.\d+)?)/60', re.M)
+
+
+def canned_fanout_part(prompt):
+    """Deterministic --fanout reply (one pillar, the flags call or the synthesis), consistent with canned_analysis"""
+    total = _TOTAL_RE.search(prompt)
+    if total:
+        verdict = canned_analysis(prompt)
+        verdict['decision'] = next(label for floor, label in DECISIONS if float(total.group(1)) >= floor)
+        keys = ['decision', 'decision_rationale', 'top_strengths', 'top_concerns', 'recommendation',
+                'suitable_roles', 'interview_focus_areas']
+        return {key: verdict[key] for key in keys}
+    full = canned_analysis(prompt)
+    pillar = _PILLAR_RE.search(prompt)
+    if pillar:
+        return {k: v for k, v in full['pillars'][f"pillar_{pillar.group(1)}"].items() if k != 'name'}
+    return {key: value for key, value in full.items() if key not in ('pillars', 'total_score', 'decision',
+            'decision_rationale', 'top_strengths', 'top_concerns', 'recommendation', 'suitable_roles',
+            'interview_focus_areas')}
+
+
+def _prompt_text(provider, payload):
+    """Concatenate the text parts of a request body"""
+    parts = []
+    if provider == 'google':
+        for content in payload.get('contents', []):
+            parts.extend(part.get('text', '') for part in content.get('parts', []))
+        return '\n'.join(parts)
+    for message in payload.get('messages', []):
+        content = message.get('content')
+        if isinstance(content, str):
+            parts.append(content)
+        else:
+            parts.extend(block.get('text', '') for block in content or [] if isinstance(block, dict))
+    return '\n'.join(parts)
+
+
+def _response_body(provider, model, prompt, text, tool=None):
+    input_tokens, output_tokens = approx_tokens(prompt), approx_tokens(text)
+    if provider == 'openai':
+        return {
+            'id': 'chatcmpl-mock', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': input_tokens, 'completion_tokens': output_tokens,
+                      'total_tokens': input_tokens + output_tokens,
+                      'prompt_tokens_details': {'cached_tokens': 0},
+                      'completion_tokens_details': {'reasoning_tokens': 0}},
+        }
+    if provider == 'anthropic':
+        return {
+            'id': 'msg_mock', 'type': 'message', 'role': 'assistant', 'model': model,
+            # Forced tool use (structured output) answers with a tool_use block
+            'content': ([{'type': 'tool_use', 'id': 'toolu_mock', 'name': tool, 'input': json.loads(text)}] if tool
+                        else [{'type': 'text', 'text': text}]),
+            'stop_reason': 'tool_use' if tool else 'end_turn', 'stop_sequence': None,
+            'usage': {'input_tokens': input_tokens, 'output_tokens': output_tokens,
+                      'cache_read_input_tokens': 0, 'cache_creation_input_tokens': 0},
+        }
+    return {
+        'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'},
+                        'finishReason': 'STOP', 'index': 0}],
+        'usageMetadata': {'promptTokenCount': input_tokens, 'candidatesTokenCount': output_tokens,
+                          'totalTokenCount': input_tokens + output_tokens},
+        'modelVersion': model,
+    }
+
+
+def _error_body(provider, status):
+    message = 'Mock server injected failure'
+    if provider == 'anthropic':
+        kind = 'rate_limit_error' if status == 429 else 'api_error'
+        return {'type': 'error', 'error': {'type': kind, 'message': message}}
+    if provider == 'google':
+        return {'error': {'code': status, 'message': message,
+                          'status': 'RESOURCE_EXHAUSTED' if status == 429 else 'INTERNAL'}}
+    return {'error': {'message': message, 'type': 'rate_limit_exceeded' if status == 429 else 'server_error'}}
+
+
+class MockLLMServer:
+    """
+    Threaded HTTP server answering chat requests for all three providers.
+
+    OpenAI: POST /v1/chat/completions; Anthropic: POST /v1/messages;
+    Gemini: POST /v1beta/models/<model>:generateContent.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency=0.5, jitter=0.1, error_rate=0.0, response=None, seed=0,
+                 token_latency=0.0):
+        self.latency = latency
+        # Seconds per generated token, so longer replies take longer like real decoding
+        self.token_latency = token_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.response = response
+        self.requests = {'openai': 0, 'anthropic': 0, 'google': 0}
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def client_env(self):
+        """Environment variables that point the analyzer's SDK clients at this server"""
+        return {
+            'OPENAI_BASE_URL': f"{self.url}/v1",
+            'ANTHROPIC_BASE_URL': self.url,
+            'GOOGLE_API_BASE_URL': self.url,
+            'OPENAI_API_KEY': 'sk-mock',
+            'ANTHROPIC_API_KEY': 'sk-ant-mock',
+            'GOOGLE_API_KEY': 'mock',
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+    def _plan(self):
+        """Pick (delay, error status or None) for one request"""
+        with self._lock:
+            delay = max(0.0, self._rng.gauss(self.latency, self.jitter)) if self.jitter else self.latency
+            status = None
+            if self._rng.random() < self.error_rate:
+                status = self._rng.choice([429, 500, 503])
+                self.errors += 1
+        return delay, status
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status, body):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                path = self.path.split('?')[0]
+                if path.endswith('/chat/completions'):
+                    provider = 'openai'
+                elif path.endswith('/messages'):
+                    provider = 'anthropic'
+                elif path.endswith(':generateContent'):
+                    provider = 'google'
+                else:
+                    self._send(404, {'error': {'message': f"Unknown path {path}"}})
+                    return
+
+                length = int(self.headers.get('Content-Length') or 0)
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                with server._lock:
+                    server.requests[provider] += 1
+
+                delay, status = server._plan()
+                time.sleep(delay)
+                if status:
+                    self._send(status, _error_body(provider, status))
+                    return
+
+                prompt = _prompt_text(provider, payload)
+                if server.response is not None:
+                    text = json.dumps(server.response)
+                elif _ROLE_RE.search(prompt):
+                    text = json.dumps(canned_roles(prompt, compact='"rf":' in prompt))
+                elif _PACKED_RE.search(prompt):
+                    text = json.dumps(canned_pack(prompt, compact='"rf":' in prompt))
+                elif "'design_evaluation'" in prompt:
+                    # Vision request (--deep-analysis, or a scanned PDF's vision-first call)
+                    analysis = canned_analysis(prompt)
+                    analysis = compact_analysis(analysis) if '"rf":' in prompt else analysis
+                    analysis['design_evaluation'] = {'score': 6, 'comments': 'Synthetic design evaluation.'}
+                    text = json.dumps(analysis)
+                elif '"rf":' in prompt:
+                    text = json.dumps(compact_analysis(canned_analysis(prompt)))
+                elif '"estimated_total_score"' in prompt:
+                    text = json.dumps(canned_screen(prompt))
+                elif '# EVALUATION METHODOLOGY' not in prompt and ('# PILLAR ' in prompt or 'Total score: ' in prompt
+                                                                   or '"must_have_signals"' in prompt):
+                    text = json.dumps(canned_fanout_part(prompt))
+                else:
+                    text = json.dumps(canned_analysis(prompt))
+                if server.token_latency:
+                    time.sleep(approx_tokens(text) * server.token_latency)
+                model = payload.get('model') or path.split('/models/')[-1].split(':')[0]
+                tool = (payload.get('tool_choice') or {}).get('name') if provider == 'anthropic' else None
+                self._send(200, _response_body(provider, model, prompt, text, tool))
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a mock OpenAI/Anthropic/Gemini server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.5, help='Mean response latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Latency standard deviation in seconds')
+    parser.add_argument('--token-latency', type=float, default=0.0,
+                        help='Extra seconds per generated output token (default: 0)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests that fail (429/5xx)')
+    parser.add_argument('--response', help='JSON file returned verbatim instead of generated analyses')
+    args = parser.parse_args(argv)
+
+    response = None
+    if args.response:
+        with open(args.response) as f:
+            response = json.load(f)
+
+    server = MockLLMServer(args.host, args.port, args.latency, args.jitter, args.error_rate, response,
+                           token_latency=args.token_latency)
+    print(f"🧪 Mock LLM server on {server.url}")
+    for key, value in server.client_env().items():
+        print(f"   export {key}={value}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
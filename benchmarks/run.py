@@ -0,0 +1,352 @@
+"""
+Benchmark scenarios
+Times the analyzer CLI end to end against the mock LLM server and writes
+throughput, peak RSS and per-stage breakdowns to a JSON results file
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import PyPDF2
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.mock_server import MockLLMServer
+from pipeline.instrumentation import summarize_runs
+from pipeline import rasterize
+
+ANALYZE = REPO_ROOT / 'bin' / 'analyze'
+SCENARIOS = ['single', 'batch', 'deep', 'render', 'wire', 'pack', 'rasterize']
+DEFAULT_RESULTS_DIR = REPO_ROOT / 'benchmarks' / 'results'
+
+
+def run_cli(args, env, cwd):
+    """Run the analyzer CLI; returns (returncode, wall seconds, peak RSS in MB, combined output)"""
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, str(ANALYZE)] + [str(a) for a in args], env=env, cwd=cwd,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    output = process.stdout.read()
+    _, status, rusage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    # ru_maxrss is KB on Linux, bytes on macOS
+    peak = rusage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return process.returncode, wall, round(peak, 1), output.decode(errors='replace')
+
+
+def stage_breakdown(output_dir):
+    """Summarize the _metadata instrumentation of every analysis JSON in a directory"""
+    metadatas = []
+    for path in Path(output_dir).glob('*.json'):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if isinstance(data, dict) and 'pillars' in data:
+            metadatas.append(data.get('_metadata'))
+    return summarize_runs(metadatas)
+
+
+def _result(count, runs, output_dir=None, unit='resumes'):
+    wall = sum(run[1] for run in runs)
+    result = {
+        unit: count,
+        'wall_seconds': round(wall, 3),
+        f'{unit}_per_minute': round(count / wall * 60, 1) if wall else None,
+        'peak_rss_mb': max(run[2] for run in runs),
+        'failed_runs': sum(1 for run in runs if run[0] != 0),
+    }
+    if output_dir:
+        result['stages'] = stage_breakdown(output_dir)
+    return result
+
+
+def scenario_single(ctx):
+    """One CLI invocation per resume (includes interpreter and SDK start-up)"""
+    output_dir = ctx['workdir'] / 'single'
+    resumes = ctx['resumes'][:ctx['single_count']]
+    runs = [run_cli([path, '--provider', ctx['provider'], '--output', output_dir], ctx['env'], ctx['workdir'])
+            for path in resumes]
+    return _result(len(resumes), runs, output_dir)
+
+
+def scenario_batch(ctx):
+    """The whole corpus in one batch invocation"""
+    output_dir = ctx['workdir'] / 'batch'
+    run = run_cli([ctx['corpus'], '--provider', ctx['provider'], '--output', output_dir], ctx['env'], ctx['workdir'])
+    ctx['batch_output'] = output_dir
+    return _result(len(ctx['resumes']), [run], output_dir)
+
+
+def scenario_deep(ctx):
+    """--deep-analysis (every provider) over a slice of the corpus"""
+    output_dir = ctx['workdir'] / 'deep'
+    resumes = ctx['resumes'][:ctx['single_count']]
+    run = run_cli(resumes + ['--deep-analysis', '--output', output_dir], ctx['env'], ctx['workdir'])
+    return _result(len(resumes), [run], output_dir)
+
+
+def scenario_render(ctx):
+    """Force re-render of the batch scenario's reports (no LLM calls)"""
+    output_dir = ctx.get('batch_output')
+    if not output_dir:
+        output_dir = ctx['workdir'] / 'batch'
+        run_cli([ctx['corpus'], '--provider', ctx['provider'], '--output', output_dir], ctx['env'], ctx['workdir'])
+    reports = sum(1 for path in Path(output_dir).glob('*.json') if not path.name.startswith('batch_summary_'))
+    run = run_cli(['render', output_dir, '--force'], ctx['env'], ctx['workdir'])
+    return _result(reports, [run], unit='reports')
+
+
+def scenario_wire(ctx):
+    """Full vs --wire compact replies over a slice of the corpus: output tokens and API time per analysis"""
+    resumes = ctx['resumes'][:ctx['single_count']]
+    runs, per_wire = [], {}
+    for wire in ('full', 'compact'):
+        output_dir = ctx['workdir'] / f'wire_{wire}'
+        run = run_cli(resumes + ['--provider', ctx['provider'], '--wire', wire, '--output', output_dir], ctx['env'],
+                      ctx['workdir'])
+        runs.append(run)
+        stages = stage_breakdown(output_dir)
+        api = stages['stages_ms'].get('api_call', {})
+        per_wire[wire] = {
+            'output_tokens_per_analysis': round(stages['usage']['output_tokens'] / max(1, stages['analyses']), 1),
+            'api_call_p50_ms': api.get('p50'),
+            'api_call_mean_ms': api.get('mean'),
+            'cost_per_analysis_usd': stages.get('cost_per_analysis_usd'),
+        }
+    result = _result(len(resumes), runs)
+    full, compact = per_wire['full'], per_wire['compact']
+    saved_tokens = full['output_tokens_per_analysis'] - compact['output_tokens_per_analysis']
+    result.update(per_wire)
+    result['saved'] = {
+        'output_tokens_per_analysis': round(saved_tokens, 1),
+        'output_tokens_pct': round(100 * saved_tokens / full['output_tokens_per_analysis'], 1)
+        if full['output_tokens_per_analysis'] else 0.0,
+        'api_call_mean_ms': round((full['api_call_mean_ms'] or 0) - (compact['api_call_mean_ms'] or 0), 1),
+        'cost_per_analysis_usd': round((full['cost_per_analysis_usd'] or 0) - (compact['cost_per_analysis_usd'] or 0), 5),
+    }
+    return result
+
+
+def scenario_pack(ctx):
+    """The whole corpus one resume per call vs --pack: API calls, tokens, cost and throughput"""
+    runs, per_mode = [], {}
+    for mode, extra in (('per_call', []), ('packed', ['--pack'])):
+        output_dir = ctx['workdir'] / f'pack_{mode}'
+        run = run_cli([ctx['corpus'], '--provider', ctx['provider'], '--output', output_dir] + extra, ctx['env'],
+                      ctx['workdir'])
+        runs.append(run)
+        stages = stage_breakdown(output_dir)
+        analyses = max(1, stages['analyses'])
+        per_mode[mode] = {
+            'wall_seconds': round(run[1], 3),
+            'resumes_per_minute': round(stages['analyses'] / run[1] * 60, 1) if run[1] else None,
+            'api_calls': stages['api_calls'],
+            'input_tokens_per_analysis': round(stages['usage']['input_tokens'] / analyses, 1),
+            'output_tokens_per_analysis': round(stages['usage']['output_tokens'] / analyses, 1),
+            'cost_per_analysis_usd': stages.get('cost_per_analysis_usd'),
+        }
+    result = _result(len(ctx['resumes']), runs)
+    per_call, packed = per_mode['per_call'], per_mode['packed']
+    result.update(per_mode)
+    result['packing'] = {
+        'input_tokens_pct': round(100 * (1 - packed['input_tokens_per_analysis'] / per_call['input_tokens_per_analysis']),
+                                  1) if per_call['input_tokens_per_analysis'] else 0.0,
+        'cost_pct': round(100 * (1 - (packed['cost_per_analysis_usd'] or 0) / per_call['cost_per_analysis_usd']), 1)
+        if per_call['cost_per_analysis_usd'] else 0.0,
+        'throughput_x': round(packed['resumes_per_minute'] / per_call['resumes_per_minute'], 2)
+        if packed['resumes_per_minute'] and per_call['resumes_per_minute'] else None,
+    }
+    return result
+
+
+def _legacy_render(path, pages):
+    """The previous vision path: one pdf2image call (a pdftoppm process, PPM output) per page at full resolution"""
+    return [image for number in pages
+            for image in rasterize.convert_from_path(str(path), first_page=number, last_page=number,
+                                                     dpi=rasterize.VISION_DPI)]
+
+
+def scenario_rasterize(ctx):
+    """Render time per page for the design evaluation (grid included): each installed renderer vs the previous path"""
+    resumes = [path for path in ctx['resumes'] if path.suffix == '.pdf'][:ctx['single_count']]
+    pages = rasterize.parse_pages(rasterize.DEFAULT_PAGES)
+    renderers = {engine: (lambda path, selected, engine=engine: rasterize.render_grid(path, selected, engine=engine))
+                 for engine in rasterize.available_engines()}
+    if 'poppler' in renderers:
+        renderers = {'legacy': _legacy_render, **renderers}
+    result = {'pages': 0, 'wall_seconds': 0.0, 'pages_per_minute': None, 'peak_rss_mb': None, 'failed_runs': 0}
+    if not renderers or not resumes:
+        result['skipped'] = 'no PDF renderer installed (pypdfium2, or pdf2image and poppler)'
+        return result
+
+    per_engine = {}
+    for name, render in renderers.items():
+        times, rendered = [], 0
+        for path in resumes:
+            selected = rasterize.select_pages(pages, len(PyPDF2.PdfReader(str(path)).pages))
+            start = time.perf_counter()
+            try:
+                render(path, selected)
+            except Exception:
+                result['failed_runs'] += 1
+                continue
+            times.append(time.perf_counter() - start)
+            rendered += len(selected)
+        wall = sum(times)
+        per_engine[name] = {
+            'pages': rendered,
+            'wall_seconds': round(wall, 3),
+            'ms_per_page': round(wall * 1000 / rendered, 1) if rendered else None,
+        }
+    best = min((row for row in per_engine.values() if row['ms_per_page']), key=lambda row: row['ms_per_page'],
+               default=None)
+    result['pages'] = sum(row['pages'] for row in per_engine.values())
+    result['wall_seconds'] = round(sum(row['wall_seconds'] for row in per_engine.values()), 3)
+    if result['wall_seconds']:
+        result['pages_per_minute'] = round(result['pages'] / result['wall_seconds'] * 60, 1)
+    # In-process scenario: this benchmark process's own peak (KB on Linux, bytes on macOS)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    result['peak_rss_mb'] = round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+    result['engines'] = per_engine
+    legacy = per_engine.get('legacy', {}).get('ms_per_page')
+    if legacy and best:
+        result['speedup_x'] = round(legacy / best['ms_per_page'], 2)
+    return result
+
+
+SCENARIO_FUNCTIONS = {
+    'single': scenario_single,
+    'batch': scenario_batch,
+    'deep': scenario_deep,
+    'render': scenario_render,
+    'wire': scenario_wire,
+    'pack': scenario_pack,
+    'rasterize': scenario_rasterize,
+}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(scenarios, count=20, single_count=5, provider='openai', latency=0.5, jitter=0.1,
+                   error_rate=0.0, formats=('pdf',), workdir=None, token_latency=0.0):
+    """Generate a corpus, start the mock server and run the requested scenarios; returns the results dict"""
+    workdir = Path(workdir or tempfile.mkdtemp(prefix='analyzer-bench-'))
+    workdir.mkdir(parents=True, exist_ok=True)
+    # The CLI looks for .env in its working directory; keys come from the mock server's env instead
+    (workdir / '.env').write_text('')
+    corpus = workdir / 'corpus'
+    resumes = generate_corpus(corpus, count, formats=formats)
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': {'count': count, 'single_count': single_count, 'provider': provider, 'latency': latency,
+                   'token_latency': token_latency, 'jitter': jitter, 'error_rate': error_rate,
+                   'formats': list(formats)},
+        'scenarios': {},
+    }
+    with MockLLMServer(latency=latency, jitter=jitter, error_rate=error_rate, token_latency=token_latency) as server:
+        env = dict(os.environ, **server.client_env(), PYTHONWARNINGS='ignore')
+        ctx = {'workdir': workdir, 'corpus': corpus, 'resumes': resumes, 'single_count': min(single_count, count),
+               'provider': provider, 'env': env}
+        for name in scenarios:
+            print(f"⏱️  {name}...")
+            results['scenarios'][name] = SCENARIO_FUNCTIONS[name](ctx)
+        results['mock_server'] = {'requests': dict(server.requests), 'injected_errors': server.errors}
+    results['workdir'] = str(workdir)
+    return results
+
+
+def format_results(results):
+    """Human-readable summary lines"""
+    lines = []
+    for name, result in results['scenarios'].items():
+        unit = 'reports' if 'reports' in result else 'pages' if 'pages' in result else 'resumes'
+        if result.get('skipped'):
+            lines.append(f"{name:<8} skipped: {result['skipped']}")
+            continue
+        lines.append(f"{name:<8} {result[unit]:>5} {unit:<8} {result['wall_seconds']:>8.2f}s  "
+                     f"{result[f'{unit}_per_minute'] or 0:>8.1f}/min  peak RSS {result['peak_rss_mb']:>7.1f} MB"
+                     + (f"  ({result['failed_runs']} failed runs)" if result['failed_runs'] else ''))
+        for stage, stats in result.get('stages', {}).get('stages_ms', {}).items():
+            lines.append(f"           {stage:<13} p50 {stats['p50']:>9.1f} ms   p95 {stats['p95']:>9.1f} ms")
+        if 'saved' in result:
+            saved = result['saved']
+            lines.append(f"           output tokens/analysis {result['full']['output_tokens_per_analysis']:.0f} full -> "
+                         f"{result['compact']['output_tokens_per_analysis']:.0f} compact "
+                         f"(-{saved['output_tokens_pct']:.1f}%), API call -{saved['api_call_mean_ms']:.0f} ms, "
+                         f"-${saved['cost_per_analysis_usd']:.5f}/analysis")
+        if 'packing' in result:
+            packing = result['packing']
+            lines.append(f"           API calls {result['per_call']['api_calls']} per call -> "
+                         f"{result['packed']['api_calls']} packed; input tokens -{packing['input_tokens_pct']:.1f}%, "
+                         f"cost -{packing['cost_pct']:.1f}%, throughput {packing['throughput_x']}x")
+        for engine, row in result.get('engines', {}).items():
+            lines.append(f"           {engine:<13} {row['ms_per_page'] or 0:>9.1f} ms/page over {row['pages']} page(s)")
+        if result.get('speedup_x'):
+            lines.append(f"           {result['speedup_x']}x faster per page than one pdftoppm call per page")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run offline analyzer benchmarks against a mock LLM server')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS),
+                        help=f"Comma-separated scenarios (default: {','.join(SCENARIOS)})")
+    parser.add_argument('--count', type=int, default=20, help='Resumes in the synthetic corpus (default: 20)')
+    parser.add_argument('--single-count', type=int, default=5,
+                        help='Resumes used by the single and deep scenarios (default: 5)')
+    parser.add_argument('--provider', choices=['openai', 'anthropic', 'google'], default='openai')
+    parser.add_argument('--latency', type=float, default=0.5, help='Mock API latency in seconds (default: 0.5)')
+    parser.add_argument('--token-latency', type=float, default=0.0,
+                        help='Mock seconds per output token, so reply size shows up in latency (default: 0)')
+    parser.add_argument('--jitter', type=float, default=0.1, help='Mock latency std deviation (default: 0.1)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Mock failure rate 0-1 (default: 0)')
+    parser.add_argument('--formats', default='pdf', help='Corpus formats: pdf,docx (docx needs pandoc)')
+    parser.add_argument('--workdir', help='Directory for the corpus and outputs (default: a temp dir)')
+    parser.add_argument('--output', default=str(DEFAULT_RESULTS_DIR),
+                        help='Directory for the results JSON (default: benchmarks/results)')
+    args = parser.parse_args(argv)
+
+    scenarios = [s.strip() for s in args.scenarios.split(',') if s.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    results = run_benchmarks(scenarios, args.count, args.single_count, args.provider, args.latency, args.jitter,
+                             args.error_rate, tuple(args.formats.split(',')), args.workdir, args.token_latency)
+
+    output_dir = Path(args.output)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    results_path = output_dir / f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(results_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    print()
+    for line in format_results(results):
+        print(line)
+    print(f"\n💾 Results: {results_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Analysis pipeline modules for AI PM Resume Analyzer
@@ -0,0 +1,213 @@
+"""
+Two-tier cascade screening
+A short prompt on a cheap model checks the minimum thresholds, red flags and
+the framework's non-negotiable pillar; only candidates that clear the bar (or that the cheap model is
+unsure about) get the full framework evaluation
+"""
+
+import time
+
+from .instrumentation import RunStats
+from .router import approx_tokens, DEFAULT_LATENCY_S, DEFAULT_OUTPUT_TOKENS, FALLBACK_LATENCY_S
+
+
+NON_NEGOTIABLE_BAR = 6
+# Non-negotiable pillar scores this close below the bar are treated as borderline and escalated
+BORDERLINE_BAND = 1
+UNCERTAIN_CONFIDENCE = 0.7
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def screening_verdict(screen, pillar_key, min_confidence=UNCERTAIN_CONFIDENCE):
+    """Return (escalate, reason) for a prefilter result; ``pillar_key`` is the framework's non-negotiable pillar"""
+    thresholds = screen.get('minimum_thresholds_met') or {}
+    red_flags = screen.get('red_flags_found') or []
+    score = _number((screen.get(pillar_key) or {}).get('score'))
+    confidence = _number(screen.get('confidence'))
+    label = f"Pillar {pillar_key.rsplit('_', 1)[-1]}"
+
+    if confidence is None or confidence < min_confidence:
+        return True, f"prefilter uncertain (confidence {screen.get('confidence')})"
+    if score is None:
+        return True, f"prefilter returned no {label} score"
+    if thresholds.get('all_met') and not red_flags and score >= NON_NEGOTIABLE_BAR:
+        return True, f"clears minimum thresholds and {label}"
+    if NON_NEGOTIABLE_BAR - BORDERLINE_BAND <= score < NON_NEGOTIABLE_BAR and thresholds.get('all_met') and not red_flags:
+        return True, f"borderline {label} ({score:g})"
+
+    failed = [name.replace('_', ' ') for name, met in thresholds.items() if name != 'all_met' and met is False]
+    reasons = []
+    if failed:
+        reasons.append('missing ' + ', '.join(failed))
+    if red_flags:
+        reasons.append(f"{len(red_flags)} red flag(s)")
+    if score < NON_NEGOTIABLE_BAR:
+        reasons.append(f"{label} {score:g}/10")
+    return False, '; '.join(reasons) or 'fails the prefilter'
+
+
+def screened_out_analysis(screen, reason, pillar_key, pillar_name):
+    """Analysis dict (same shape the reports and store expect) for a candidate stopped at the prefilter"""
+    pillar = screen.get(pillar_key) or {}
+    metadata = screen.get('_metadata', {})
+    return {
+        'candidate_name': screen.get('candidate_name'),
+        'minimum_thresholds_met': screen.get('minimum_thresholds_met') or {},
+        'red_flags_found': screen.get('red_flags_found') or [],
+        'yellow_flags_found': [],
+        'pillars': {
+            pillar_key: {
+                'name': pillar_name,
+                'score': pillar.get('score'),
+                'evidence': pillar.get('evidence', ''),
+                'strengths': [],
+                'gaps': [],
+            }
+        },
+        'total_score': screen.get('estimated_total_score'),
+        'decision': 'No Screen',
+        'decision_rationale': f"Screened out by the {metadata.get('model_display_name', 'prefilter')} "
+                              f"prefilter: {reason}. Full framework evaluation was skipped.",
+        'top_strengths': [],
+        'top_concerns': [reason],
+        'recommendation': 'Not evaluated in depth. Re-run without --cascade for a full report.',
+        'suitable_roles': [],
+        'interview_focus_areas': [],
+    }
+
+
+class CascadeAnalyzer:
+    """
+    Prefilter with ``screener`` (a cheap-model ResumeAnalyzer) and escalate to
+    ``analyzer`` (the full model) only when needed.
+
+    ``measured`` is ResultsStore.model_performance() output, used to estimate
+    what the skipped full evaluations would have cost in time.
+    """
+
+    def __init__(self, screener, analyzer, measured=None, min_confidence=UNCERTAIN_CONFIDENCE):
+        self.screener = screener
+        self.analyzer = analyzer
+        self.measured = measured or {}
+        self.min_confidence = min_confidence
+
+    def _full_estimate(self, resume_text):
+        """(USD, seconds) a full evaluation of this resume would take on the full model"""
+        analyzer = self.analyzer
+        pricing = analyzer.pricing or {}
+        perf = self.measured.get((analyzer.api_provider, analyzer.model))
+        output_tokens = perf['avg_output_tokens'] if perf and perf.get('avg_output_tokens') else DEFAULT_OUTPUT_TOKENS
+        prompt_tokens = approx_tokens(analyzer.create_analysis_prompt(resume_text))
+        cost = (prompt_tokens * pricing.get('input', 0) + output_tokens * pricing.get('output', 0)) / 1_000_000
+        latency = perf['p50_ms'] / 1000 if perf else DEFAULT_LATENCY_S.get(analyzer.model, FALLBACK_LATENCY_S)
+        return cost, latency
+
+    def analyze(self, resume_path, resume_text=None, stats=None):
+        """Extract once, prefilter, and run the full evaluation only for candidates that pass or are unclear"""
+        stats = stats or RunStats()
+        if resume_text is None:
+            print("📄 Extracting text...")
+            with stats.stage('extract'):
+                resume_text = self.analyzer.extract_text_from_document(str(resume_path))
+
+        cost_before = stats.cost_usd
+        start = time.perf_counter()
+        screen = self.screener.screen_text(resume_text, stats=stats)
+        screen_ms = (time.perf_counter() - start) * 1000
+        screen_cost = stats.cost_usd - cost_before
+        pillar_key = self.screener.NON_NEGOTIABLE_PILLAR
+        escalate, reason = screening_verdict(screen, pillar_key, self.min_confidence)
+
+        cascade = {
+            'screen_provider': self.screener.api_provider,
+            'screen_model': self.screener.model,
+            'escalated': escalate,
+            'reason': reason,
+            'screen': {k: v for k, v in screen.items() if k != '_metadata'},
+            'screen_cost_usd': round(screen_cost, 6),
+            'screen_ms': round(screen_ms, 1),
+        }
+
+        if escalate:
+            print(f"⬆️  Escalating: {reason}")
+            analysis = self.analyzer.analyze_text(resume_text, stats=stats)
+            cascade['full_cost_usd'] = round(stats.cost_usd - cost_before - screen_cost, 6)
+        else:
+            print(f"⏹️  Screened out: {reason}")
+            full_cost, full_latency = self._full_estimate(resume_text)
+            cascade['avoided_cost_est_usd'] = round(full_cost, 6)
+            cascade['avoided_latency_est_s'] = round(full_latency, 1)
+            analysis = screened_out_analysis(screen, reason, pillar_key,
+                                             self.screener.FRAMEWORK_PILLARS[pillar_key]['name'])
+            analysis['_metadata'] = {**screen['_metadata'], 'visual_analysis': False}
+
+        analysis['_metadata'].update(stats.to_metadata())
+        analysis['_metadata']['cascade'] = cascade
+        return analysis
+
+
+def summarize_cascade(analyses):
+    """
+    Batch report: how many candidates stopped at the prefilter and the cost and
+    latency saved versus running the full evaluation on every resume.
+
+    Skipped evaluations are valued at the batch's measured average full-call
+    cost/latency when any resume escalated, otherwise at the per-resume estimate.
+    """
+    runs = [a['_metadata'] for a in analyses if (a.get('_metadata') or {}).get('cascade')]
+    if not runs:
+        return None
+    escalated = [m for m in runs if m['cascade']['escalated']]
+    stopped = [m for m in runs if not m['cascade']['escalated']]
+
+    actual_cost = sum(m.get('cost_usd', 0) for m in runs)
+    screen_cost = sum(m['cascade']['screen_cost_usd'] for m in runs)
+    screen_s = sum(m['cascade']['screen_ms'] for m in runs) / 1000
+    if escalated:
+        full_costs = [m['cascade'].get('full_cost_usd', 0) for m in escalated]
+        full_latencies = [max(0, m.get('total_ms', 0) - m['cascade']['screen_ms']) / 1000 for m in escalated]
+        avoided_cost = len(stopped) * sum(full_costs) / len(full_costs)
+        avoided_s = len(stopped) * sum(full_latencies) / len(full_latencies)
+    else:
+        avoided_cost = sum(m['cascade'].get('avoided_cost_est_usd', 0) for m in stopped)
+        avoided_s = sum(m['cascade'].get('avoided_latency_est_s', 0) for m in stopped)
+
+    # Escalated resumes paid for the prefilter on top of the full evaluation
+    overhead_cost = sum(m['cascade']['screen_cost_usd'] for m in escalated)
+    overhead_s = sum(m['cascade']['screen_ms'] for m in escalated) / 1000
+    # Without the cascade: every full call actually made, plus a full call for each stopped resume
+    baseline_cost = actual_cost - screen_cost + avoided_cost
+    saved_cost = avoided_cost - screen_cost
+    saved_s = avoided_s - screen_s
+    return {
+        'resumes': len(runs),
+        'screened_out': len(stopped),
+        'escalated': len(escalated),
+        'actual_cost_usd': round(actual_cost, 4),
+        'prefilter_cost_usd': round(screen_cost, 4),
+        'baseline_cost_usd': round(baseline_cost, 4),
+        'saved_cost_usd': round(saved_cost, 4),
+        'saved_cost_pct': round(100 * saved_cost / baseline_cost, 1) if baseline_cost else 0.0,
+        'saved_seconds': round(saved_s, 1),
+        'escalation_overhead_usd': round(overhead_cost, 4),
+        'escalation_overhead_seconds': round(overhead_s, 1),
+    }
+
+
+def format_cascade_summary(summary):
+    """Human-readable cascade savings lines"""
+    return [
+        f"🪜 Cascade: {summary['screened_out']}/{summary['resumes']} screened out by the prefilter, "
+        f"{summary['escalated']} escalated to the full evaluation",
+        f"   Cost ${summary['actual_cost_usd']:.4f} vs ${summary['baseline_cost_usd']:.4f} without cascade "
+        f"(saved ${summary['saved_cost_usd']:.4f}, {summary['saved_cost_pct']:.1f}%); "
+        f"API time saved {summary['saved_seconds']:.1f}s",
+        f"   Prefilter overhead on escalated resumes: ${summary['escalation_overhead_usd']:.4f}, "
+        f"{summary['escalation_overhead_seconds']:.1f}s",
+    ]
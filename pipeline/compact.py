@@ -0,0 +1,116 @@
+"""
+Compact wire format
+A terse reply shape for the full analysis (short keys, one-letter level and
+decision codes, no pillar names, totals or flags that can be derived) and
+the local expander that rebuilds the report schema from it
+"""
+
+from .schema import LEVEL_CODES, DECISION_CODES
+
+# Framework: 3+ differentiation signals are needed for Strong Screen
+STRONG_SCREEN_DIFFERENTIATORS = 3
+# Output tokens of a compact reply relative to the full report JSON (the wire benchmark measured -37%)
+OUTPUT_RATIO = 0.63
+
+LEGEND = f"""Keys are abbreviated to keep the reply short:
+- n: candidate name; t: minimum thresholds (ai = personal AI projects, pub = building in public, cre = resume creativity)
+- rf / yf: red / yellow flags found; cq: critical questions (ps = paradigm shift, fp = future-proofing, mw = magic wand examples)
+- p: pillars by number, each with s = score, l = level, e = evidence, str = strengths, gap = gaps
+- mh: must-have signals (f = found, m = missing); ds: differentiation signals found
+- d: decision; r: decision rationale; s / c: top strengths / concerns; rec: recommendation; roles: suitable roles; q: interview focus areas
+- Level codes: {', '.join(f'{code} = {name}' for code, name in LEVEL_CODES.items())}
+- Decision codes: {', '.join(f'{code} = {name}' for code, name in DECISION_CODES.items())}
+Do not echo pillar names or the total score; they are filled in locally."""
+
+
+def _number_key(pillar_key):
+    """pillar_3 -> '3' (the compact pillar key)"""
+    return pillar_key.rsplit('_', 1)[-1]
+
+
+def expand_analysis(reply, pillar_names):
+    """Full analysis dict (the shape reports, the store and rank read) from a validated compact reply"""
+    thresholds = reply['t']
+    pillars = {}
+    for key, name in pillar_names.items():
+        pillar = reply['p'][_number_key(key)]
+        pillars[key] = {
+            'name': name,
+            'score': pillar['s'],
+            'level': LEVEL_CODES[pillar['l']],
+            'evidence': pillar['e'],
+            'strengths': pillar['str'],
+            'gaps': pillar['gap'],
+        }
+    total = sum(pillar['score'] for pillar in pillars.values())
+    analysis = {
+        'candidate_name': reply['n'],
+        'minimum_thresholds_met': {
+            'personal_ai_projects': thresholds['ai'],
+            'building_in_public': thresholds['pub'],
+            'resume_creativity': thresholds['cre'],
+            'all_met': thresholds['ai'] and thresholds['pub'] and thresholds['cre'],
+        },
+        'red_flags_found': reply['rf'],
+        'yellow_flags_found': reply['yf'],
+        'critical_questions_analysis': {
+            'paradigm_shift_examples': reply['cq']['ps'],
+            'future_proofing_examples': reply['cq']['fp'],
+            'magic_wand_examples': reply['cq']['mw'],
+        },
+        'pillars': pillars,
+        'must_have_signals': {
+            'signals_found': reply['mh']['f'],
+            'signals_missing': reply['mh']['m'],
+            'all_present': not reply['mh']['m'],
+        },
+        'differentiation_signals': {
+            'signals_found': reply['ds'],
+            'count': len(reply['ds']),
+            'sufficient_for_strong_screen': len(reply['ds']) >= STRONG_SCREEN_DIFFERENTIATORS,
+        },
+        'total_score': int(total) if float(total).is_integer() else round(total, 1),
+        'decision': DECISION_CODES[reply['d']],
+        'decision_rationale': reply['r'],
+        'top_strengths': reply['s'],
+        'top_concerns': reply['c'],
+        'recommendation': reply['rec'],
+        'suitable_roles': reply['roles'],
+        'interview_focus_areas': reply['q'],
+    }
+    if 'design_evaluation' in reply:
+        analysis['design_evaluation'] = reply['design_evaluation']
+    return analysis
+
+
+def compact_analysis(analysis):
+    """Inverse of expand_analysis (used by the mock server and the wire benchmark)"""
+    levels = {name: code for code, name in LEVEL_CODES.items()}
+    decisions = {name: code for code, name in DECISION_CODES.items()}
+    thresholds = analysis['minimum_thresholds_met']
+    questions = analysis['critical_questions_analysis']
+    reply = {
+        'n': analysis['candidate_name'],
+        't': {'ai': thresholds['personal_ai_projects'], 'pub': thresholds['building_in_public'],
+              'cre': thresholds['resume_creativity']},
+        'rf': analysis['red_flags_found'],
+        'yf': analysis['yellow_flags_found'],
+        'cq': {'ps': questions['paradigm_shift_examples'], 'fp': questions['future_proofing_examples'],
+               'mw': questions['magic_wand_examples']},
+        'p': {_number_key(key): {'s': pillar['score'], 'l': levels[pillar['level']], 'e': pillar['evidence'],
+                                 'str': pillar['strengths'], 'gap': pillar['gaps']}
+              for key, pillar in analysis['pillars'].items()},
+        'mh': {'f': analysis['must_have_signals']['signals_found'],
+               'm': analysis['must_have_signals']['signals_missing']},
+        'ds': analysis['differentiation_signals']['signals_found'],
+        'd': decisions[analysis['decision']],
+        'r': analysis['decision_rationale'],
+        's': analysis['top_strengths'],
+        'c': analysis['top_concerns'],
+        'rec': analysis['recommendation'],
+        'roles': analysis['suitable_roles'],
+        'q': analysis['interview_focus_areas'],
+    }
+    if 'design_evaluation' in analysis:
+        reply['design_evaluation'] = analysis['design_evaluation']
+    return reply
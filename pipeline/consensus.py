@@ -0,0 +1,141 @@
+"""
+Consensus deep analysis
+Queries providers cheapest-first and stops as soon as two of them agree on
+the decision with total scores within a tolerance; the remaining (usually
+most expensive) providers are only called on disagreement
+"""
+
+from pathlib import Path
+
+from .instrumentation import RunStats
+from .router import approx_tokens, estimate_call
+
+
+DEFAULT_TOLERANCE = 5
+
+
+def _total(analysis):
+    try:
+        return float(analysis.get('total_score'))
+    except (TypeError, ValueError):
+        return None
+
+
+def agrees(first, second, tolerance=DEFAULT_TOLERANCE):
+    """Same decision and totals within ``tolerance`` points"""
+    total_a, total_b = _total(first), _total(second)
+    return (first.get('decision') == second.get('decision')
+            and total_a is not None and total_b is not None
+            and abs(total_a - total_b) <= tolerance)
+
+
+class ConsensusRunner:
+    """
+    --deep-analysis with early exit.
+
+    ``make_analyzer(provider)`` returns the provider's default-model
+    ResumeAnalyzer; ``measured`` is ResultsStore.model_performance() output
+    and refines the price/latency ordering.
+    """
+
+    def __init__(self, providers, make_analyzer, available_models, default_models, tolerance=DEFAULT_TOLERANCE,
+                 measured=None):
+        self.providers = list(providers)
+        self.make_analyzer = make_analyzer
+        self.available_models = available_models
+        self.default_models = default_models
+        self.tolerance = tolerance
+        self.measured = measured or {}
+
+    def order(self, prompt_tokens):
+        """Providers with their default model, cheapest (then fastest) first"""
+        options = []
+        for provider in self.providers:
+            model = self.default_models[provider]
+            cost, latency = estimate_call(self.available_models[provider][model], model, prompt_tokens,
+                                          self.measured.get((provider, model)))
+            options.append({'provider': provider, 'model': model, 'est_cost_usd': round(cost, 5),
+                            'est_latency_s': round(latency, 1)})
+        return sorted(options, key=lambda o: (o['est_cost_usd'], o['est_latency_s']))
+
+    def analyze(self, resume_path, resume_text=None, extract_seconds=0.0):
+        """
+        Extract (unless ``resume_text`` is given) and rasterize once, then query
+        providers in order until two agree; returns {provider: analysis}
+        """
+        analyzers = {provider: self.make_analyzer(provider) for provider in self.providers}
+        first = analyzers[self.providers[0]]
+        stats = RunStats()
+        stats.timings['extract'] = extract_seconds
+        if resume_text is None:
+            print("📄 Extracting text...")
+            with stats.stage('extract'):
+                resume_text = first.extract_text_from_document(str(resume_path))
+        resume_image = None
+        if Path(resume_path).suffix.lower() == '.pdf':
+            print("🖼️  Converting PDF to image for visual design analysis...")
+            with stats.stage('rasterize'):
+                resume_image = first.convert_pdf_to_images(str(resume_path))
+            if not resume_image:
+                print("⚠️  Visual analysis unavailable "
+                      "(install pypdfium2, or pdf2image and poppler, for design evaluation)")
+
+        options = self.order(approx_tokens(first.create_analysis_prompt(resume_text)))
+        analyses, skipped, failed = {}, [], []
+        agreed = None
+        for option in options:
+            provider = option['provider']
+            if agreed:
+                a, b = agreed
+                skipped.append({**option, 'reason': f"{a} and {b} agreed on {analyses[a].get('decision')} "
+                                                    f"({analyses[a].get('total_score')} vs "
+                                                    f"{analyses[b].get('total_score')}/60, "
+                                                    f"tolerance ±{self.tolerance:g})"})
+                continue
+            try:
+                analysis = analyzers[provider].analyze_text(resume_text, resume_image, stats)
+            except Exception as e:
+                print(f"⚠️  {provider.upper()} failed: {str(e)}")
+                failed.append({**option, 'error': str(e)})
+                continue
+            finally:
+                # Shared extraction/rasterization time stays on the first call's metadata
+                stats = RunStats()
+            print(f"✅ {provider.upper()} complete: {analysis.get('total_score', 0)}/60")
+            for other, previous in analyses.items():
+                if agrees(previous, analysis, self.tolerance):
+                    agreed = (other, provider)
+                    break
+            analyses[provider] = analysis
+
+        consensus = {
+            'tolerance': self.tolerance,
+            'order': [o['provider'] for o in options],
+            'agreed': list(agreed) if agreed else None,
+            'skipped': skipped,
+            'failed': failed,
+        }
+        for analysis in analyses.values():
+            analysis['_metadata']['consensus'] = consensus
+        if agreed:
+            print(f"🤝 Consensus: {agreed[0]} and {agreed[1]} agree"
+                  + (f"; skipped {', '.join(s['provider'] for s in skipped)}" if skipped else ''))
+        elif len(analyses) > 1:
+            print(f"⚖️  No consensus across {len(analyses)} provider(s)")
+        return analyses
+
+
+def summarize_consensus(results):
+    """Batch counts for consensus runs: resumes settled early and provider calls skipped ({provider: analysis} per resume)"""
+    runs = [next(iter(analyses.values()))['_metadata']['consensus'] for analyses in results
+            if analyses and next(iter(analyses.values()))['_metadata'].get('consensus')]
+    if not runs:
+        return None
+    skipped = [s for run in runs for s in run['skipped']]
+    return {
+        'resumes': len(runs),
+        'agreed': sum(1 for run in runs if run['agreed']),
+        'skipped_calls': len(skipped),
+        'skipped_cost_est_usd': round(sum(s['est_cost_usd'] for s in skipped), 4),
+        'skipped_latency_est_s': round(sum(s['est_latency_s'] for s in skipped), 1),
+    }
@@ -0,0 +1,135 @@
+"""
+Batch deduplication
+Finds resumes that are the same file (byte hash), the same text (hash of
+the normalized extraction) or a near-identical re-export (MinHash + LSH
+over word shingles, verified with exact Jaccard) so each is analyzed once
+"""
+
+import hashlib
+import re
+
+from templates.similarity import MinHasher, jaccard, lsh_candidate_pairs
+
+
+DEFAULT_THRESHOLD = 0.9
+SHINGLE_WORDS = 3
+NUM_PERM = 64
+BANDS = 16
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def file_digest(path):
+    """SHA-256 of the file bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_text(text):
+    """Lower-cased word tokens, so layout, punctuation and whitespace differences disappear"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def text_shingles(tokens, size=SHINGLE_WORDS):
+    """Set of overlapping word n-grams"""
+    if len(tokens) < size:
+        return frozenset([' '.join(tokens)]) if tokens else frozenset()
+    return frozenset(' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1))
+
+
+def find_duplicates(paths, extract_text, threshold=DEFAULT_THRESHOLD):
+    """
+    Returns (texts, duplicates): ``texts`` maps each path to its extracted
+    text (None when extraction failed) and ``duplicates`` maps every
+    duplicate path to {'canonical', 'match', 'similarity'}, where the
+    canonical path is the first of its group in input order.
+    """
+    paths = list(paths)
+    duplicates = {}
+    first_by_digest = {}
+    for path in paths:
+        digest = file_digest(path)
+        if digest in first_by_digest:
+            duplicates[path] = {'canonical': first_by_digest[digest], 'match': 'exact file', 'similarity': 1.0}
+        else:
+            first_by_digest[digest] = path
+
+    texts = {}
+    first_by_text = {}
+    unique, shingles = [], []
+    for path in paths:
+        if path in duplicates:
+            continue
+        try:
+            texts[path] = extract_text(path)
+        except Exception as e:
+            print(f"⚠️  Dedup: could not extract {path}: {e}")
+            texts[path] = None
+            continue
+        tokens = normalize_text(texts[path])
+        if not tokens:
+            continue
+        key = hashlib.sha256(' '.join(tokens).encode()).hexdigest()
+        if key in first_by_text:
+            duplicates[path] = {'canonical': first_by_text[key], 'match': 'same text', 'similarity': 1.0}
+            continue
+        first_by_text[key] = path
+        unique.append(path)
+        shingles.append(text_shingles(tokens))
+
+    if len(unique) > 1:
+        hasher = MinHasher(num_perm=NUM_PERM)
+        pairs = lsh_candidate_pairs([hasher.signature(s) for s in shingles], bands=BANDS)
+        # Earlier files stay canonical; each later file attaches to its most similar earlier one
+        best = {}
+        for i, j in pairs:
+            similarity = jaccard(shingles[i], shingles[j])
+            if similarity >= threshold and similarity > best.get(j, (None, 0))[1]:
+                best[j] = (i, similarity)
+        for j in sorted(best):
+            i, similarity = best[j]
+            canonical = unique[i]
+            # Follow chains so every duplicate points at an analyzed resume
+            while canonical in duplicates:
+                canonical = duplicates[canonical]['canonical']
+            duplicates[unique[j]] = {'canonical': canonical, 'match': 'near-duplicate text',
+                                     'similarity': round(similarity, 3)}
+
+    # Exact-file duplicates share their canonical's text
+    for path, dup in duplicates.items():
+        texts.setdefault(path, texts.get(dup['canonical']))
+    return texts, duplicates
+
+
+def summarize_dedup(paths, duplicates, metadata_by_path=None):
+    """
+    Batch report: duplicate groups and the analysis calls saved.
+
+    ``metadata_by_path`` maps each analyzed path to the _metadata of its
+    analyses (one per provider in deep mode); a duplicate is credited with
+    the calls and cost its canonical resume actually used.
+    """
+    if not duplicates:
+        return None
+    metadata_by_path = metadata_by_path or {}
+    groups = {}
+    calls_saved = cost_saved = 0
+    for path, dup in duplicates.items():
+        groups.setdefault(str(dup['canonical']), []).append(
+            {'file': str(path), 'match': dup['match'], 'similarity': dup['similarity']})
+        for meta in metadata_by_path.get(dup['canonical'], []):
+            calls_saved += meta.get('api_calls', 0)
+            cost_saved += meta.get('cost_usd', 0)
+    return {
+        'resumes': len(paths),
+        'unique': len(paths) - len(duplicates),
+        'duplicates': len(duplicates),
+        'by_match': {match: sum(1 for d in duplicates.values() if d['match'] == match)
+                     for match in sorted({d['match'] for d in duplicates.values()})},
+        'api_calls_saved': calls_saved,
+        'cost_saved_usd': round(cost_saved, 4),
+        'groups': groups,
+    }
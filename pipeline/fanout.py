@@ -0,0 +1,162 @@
+"""
+Pillar fan-out
+Splits the full evaluation into concurrent narrow calls (one per pillar plus
+one for thresholds, flags and signals) followed by a short synthesis call,
+and merges them into the usual analysis shape; wall-clock time is roughly
+the slowest call instead of one long generation
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import telemetry
+from .instrumentation import RunStats
+from .schema import FLAGS_SCHEMA, SYNTHESIS_SCHEMA, pillar_schema
+
+
+CHECK_FIELDS = ['candidate_name', 'minimum_thresholds_met', 'red_flags_found', 'yellow_flags_found',
+                'critical_questions_analysis']
+SIGNAL_FIELDS = ['must_have_signals', 'differentiation_signals']
+
+
+def parse_part_models(values, pillar_keys, available_models):
+    """
+    ``--fanout-model`` values ("pillar_3=gpt-5", "synthesis=gpt-5-mini") to a
+    {part: model} dict; raises ValueError on an unknown part or model.
+    """
+    parts = list(pillar_keys) + ['flags', 'synthesis']
+    models = {}
+    for value in values or []:
+        part, _, model = value.partition('=')
+        part, model = part.strip(), model.strip()
+        if part not in parts:
+            raise ValueError(f"unknown fan-out part '{part}' (choose from {', '.join(parts)})")
+        if model not in available_models:
+            raise ValueError(f"unknown model '{model}' for this provider (choose from {', '.join(available_models)})")
+        models[part] = model
+    return models
+
+
+class FanoutAnalyzer:
+    """
+    Pillar-parallel evaluation on one provider.
+
+    ``models`` maps a part (pillar_1..pillar_6, 'flags', 'synthesis') to a
+    model id of the analyzer's provider, so each pillar can use its own tier;
+    pillars and flags default to the analyzer's model and the synthesis to
+    its screening model.
+    """
+
+    def __init__(self, analyzer, models=None, workers=None):
+        self.analyzer = analyzer
+        self.pillar_keys = list(analyzer.FRAMEWORK_PILLARS)
+        defaults = dict.fromkeys(self.pillar_keys + ['flags'], analyzer.model)
+        defaults['synthesis'] = analyzer.SCREENING_MODELS.get(analyzer.api_provider, analyzer.model)
+        self.models = {**defaults, **(models or {})}
+        self.workers = workers or len(self.pillar_keys) + 1
+
+    def _call(self, part, prompt, schema):
+        """One narrow request with its own RunStats (RunStats is not shared across threads)"""
+        stats = RunStats()
+        start = time.perf_counter()
+        result = self.analyzer._complete_json(prompt, stats=stats, schema=schema, model=self.models[part])
+        return result, stats, time.perf_counter() - start
+
+    @staticmethod
+    def _record(part, model, call_stats, seconds):
+        return {'part': part, 'model': model, 'ms': round(seconds * 1000, 1),
+                'output_tokens': call_stats.usage['output_tokens'], 'cost_usd': round(call_stats.cost_usd, 6)}
+
+    def analyze_text(self, resume_text, stats=None):
+        """Fan out the pillar and flag calls, synthesize the decision and attach _metadata"""
+        stats = stats or RunStats()
+        analyzer = self.analyzer
+        tiers = sorted(set(self.models[key] for key in self.pillar_keys + ['flags']))
+        print(f"🪭 Fanning out {len(self.pillar_keys)} pillar calls + flags with {analyzer.api_provider.upper()} "
+              f"({', '.join(tiers)})...")
+
+        with stats.stage('prompt_build'):
+            jobs = {key: (analyzer.create_pillar_prompt(resume_text, key), pillar_schema())
+                    for key in self.pillar_keys}
+            jobs['flags'] = (analyzer.create_flags_prompt(resume_text), FLAGS_SCHEMA)
+
+        results, calls = {}, []
+        start = time.perf_counter()
+        with stats.stage('api_call'), ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {part: pool.submit(self._call, part, prompt, schema) for part, (prompt, schema) in jobs.items()}
+            for part, future in futures.items():
+                results[part], call_stats, seconds = future.result()
+                stats.merge(call_stats)
+                calls.append(self._record(part, self.models[part], call_stats, seconds))
+        parallel_ms = (time.perf_counter() - start) * 1000
+
+        pillars = {key: {'name': analyzer.FRAMEWORK_PILLARS[key]['name'], **results[key]}
+                   for key in self.pillar_keys}
+        total = sum(pillar['score'] for pillar in pillars.values())
+        total = int(total) if float(total).is_integer() else round(total, 1)
+        checks = {field: results['flags'][field] for field in CHECK_FIELDS + SIGNAL_FIELDS}
+
+        print(f"🧮 Synthesizing decision with {self.models['synthesis']}...")
+        with stats.stage('prompt_build'):
+            prompt = analyzer.create_synthesis_prompt(checks, pillars, total)
+        with stats.stage('api_call'):
+            verdict, call_stats, seconds = self._call('synthesis', prompt, SYNTHESIS_SCHEMA)
+        stats.merge(call_stats)
+        calls.append(self._record('synthesis', self.models['synthesis'], call_stats, seconds))
+
+        analysis = {field: checks[field] for field in CHECK_FIELDS}
+        analysis['pillars'] = pillars
+        analysis.update((field, checks[field]) for field in SIGNAL_FIELDS)
+        analysis['total_score'] = total
+        analysis.update(verdict)
+
+        analysis['_metadata'] = {
+            'provider': analyzer.api_provider,
+            'model': analyzer.model,
+            'model_display_name': analyzer.AVAILABLE_MODELS[analyzer.api_provider][analyzer.model]['name'],
+            'visual_analysis': False,
+            **({'speed': analyzer.speed} if analyzer.speed else {}),
+            'framework': analyzer.framework_metadata(),
+            **stats.to_metadata(),
+            'fanout': {
+                'calls': calls,
+                'parallel_ms': round(parallel_ms, 1),
+                'synthesis_ms': calls[-1]['ms'],
+                # What the same calls would take one after another
+                'serial_ms': round(sum(call['ms'] for call in calls), 1),
+            },
+        }
+        telemetry.record_analysis(analysis['_metadata'])
+        return analysis
+
+    def analyze(self, resume_path, resume_text=None, stats=None):
+        """Extract (unless ``resume_text`` is given) and run the fan-out evaluation"""
+        stats = stats or RunStats()
+        if resume_text is None:
+            print("📄 Extracting text...")
+            with stats.stage('extract'):
+                resume_text = self.analyzer.extract_text_from_document(str(resume_path))
+        analysis = self.analyze_text(resume_text, stats)
+        print("✅ Analysis complete!")
+        return analysis
+
+
+def summarize_fanout(analyses):
+    """Batch view of fan-out runs: calls per resume and wall-clock API time versus the same calls made serially"""
+    runs = [a['_metadata']['fanout'] for a in analyses if (a.get('_metadata') or {}).get('fanout')]
+    if not runs:
+        return None
+    wall_s = sum(run['parallel_ms'] + run['synthesis_ms'] for run in runs) / 1000
+    serial_s = sum(run['serial_ms'] for run in runs) / 1000
+    models = {}
+    for run in runs:
+        for call in run['calls']:
+            models[call['model']] = models.get(call['model'], 0) + 1
+    return {
+        'resumes': len(runs),
+        'calls': sum(len(run['calls']) for run in runs),
+        'calls_by_model': models,
+        'api_wall_seconds': round(wall_s, 1),
+        'api_serial_seconds': round(serial_s, 1),
+        'speedup': round(serial_s / wall_s, 1) if wall_s else None,
+    }
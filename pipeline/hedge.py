@@ -0,0 +1,166 @@
+"""
+Hedged requests
+Sends the analysis to the primary model and, if it has not answered by that
+model's observed p90 latency, sends the same prompt to a secondary provider;
+the first valid reply wins and the other is abandoned
+"""
+
+import sys
+import threading
+import time
+from queue import Queue, Empty
+
+from . import telemetry
+from .instrumentation import RunStats
+from .router import approx_tokens, estimate_call
+
+
+# Measured p90s from fewer analyses than this are too noisy; the typical latency table is used instead
+MIN_SAMPLES = 5
+
+
+class _MutedThreads:
+    """sys.stdout wrapper that drops the writes of abandoned hedge threads, which keep printing progress"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.muted = set()
+
+    def write(self, text):
+        if threading.current_thread() in self.muted:
+            return len(text)
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def _mute(thread):
+    """Silence ``thread`` for the rest of its run"""
+    if not isinstance(sys.stdout, _MutedThreads):
+        sys.stdout = _MutedThreads(sys.stdout)
+    sys.stdout.muted.add(thread)
+
+
+class HedgedAnalyzer:
+    """
+    Tail-latency hedging between two ResumeAnalyzers.
+
+    ``measured`` is ResultsStore.model_performance() output; ``hedge_after``
+    (seconds) overrides the primary's p90. The losing call runs on a daemon
+    thread: SDK calls cannot be interrupted, so it runs to completion with
+    its output silenced and its reply discarded (still billed by the vendor;
+    the estimate is reported as extra cost).
+    """
+
+    def __init__(self, primary, secondary, measured=None, hedge_after=None):
+        self.primary = primary
+        self.secondary = secondary
+        self.measured = measured or {}
+        self.hedge_after = hedge_after
+
+    def _estimate(self, analyzer, prompt_tokens):
+        perf = self.measured.get((analyzer.api_provider, analyzer.model))
+        if perf and perf.get('samples', 0) < MIN_SAMPLES:
+            perf = None
+        info = analyzer.AVAILABLE_MODELS[analyzer.api_provider][analyzer.model]
+        return estimate_call(info, analyzer.model, prompt_tokens, perf)
+
+    @staticmethod
+    def _start(role, analyzer, resume_text, resume_image, stats, results):
+        """Run the analysis on a daemon thread, unrecorded (analyze records the winner); returns (start time, thread)"""
+        def run():
+            try:
+                results.put((role, analyzer.analyze_text(resume_text, resume_image, stats, record=False), None))
+            except Exception as e:
+                results.put((role, None, e))
+            finally:
+                if isinstance(sys.stdout, _MutedThreads):
+                    sys.stdout.muted.discard(threading.current_thread())
+
+        thread = threading.Thread(target=run, name=f"hedge-{role}", daemon=True)
+        thread.start()
+        return time.perf_counter(), thread
+
+    def analyze(self, resume_path, resume_text=None, stats=None):
+        """Extract (unless ``resume_text`` is given), then run the hedged analysis"""
+        stats = stats or RunStats()
+        if resume_text is None:
+            print("📄 Extracting text...")
+            with stats.stage('extract'):
+                resume_text = self.primary.extract_text_from_document(str(resume_path))
+
+        prompt_tokens = approx_tokens(self.primary.create_analysis_prompt(resume_text))
+        _, p90 = self._estimate(self.primary, prompt_tokens)
+        hedge_after = self.hedge_after if self.hedge_after is not None else p90
+
+        results = Queue()
+        started = {'primary': self._start('primary', self.primary, resume_text, None, stats.fork(), results)}
+        errors = {}
+        winner = None
+        while winner is None and len(errors) < len(started):
+            timeout = None
+            if 'secondary' not in started:
+                timeout = max(0.0, hedge_after - (time.perf_counter() - started['primary'][0]))
+            try:
+                role, analysis, error = results.get(timeout=timeout)
+            except Empty:
+                role = None
+            if role is None or (role == 'primary' and error is not None and 'secondary' not in started):
+                reason = (f"primary failed: {error}" if role else
+                          f"no reply from {self.primary.model} after {hedge_after:.1f}s")
+                print(f"🏇 Hedging: {reason}; also sending to {self.secondary.api_provider.upper()} "
+                      f"({self.secondary.model})")
+                started['secondary'] = self._start('secondary', self.secondary, resume_text, None, stats.fork(),
+                                                   results)
+                hedge_reason = reason
+            if role is None:
+                continue
+            if error is not None:
+                errors[role] = str(error)
+            else:
+                winner = (role, analysis)
+
+        if winner is None:
+            raise Exception('; '.join(f"{role}: {error}" for role, error in errors.items()))
+
+        role, analysis = winner
+        hedge = {
+            'primary': f"{self.primary.api_provider}/{self.primary.model}",
+            'secondary': f"{self.secondary.api_provider}/{self.secondary.model}",
+            'hedge_after_s': round(hedge_after, 1),
+            'hedged': 'secondary' in started,
+            'winner': role,
+        }
+        if hedge['hedged']:
+            hedge['reason'] = hedge_reason
+            loser = 'primary' if role == 'secondary' else 'secondary'
+            if loser in errors:
+                hedge['loser_error'] = errors[loser]
+            else:
+                # Abandoned mid-flight: it cannot be cancelled, so silence its progress lines (they would land in
+                # the next resume's output); the vendor still bills it, so count an estimate of its full cost
+                _mute(started[loser][1])
+                hedge['extra_cost_est_usd'] = round(
+                    self._estimate(self.primary if loser == 'primary' else self.secondary, prompt_tokens)[0], 6)
+            print(f"🏁 {role.capitalize()} answered first ({analysis['_metadata']['model']})")
+        analysis['_metadata']['hedge'] = hedge
+        # Only the winner is exported; the abandoned call's reply is never used
+        telemetry.record_analysis(analysis['_metadata'])
+        print("✅ Analysis complete!")
+        return analysis
+
+
+def summarize_hedging(analyses):
+    """Batch hedge rate, which side won and the estimated extra spend on abandoned calls"""
+    runs = [a['_metadata']['hedge'] for a in analyses if (a.get('_metadata') or {}).get('hedge')]
+    if not runs:
+        return None
+    hedged = [run for run in runs if run['hedged']]
+    return {
+        'resumes': len(runs),
+        'hedged': len(hedged),
+        'hedge_rate': round(len(hedged) / len(runs), 3),
+        'secondary_won': sum(1 for run in hedged if run['winner'] == 'secondary'),
+        'extra_cost_est_usd': round(sum(run.get('extra_cost_est_usd', 0) for run in hedged), 4),
+    }
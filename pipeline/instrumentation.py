@@ -0,0 +1,202 @@
+"""
+Run instrumentation
+Per-stage timers, token usage pulled from each vendor's response and
+dollar cost from the local price table in AVAILABLE_MODELS
+"""
+
+import time
+from contextlib import contextmanager
+
+
+# Stages recorded by ResumeAnalyzer, in pipeline order
+STAGES = ['extract', 'prescreen', 'rasterize', 'prompt_build', 'encode_image', 'api_call', 'parse']
+
+USAGE_FIELDS = ['input_tokens', 'cached_input_tokens', 'output_tokens', 'reasoning_tokens']
+
+
+class RunStats:
+    """Collects stage timings and token usage for one analysis run"""
+
+    def __init__(self):
+        self.timings = {}
+        self.usage = {field: 0 for field in USAGE_FIELDS}
+        self.cost_usd = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.repairs = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage (repeated stages accumulate)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+
+    def add_usage(self, usage, pricing=None):
+        """Add one API call's normalized usage (see extract_usage) and its cost"""
+        self.calls += 1
+        for field in USAGE_FIELDS:
+            self.usage[field] += usage.get(field, 0) or 0
+        if pricing:
+            self.cost_usd += compute_cost(usage, pricing)
+
+    def fork(self):
+        """Copy with the same start time and stage timings so far (for concurrent attempts at the same analysis)"""
+        copy = RunStats()
+        copy._start = self._start
+        copy.timings = dict(self.timings)
+        return copy
+
+    def merge(self, other):
+        """Add another run's usage, cost, calls and repairs (timings stay with the caller, since concurrent calls overlap)"""
+        self.calls += other.calls
+        self.retries += other.retries
+        self.cost_usd += other.cost_usd
+        self.repairs.extend(other.repairs)
+        for field in USAGE_FIELDS:
+            self.usage[field] += other.usage[field]
+
+    def add_share(self, other, size, first):
+        """
+        One of ``size`` analyses answered by the same request (``other``):
+        its full timings (each waited for it) and an equal share of its usage
+        and cost; its calls, retries and repairs are counted on the
+        ``first`` analysis only, so batch totals add up.
+        """
+        for name, seconds in other.timings.items():
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+        for field in USAGE_FIELDS:
+            self.usage[field] += round(other.usage[field] / size)
+        self.cost_usd += other.cost_usd / size
+        if first:
+            self.calls += other.calls
+            self.retries += other.retries
+            self.repairs.extend(other.repairs)
+
+    def to_metadata(self):
+        """Serializable summary for analysis['_metadata']"""
+        return {
+            'timings_ms': {name: round(seconds * 1000, 1) for name, seconds in self.timings.items()},
+            'total_ms': round((time.perf_counter() - self._start) * 1000, 1),
+            'usage': dict(self.usage),
+            'api_calls': self.calls,
+            'retries': self.retries,
+            'cost_usd': round(self.cost_usd, 6),
+            **({'schema_repairs': list(self.repairs)} if self.repairs else {}),
+        }
+
+
+def _get(obj, name, default=0):
+    """Attribute-or-key lookup that tolerates missing fields and None"""
+    if obj is None:
+        return default
+    value = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+    return default if value is None else value
+
+
+def extract_usage(provider, response):
+    """
+    Normalize a vendor response's usage object.
+
+    ``input_tokens`` always includes cached prompt tokens; ``cached_input_tokens``
+    is the subset billed at the cached rate.
+    """
+    if provider == 'openai':
+        usage = _get(response, 'usage', None)
+        return {
+            'input_tokens': _get(usage, 'prompt_tokens'),
+            'cached_input_tokens': _get(_get(usage, 'prompt_tokens_details', None), 'cached_tokens'),
+            'output_tokens': _get(usage, 'completion_tokens'),
+            'reasoning_tokens': _get(_get(usage, 'completion_tokens_details', None), 'reasoning_tokens'),
+        }
+
+    if provider == 'anthropic':
+        usage = _get(response, 'usage', None)
+        cached = _get(usage, 'cache_read_input_tokens')
+        return {
+            'input_tokens': _get(usage, 'input_tokens') + cached + _get(usage, 'cache_creation_input_tokens'),
+            'cached_input_tokens': cached,
+            'output_tokens': _get(usage, 'output_tokens'),
+            'reasoning_tokens': 0,
+        }
+
+    if provider == 'google':
+        usage = _get(response, 'usage_metadata', None)
+        thoughts = _get(usage, 'thoughts_token_count')
+        return {
+            'input_tokens': _get(usage, 'prompt_token_count'),
+            'cached_input_tokens': _get(usage, 'cached_content_token_count'),
+            # Gemini bills thinking tokens as output
+            'output_tokens': _get(usage, 'candidates_token_count') + thoughts,
+            'reasoning_tokens': thoughts,
+        }
+
+    return {field: 0 for field in USAGE_FIELDS}
+
+
+def compute_cost(usage, pricing):
+    """Dollar cost of a call from normalized usage and per-1M-token prices"""
+    cached = usage.get('cached_input_tokens', 0) or 0
+    uncached = max(0, (usage.get('input_tokens', 0) or 0) - cached)
+    cost = uncached * pricing.get('input', 0)
+    cost += cached * pricing.get('cached_input', pricing.get('input', 0))
+    cost += (usage.get('output_tokens', 0) or 0) * pricing.get('output', 0)
+    return cost / 1_000_000
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize_runs(metadatas):
+    """
+    Aggregate the instrumentation of many analyses (a batch).
+
+    Returns totals for tokens and cost plus mean/p50/p95 per stage in ms.
+    """
+    metadatas = [m for m in metadatas if m]
+    summary = {
+        'analyses': len(metadatas),
+        'api_calls': sum(m.get('api_calls', 0) for m in metadatas),
+        'cost_usd': round(sum(m.get('cost_usd', 0) for m in metadatas), 4),
+        'usage': {field: sum(m.get('usage', {}).get(field, 0) for m in metadatas) for field in USAGE_FIELDS},
+        'stages_ms': {},
+    }
+    stage_names = [s for s in STAGES if any(s in m.get('timings_ms', {}) for m in metadatas)]
+    for name in stage_names + ['total']:
+        if name == 'total':
+            values = [m['total_ms'] for m in metadatas if 'total_ms' in m]
+        else:
+            values = [m['timings_ms'][name] for m in metadatas if name in m.get('timings_ms', {})]
+        if values:
+            summary['stages_ms'][name] = {
+                'mean': round(sum(values) / len(values), 1),
+                'p50': round(_percentile(values, 50), 1),
+                'p95': round(_percentile(values, 95), 1),
+                'sum': round(sum(values), 1),
+            }
+    if metadatas:
+        summary['cost_per_analysis_usd'] = round(summary['cost_usd'] / len(metadatas), 4)
+    return summary
+
+
+def format_summary(summary):
+    """Human-readable batch summary lines"""
+    usage = summary['usage']
+    lines = [
+        f"📈 Batch summary: {summary['analyses']} analyses, {summary['api_calls']} API calls, "
+        f"${summary['cost_usd']:.4f} total (${summary.get('cost_per_analysis_usd', 0):.4f}/analysis)",
+        f"   Tokens: {usage['input_tokens']:,} in ({usage['cached_input_tokens']:,} cached), "
+        f"{usage['output_tokens']:,} out ({usage['reasoning_tokens']:,} reasoning)",
+    ]
+    for name, stats in summary['stages_ms'].items():
+        lines.append(f"   {name:<13} mean {stats['mean']:>9.1f} ms   p50 {stats['p50']:>9.1f} ms   "
+                     f"p95 {stats['p95']:>9.1f} ms")
+    return lines
@@ -0,0 +1,208 @@
+"""
+Multi-resume packing
+Evaluates several resumes per request so the framework prompt is sent once
+per pack instead of once per resume: resumes are delimited by ids, the
+reply is an array of analyses split back per candidate, and the pack size
+is chosen from a token budget and the model's output limit
+"""
+
+import time
+
+from . import telemetry
+from .instrumentation import RunStats
+from .router import DEFAULT_OUTPUT_TOKENS, approx_tokens
+
+
+# Input + expected output tokens per packed request (further capped by the model's context window)
+DEFAULT_PACK_BUDGET = 60_000
+# More resumes per request than this and later entries get noticeably thinner evidence
+MAX_PACK = 8
+# Output allowance per analysis relative to the expected reply size (long resumes get longer evidence)
+OUTPUT_HEADROOM = 1.5
+# Measured output sizes from fewer analyses than this are too noisy; DEFAULT_OUTPUT_TOKENS is used instead
+MIN_SAMPLES = 5
+
+_DELIMITER_TOKENS = 12
+
+
+def format_pack(resumes):
+    """Resume section of a packed prompt from [(resume_id, text)]"""
+    return '\n\n'.join(f"=== RESUME {resume_id} ===\n{text.strip()}\n=== END RESUME {resume_id} ==="
+                       for resume_id, text in resumes)
+
+
+def plan_pack_size(framework_tokens, resume_tokens, output_tokens, budget, limits, max_size=MAX_PACK):
+    """
+    How many of the next resumes (``resume_tokens``, in order) fit in one
+    request: framework plus resumes plus their expected replies within
+    ``budget`` and the model's context window, replies within its output
+    limit. Always at least 1.
+    """
+    budget = min(budget, limits.get('context', budget))
+    per_reply = output_tokens * OUTPUT_HEADROOM
+    used = framework_tokens
+    size = 0
+    for tokens in resume_tokens[:max_size]:
+        used += tokens + _DELIMITER_TOKENS + per_reply
+        if size and (used > budget or (size + 1) * per_reply > limits.get('output', float('inf'))):
+            break
+        size += 1
+    return max(1, size)
+
+
+class PackedAnalyzer:
+    """
+    Packs the resumes of a batch into multi-resume requests on one analyzer.
+
+    ``paths`` is the batch in analysis order; analyze(path) packs that resume
+    with the next ones not yet analyzed and returns its result, answering the
+    rest from the pack later. Resumes missing from a packed reply, or a pack
+    whose request fails, fall back to one call per resume.
+    """
+
+    def __init__(self, analyzer, paths, texts=None, budget=None, measured=None, max_size=MAX_PACK):
+        self.analyzer = analyzer
+        self.pending = list(paths)
+        self.texts = dict(texts or {})
+        self.budget = budget or DEFAULT_PACK_BUDGET
+        self.max_size = max_size
+        self.limits = analyzer.AVAILABLE_MODELS[analyzer.api_provider][analyzer.model].get('limits', {})
+        perf = (measured or {}).get((analyzer.api_provider, analyzer.model))
+        self.output_tokens = (perf['avg_output_tokens'] if perf and perf.get('samples', 0) >= MIN_SAMPLES
+                              and perf.get('avg_output_tokens') else DEFAULT_OUTPUT_TOKENS)
+        self.framework_tokens = approx_tokens(analyzer.create_analysis_prompt('', ['R1']))
+        self.results = {}
+        # RunStats of resumes extracted while planning a pack, until they are analyzed
+        self.stats = {}
+        self.packs = 0
+
+    def _text(self, path, stats):
+        if self.texts.get(path) is None:
+            print(f"📄 Extracting text from {path.name}...")
+            with stats.stage('extract'):
+                self.texts[path] = self.analyzer.extract_text_from_document(str(path))
+        return self.texts[path]
+
+    def _single(self, text, stats, reason):
+        print(f"↩️  {reason}; analyzing on its own")
+        return self.analyzer.analyze_text(text, stats=stats)
+
+    def _metadata(self, stats, pack):
+        analyzer = self.analyzer
+        metadata = {
+            'provider': analyzer.api_provider,
+            'model': analyzer.model,
+            'model_display_name': analyzer.AVAILABLE_MODELS[analyzer.api_provider][analyzer.model]['name'],
+            'visual_analysis': False,
+            **({'wire': analyzer.wire} if analyzer.wire != 'full' else {}),
+            **({'speed': analyzer.speed} if analyzer.speed else {}),
+            'framework': analyzer.framework_metadata(),
+            **stats.to_metadata(),
+            'pack': pack,
+        }
+        telemetry.record_analysis(metadata)
+        return metadata
+
+    def _run_pack(self, first, stats):
+        """Analyze ``first`` and the resumes after it that fit in one request; fills self.results"""
+        members = [first] + [path for path in self.pending if path != first]
+        self.stats[first] = stats
+        sizes = []
+        for path in members[:self.max_size]:
+            try:
+                sizes.append(approx_tokens(self._text(path, self.stats.setdefault(path, RunStats()))))
+            except Exception:
+                if path == first:
+                    raise
+                # Left for its own analyze() call, which reports the failure
+                break
+        size = plan_pack_size(self.framework_tokens, sizes, self.output_tokens, self.budget, self.limits,
+                              self.max_size)
+        members = members[:size]
+        stats_by_path = {}
+        for path in members:
+            self.pending.remove(path)
+            stats_by_path[path] = self.stats.pop(path)
+
+        if size == 1:
+            analysis = self.analyzer.analyze_text(self.texts[first], stats=stats)
+            self.results[first] = (analysis, None)
+            return
+
+        self.packs += 1
+        ids = [f"R{index}" for index in range(1, size + 1)]
+        analyzer = self.analyzer
+        print(f"📦 Pack {self.packs}: {size} resumes in one request to {analyzer.api_provider.upper()} "
+              f"({analyzer.model})...")
+        pack_stats = RunStats()
+        with pack_stats.stage('prompt_build'):
+            prompt = analyzer.create_analysis_prompt(format_pack(zip(ids, (self.texts[p] for p in members))), ids)
+        max_tokens = min(self.limits.get('output', DEFAULT_OUTPUT_TOKENS * size),
+                         int(size * self.output_tokens * OUTPUT_HEADROOM) + 1000)
+        start = time.perf_counter()
+        try:
+            reply = analyzer._complete_json(prompt, stats=pack_stats, schema=analyzer.packed_schema(ids),
+                                            max_tokens=max_tokens)
+            by_id = {}
+            for item in reply['analyses']:
+                by_id.setdefault(item.pop('resume_id'), item)
+        except Exception as e:
+            print(f"⚠️  Pack {self.packs} failed: {str(e)}")
+            by_id, error = {}, e
+        else:
+            error = None
+        request_ms = round((time.perf_counter() - start) * 1000, 1)
+        answered = [resume_id for resume_id in ids if resume_id in by_id]
+
+        for position, (resume_id, path) in enumerate(zip(ids, members)):
+            path_stats = stats_by_path[path]
+            try:
+                if resume_id not in by_id:
+                    reason = f"pack request failed ({error})" if error else f"{resume_id} missing from the reply"
+                    self.results[path] = (self._single(self.texts[path], path_stats, f"{path.name}: {reason}"),
+                                          None)
+                    continue
+                analysis = analyzer.expand_reply(by_id[resume_id])
+                path_stats.add_share(pack_stats, len(answered), first=resume_id == answered[0])
+                analysis['_metadata'] = self._metadata(path_stats, {
+                    'id': self.packs,
+                    'size': size,
+                    'position': position + 1,
+                    'request_ms': request_ms,
+                    'prompt_tokens_est': approx_tokens(prompt),
+                    'pack_cost_usd': round(pack_stats.cost_usd, 6),
+                })
+                self.results[path] = (analysis, None)
+            except Exception as e:
+                self.results[path] = (None, e)
+
+    def analyze(self, resume_path, resume_text=None, stats=None):
+        """Result for ``resume_path``, running the pack that starts with it when it has none yet"""
+        stats = stats or self.stats.get(resume_path) or RunStats()
+        if resume_text is not None:
+            self.texts[resume_path] = resume_text
+        if resume_path not in self.results:
+            if resume_path not in self.pending:
+                self.pending.insert(0, resume_path)
+            self._run_pack(resume_path, stats)
+        analysis, error = self.results.pop(resume_path)
+        if error is not None:
+            raise error
+        print("✅ Analysis complete!")
+        return analysis
+
+
+def summarize_packing(analyses):
+    """Batch packing view: packs sent, resumes per pack and resumes that fell back to their own call"""
+    packed = [a['_metadata']['pack'] for a in analyses if (a.get('_metadata') or {}).get('pack')]
+    if not packed:
+        return None
+    packs = {run['id']: run for run in packed}
+    return {
+        'resumes': len(analyses),
+        'packed': len(packed),
+        'packs': len(packs),
+        'avg_pack_size': round(len(packed) / len(packs), 1) if packs else 0,
+        'single_calls': len(analyses) - len(packed),
+        'pack_cost_usd': round(sum(run['pack_cost_usd'] for run in packs.values()), 4),
+    }
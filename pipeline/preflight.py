@@ -0,0 +1,165 @@
+"""
+Preflight estimate
+--dry-run: builds every prompt a run would send, counts tokens offline and
+projects spend, token totals and wall time from the local price and latency
+tables (or the results store's measurements), without calling any API
+"""
+
+import math
+
+from .compact import OUTPUT_RATIO as COMPACT_OUTPUT_RATIO
+from .rasterize import VISION_DPI, grid_size, page_sizes, readable_dpi
+from .router import DEFAULT_LATENCY_S, DEFAULT_OUTPUT_TOKENS, FALLBACK_LATENCY_S
+
+
+# Measurements from fewer analyses than this are too noisy; the typical latency/output tables are used instead
+MIN_SAMPLES = 5
+
+
+def image_tokens(provider, width, height):
+    """
+    Input tokens for one image of ``width`` x ``height`` pixels, following
+    each vendor's published accounting: OpenAI high detail (fit in 2048,
+    shortest side 768, 85 + 170 per 512px tile), Claude (long edge 1568 and
+    ~1.15 MP cap, pixels / 750), Gemini (258 per 768px tile, 258 when both
+    sides are 384px or less).
+    """
+    if provider == 'openai':
+        scale = min(1.0, 2048 / max(width, height))
+        width, height = width * scale, height * scale
+        scale = min(1.0, 768 / min(width, height))
+        width, height = width * scale, height * scale
+        return 85 + 170 * math.ceil(width / 512) * math.ceil(height / 512)
+    if provider == 'anthropic':
+        scale = min(1.0, 1568 / max(width, height), math.sqrt(1_150_000 / (width * height)))
+        return math.ceil(width * scale * height * scale / 750)
+    if width <= 384 and height <= 384:
+        return 258
+    return 258 * math.ceil(width / 768) * math.ceil(height / 768)
+
+
+def page_pixels(pdf_path, pages=None, dpi=VISION_DPI):
+    """Pixel size of the image sent for a PDF's ``pages``: one page, or the grid of several (pipeline/rasterize.py)"""
+    return grid_size(page_sizes(pdf_path, pages, dpi))
+
+
+def readable_pixels(pdf_path, pages, dpi=VISION_DPI):
+    """Pixel sizes of the page images sent to read scanned ``pages``, one per page (see render_readable)"""
+    return page_sizes(pdf_path, pages, readable_dpi(pdf_path, pages, dpi))
+
+
+def estimate_call(info, provider, model, input_tokens, analyses=1, perf=None, wire='full'):
+    """
+    One request: input and expected output tokens, USD and seconds. Output
+    size and latency come from ``perf`` (ResultsStore.model_performance()
+    entry) once it has MIN_SAMPLES analyses, else from the typical tables;
+    both scale with the number of analyses in the reply (--pack, --roles).
+    The typical output size is for the full report JSON; ``wire`` 'compact'
+    scales it by COMPACT_OUTPUT_RATIO (measured sizes already reflect the
+    wire format they were run with).
+    """
+    if perf and perf.get('samples', 0) < MIN_SAMPLES:
+        perf = None
+    if perf and perf.get('avg_output_tokens'):
+        per_analysis = perf['avg_output_tokens']
+    else:
+        per_analysis = DEFAULT_OUTPUT_TOKENS * (COMPACT_OUTPUT_RATIO if wire == 'compact' else 1.0)
+    output_tokens = round(per_analysis * analyses)
+    pricing = info.get('pricing') or {}
+    latency = perf['p50_ms'] / 1000 if perf else DEFAULT_LATENCY_S.get(model, FALLBACK_LATENCY_S)
+    return {
+        'provider': provider,
+        'model': model,
+        'input_tokens': input_tokens,
+        'output_tokens': output_tokens,
+        'cost_usd': (input_tokens * pricing.get('input', 0) + output_tokens * pricing.get('output', 0)) / 1_000_000,
+        'seconds': latency * analyses,
+        'measured': perf is not None,
+    }
+
+
+def project(calls, resumes, concurrency=1, rpm=None, tpm=None, extract_seconds=0.0, duplicates=0,
+            image_tokens_total=0):
+    """
+    Batch projection from estimate_call() results. Wall time is extraction
+    plus the slowest of: the calls spread over ``concurrency`` slots, the
+    longest single call, and each provider's requests/tokens under the
+    ``rpm``/``tpm`` limits (per provider, per minute).
+    """
+    serial = sum(call['seconds'] for call in calls)
+    bounds = {'concurrency': serial / max(1, concurrency)}
+    if calls:
+        bounds['longest call'] = max(call['seconds'] for call in calls)
+    by_model = {}
+    by_provider = {}
+    for call in calls:
+        row = by_model.setdefault(f"{call['provider']}/{call['model']}", {
+            'calls': 0, 'input_tokens': 0, 'output_tokens': 0, 'cost_usd': 0.0, 'measured': call['measured']})
+        row['calls'] += 1
+        row['input_tokens'] += call['input_tokens']
+        row['output_tokens'] += call['output_tokens']
+        row['cost_usd'] += call['cost_usd']
+        totals = by_provider.setdefault(call['provider'], [0, 0])
+        totals[0] += 1
+        totals[1] += call['input_tokens'] + call['output_tokens']
+    for provider, (requests, tokens) in by_provider.items():
+        if rpm:
+            bounds[f'{provider} rpm'] = requests / rpm * 60
+        if tpm:
+            bounds[f'{provider} tpm'] = tokens / tpm * 60
+    limited_by = max(bounds, key=bounds.get)
+
+    for row in by_model.values():
+        row['cost_usd'] = round(row['cost_usd'], 4)
+    input_tokens = sum(call['input_tokens'] for call in calls)
+    output_tokens = sum(call['output_tokens'] for call in calls)
+    cost = sum(call['cost_usd'] for call in calls)
+    return {
+        'resumes': resumes,
+        'duplicates': duplicates,
+        'calls': len(calls),
+        'input_tokens': input_tokens,
+        'image_tokens': image_tokens_total,
+        'output_tokens': output_tokens,
+        'cost_usd': round(cost, 4),
+        'cost_per_resume_usd': round(cost / resumes, 4) if resumes else 0,
+        'extract_seconds': round(extract_seconds, 1),
+        'api_serial_seconds': round(serial, 1),
+        'wall_seconds': round(extract_seconds + bounds[limited_by], 1),
+        'limited_by': limited_by,
+        'concurrency': concurrency,
+        'rpm': rpm,
+        'tpm': tpm,
+        'by_model': by_model,
+    }
+
+
+def _duration(seconds):
+    if seconds < 120:
+        return f"{seconds:.0f}s"
+    if seconds < 7200:
+        return f"{seconds / 60:.1f} min"
+    return f"{seconds / 3600:.1f} h"
+
+
+def format_projection(projection):
+    """Human-readable dry-run lines"""
+    p = projection
+    lines = [
+        f"🧾 Dry run: {p['resumes']} resume(s)"
+        + (f" (+{p['duplicates']} duplicate(s) reusing an analysis)" if p['duplicates'] else '')
+        + f", {p['calls']} API call(s), ~${p['cost_usd']:.2f} (~${p['cost_per_resume_usd']:.4f}/resume)",
+        f"   Tokens: ~{p['input_tokens']:,} in"
+        + (f" ({p['image_tokens']:,} image)" if p['image_tokens'] else '')
+        + f", ~{p['output_tokens']:,} out",
+    ]
+    for name, row in p['by_model'].items():
+        lines.append(f"   {name:<38} {row['calls']:>5} call(s)  {row['input_tokens']:>11,} in  "
+                     f"{row['output_tokens']:>10,} out  ${row['cost_usd']:>9.4f}"
+                     + ('' if row['measured'] else '  (typical latency/output)'))
+    limits = [f"concurrency {p['concurrency']}"]
+    limits += [f"{p[key]:,} {key}" for key in ('rpm', 'tpm') if p[key]]
+    lines.append(f"   Wall time: ~{_duration(p['wall_seconds'])} with {', '.join(limits)} "
+                 f"(bound: {p['limited_by']}; {_duration(p['api_serial_seconds'])} of API time serially, "
+                 f"{_duration(p['extract_seconds'])} extracting)")
+    return lines
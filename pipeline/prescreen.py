@@ -0,0 +1,256 @@
+"""
+Local pre-screen
+Deterministic text features that approximate the hard framework checks
+(building in public, hands-on AI work, builder vs manager language,
+personal projects, buzzwords) without any API call
+"""
+
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+from .instrumentation import RunStats
+
+
+# Links that count as building in public / verifiable work, matched against URL-like tokens only
+LINK_PATTERNS = {
+    'github': r'(?:github|gitlab)\.com/\w',
+    'ml_hub': r'(?:huggingface\.co|kaggle\.com)/\w',
+    'blog': r'[\w-]+\.substack\.com|medium\.com/|dev\.to/\w|[\w-]+\.hashnode\.dev|blog\.|/blog',
+    'social': r'(?:twitter|x)\.com/\w|youtube\.com/|linkedin\.com/(?:posts|pulse)/',
+    'portfolio': r'[\w-]+\.(?:dev|io|ai|me|app|xyz|site|page)(?:/|$)',
+}
+
+# Single words that mean AI/ML in a resume; generic words ('model', 'agent', 'learning', 'prompt', 'vector')
+# and first names ('claude') only count inside the phrases below
+AI_TERMS = [
+    'ai', 'ml', 'llm', 'llms', 'gpt', 'rag', 'nlp', 'embedding', 'embeddings', 'fine-tuned', 'fine-tuning',
+    'finetuned', 'agentic', 'evals', 'langchain', 'llamaindex', 'openai', 'anthropic', 'gemini', 'pytorch',
+    'tensorflow', 'multimodal', 'reranker', 'genai', 'chatbot', 'ollama', 'huggingface', 'function-calling',
+    'tool-use', 'chatgpt', 'scikit-learn',
+]
+# Word pairs, each counted as one term
+AI_PHRASES = [
+    'machine learning', 'deep learning', 'reinforcement learning', 'language model', 'language models',
+    'ai agent', 'ai agents', 'llm agents', 'prompt engineering', 'vector database', 'vector search',
+    'vector store', 'neural network', 'neural networks', 'ml model', 'ml models', 'ai model', 'ai models',
+    'computer vision', 'generative ai', 'stable diffusion', 'hugging face', 'model inference', 'model evaluation',
+    'claude api', 'openai api', 'speech recognition', 'recommendation model',
+]
+
+BUILDER_VERBS = [
+    'built', 'build', 'building', 'shipped', 'ship', 'shipping', 'launched', 'prototyped', 'prototype', 'deployed',
+    'coded', 'wrote', 'created', 'developed', 'hacked', 'implemented', 'trained', 'fine-tuned', 'automated',
+    'designed', 'engineered', 'made', 'released', 'open-sourced',
+]
+
+MANAGER_VERBS = [
+    'managed', 'led', 'leading', 'oversaw', 'coordinated', 'directed', 'supervised', 'spearheaded', 'drove',
+    'aligned', 'facilitated', 'owned', 'orchestrated', 'championed', 'stakeholder', 'stakeholders',
+]
+
+BUZZWORDS = [
+    'leverage', 'leveraged', 'leveraging', 'synergy', 'synergies', 'cutting-edge', 'revolutionize',
+    'revolutionized', 'transformative', 'innovative', 'game-changing', 'world-class', 'disrupt', 'disruptive',
+    'best-in-class', 'thought', 'visionary', 'ai-first', 'ai-powered', 'ai-driven', 'next-generation', 'unlock',
+]
+
+# Patterns start on a literal so the scan over lower-cased text stays fast; a bare "project" is not a
+# marker ("project management"), only qualified projects and a Projects section heading on its own line
+PROJECT_MARKERS = (r'(?:side|personal|pet|hobby|weekend|open[- ]source) projects?\b|\nprojects?[ \t]*:?[ \t]*\n'
+                   r'|hackathon|open[- ]source|built for fun')
+SPEED_MARKERS = r' in (?:a |one |two |\d+ )?(?:hours?|evenings?|weekends?|days?)\b|overnight'
+
+_LINK_RE = re.compile('|'.join(f"(?P<{name}>{pattern})" for name, pattern in LINK_PATTERNS.items()))
+_PROJECT_RE = re.compile(PROJECT_MARKERS)
+_SPEED_RE = re.compile(SPEED_MARKERS)
+_PUNCTUATION = '.,;:!?()[]{}<>"\'`*•|/'
+_AI_SET = frozenset(AI_TERMS)
+_AI_PHRASE_SET = frozenset(tuple(phrase.split()) for phrase in AI_PHRASES)
+_BUILDER_SET = frozenset(BUILDER_VERBS)
+_MANAGER_SET = frozenset(MANAGER_VERBS)
+_BUZZ_SET = frozenset(BUZZWORDS)
+
+# Thresholds for the checks below
+MIN_WORDS = 80
+MIN_AI_TERMS = 3
+MIN_AI_PER_1000 = 8.0
+MIN_BUILDER_RATIO = 0.35
+MAX_BUZZ_TO_AI = 1.0
+FAIL_CHECKS = 3
+
+
+def extract_features(text):
+    """Feature extraction over resume text (split + set lookups, no per-position regex scans)"""
+    lowered = text.lower()
+    tokens = lowered.split()
+    words = [token.strip(_PUNCTUATION) for token in tokens]
+    counts = Counter(words)
+    word_count = len(tokens)
+    ai = sum(counts[word] for word in _AI_SET.intersection(counts))
+    ai += sum(1 for pair in zip(words, words[1:]) if pair in _AI_PHRASE_SET)
+    builder = sum(counts[word] for word in _BUILDER_SET.intersection(counts))
+    manager = sum(counts[word] for word in _MANAGER_SET.intersection(counts))
+    buzz = sum(counts[word] for word in _BUZZ_SET.intersection(counts))
+
+    links = dict.fromkeys(LINK_PATTERNS, 0)
+    for token in tokens:
+        # Email addresses (jane@studio.io) are not portfolio links
+        if '.' in token[1:-1] and '@' not in token:
+            match = _LINK_RE.search(token)
+            if match:
+                links[match.lastgroup] += 1
+    return {
+        'words': word_count,
+        'links': links,
+        'public_links': links['github'] + links['ml_hub'] + links['blog'] + links['portfolio'] + links['social'],
+        'ai_terms': ai,
+        'ai_per_1000_words': round(1000 * ai / word_count, 1) if word_count else 0.0,
+        'builder_verbs': builder,
+        'manager_verbs': manager,
+        'builder_ratio': round(builder / (builder + manager), 2) if builder + manager else None,
+        'buzzwords': buzz,
+        'project_mentions': len(_PROJECT_RE.findall('\n' + lowered + '\n')),
+        'speed_mentions': len(_SPEED_RE.findall(lowered)),
+    }
+
+
+def evaluate(features):
+    """Return (verdict, failed checks) where verdict is 'pass', 'uncertain' or 'fail'"""
+    if features['words'] < MIN_WORDS:
+        # Too little text to judge (often a scanned or image-only resume)
+        return 'uncertain', ['too little extractable text']
+
+    failed = []
+    if not features['public_links']:
+        failed.append('no GitHub/blog/portfolio links (building in public)')
+    if features['ai_terms'] < MIN_AI_TERMS or features['ai_per_1000_words'] < MIN_AI_PER_1000:
+        failed.append('little AI/ML vocabulary (hands-on AI work)')
+    ratio = features['builder_ratio']
+    if ratio is None or ratio < MIN_BUILDER_RATIO:
+        failed.append("mostly 'managed'/'led' rather than 'built'/'shipped'")
+    if not features['project_mentions']:
+        failed.append('no personal/side projects')
+    if features['buzzwords'] > max(2, MAX_BUZZ_TO_AI * features['ai_terms']):
+        failed.append('buzzword-heavy')
+
+    if features['ai_terms'] == 0 or len(failed) >= FAIL_CHECKS:
+        return 'fail', failed
+    if not failed:
+        return 'pass', failed
+    return 'uncertain', failed
+
+
+def prescreen_text(text):
+    """Features plus verdict for one resume (JSON-serializable, stored in _metadata['prescreen'])"""
+    start = time.perf_counter()
+    features = extract_features(text)
+    verdict, failed = evaluate(features)
+    return {
+        'verdict': verdict,
+        'failed_checks': failed,
+        'features': features,
+        'elapsed_ms': round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def prescreen_analysis(result, resume_text, source_name=''):
+    """Local No Screen analysis for a resume skipped by --prescreen skip"""
+    first_line = next((line.strip() for line in resume_text.splitlines() if line.strip()), '')
+    candidate = first_line if 0 < len(first_line.split()) <= 4 else (source_name or 'Candidate')
+    reason = '; '.join(result['failed_checks'])
+    features = result['features']
+    return {
+        'candidate_name': candidate,
+        'minimum_thresholds_met': {
+            'personal_ai_projects': bool(features['project_mentions']) and features['ai_terms'] >= MIN_AI_TERMS,
+            'building_in_public': bool(features['public_links']),
+            'all_met': False,
+        },
+        'red_flags_found': [],
+        'yellow_flags_found': [],
+        'pillars': {},
+        # Not scored by a model; 0 keeps totals, leaderboards and the store numeric
+        'total_score': 0,
+        'decision': 'No Screen',
+        'decision_rationale': f"Skipped by the local pre-screen (no AI evaluation): {reason}.",
+        'top_strengths': [],
+        'top_concerns': result['failed_checks'],
+        'recommendation': 'Not evaluated by an AI model. Re-run without --prescreen skip for a full report.',
+        'suitable_roles': [],
+        'interview_focus_areas': [],
+        '_metadata': {
+            'provider': 'local',
+            'model': 'prescreen',
+            'model_display_name': 'Local pre-screen',
+            'visual_analysis': False,
+        },
+    }
+
+
+class PrescreenGate:
+    """
+    Runs the local pre-screen in front of an ``analyze(path, resume_text=, stats=)``
+    callable (ResumeAnalyzer.analyze_resume, ModelRouter.analyze, CascadeAnalyzer.analyze).
+
+    ``mode`` decides what happens to clear fails: 'flag' still runs the normal
+    analysis, 'cheap' sends them to ``cheap_analyzer`` (a screening-model
+    ResumeAnalyzer) and 'skip' answers locally without an API call.
+    """
+
+    MODES = ('flag', 'cheap', 'skip')
+
+    def __init__(self, extractor, analyze, mode='flag', cheap_analyzer=None):
+        self.extractor = extractor
+        self.analyze_full = analyze
+        self.mode = mode
+        self.cheap_analyzer = cheap_analyzer
+
+    def analyze(self, resume_path, resume_text=None, stats=None):
+        stats = stats or RunStats()
+        if resume_text is None:
+            print("📄 Extracting text...")
+            with stats.stage('extract'):
+                resume_text = self.extractor.extract_text_from_document(str(resume_path))
+        with stats.stage('prescreen'):
+            result = prescreen_text(resume_text)
+
+        action = 'full'
+        if result['verdict'] == 'fail' and self.mode == 'skip':
+            action = 'skip'
+        elif result['verdict'] == 'fail' and self.mode == 'cheap' and self.cheap_analyzer is not None:
+            action = 'cheap'
+        result['action'] = action
+        detail = f" ({'; '.join(result['failed_checks'])})" if result['failed_checks'] else ''
+        print(f"🔎 Pre-screen: {result['verdict']}{detail}")
+
+        if action == 'skip':
+            print("⏹️  Clear fail: skipping the AI evaluation")
+            analysis = prescreen_analysis(result, resume_text, Path(resume_path).stem)
+            analysis['_metadata'].update(stats.to_metadata())
+        elif action == 'cheap':
+            print(f"⬇️  Clear fail: evaluating with {self.cheap_analyzer.model}")
+            analysis = self.cheap_analyzer.analyze_resume(str(resume_path), resume_text=resume_text, stats=stats)
+        else:
+            analysis = self.analyze_full(resume_path, resume_text=resume_text, stats=stats)
+        analysis['_metadata']['prescreen'] = result
+        return analysis
+
+
+def summarize_prescreen(analyses):
+    """Batch counts of pre-screen verdicts and the API calls avoided or downgraded"""
+    results = [(a['_metadata'], a['_metadata']['prescreen']) for a in analyses
+               if (a.get('_metadata') or {}).get('prescreen')]
+    if not results:
+        return None
+    verdicts = {'pass': 0, 'uncertain': 0, 'fail': 0}
+    for _, result in results:
+        verdicts[result['verdict']] += 1
+    return {
+        'resumes': len(results),
+        'verdicts': verdicts,
+        'skipped': sum(1 for _, result in results if result.get('action') == 'skip'),
+        'cheap_model': sum(1 for _, result in results if result.get('action') == 'cheap'),
+        'avg_prescreen_ms': round(sum(r['elapsed_ms'] for _, r in results) / len(results), 3),
+    }
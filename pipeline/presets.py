@@ -0,0 +1,112 @@
+"""
+Speed presets
+--speed fast|balanced|thorough mapped to each provider's latency knobs:
+GPT-5 reasoning effort and verbosity, Claude extended-thinking budget and
+max tokens, Gemini output-token cap
+"""
+
+SPEEDS = ['fast', 'balanced', 'thorough']
+
+SPEED_PRESETS = {
+    'fast': {
+        'openai': {'reasoning_effort': 'minimal', 'verbosity': 'low'},
+        'anthropic': {'max_tokens': 4000, 'thinking_budget': 0},
+        'google': {'max_output_tokens': 8192},
+    },
+    'balanced': {
+        'openai': {'reasoning_effort': 'low', 'verbosity': 'medium'},
+        'anthropic': {'max_tokens': 8000, 'thinking_budget': 2048},
+        'google': {'max_output_tokens': 16384},
+    },
+    'thorough': {
+        'openai': {'reasoning_effort': 'high', 'verbosity': 'high'},
+        'anthropic': {'max_tokens': 16000, 'thinking_budget': 8000},
+        'google': {'max_output_tokens': None},
+    },
+}
+
+
+def speed_options(provider, model, speed):
+    """
+    Request options for one call ({} when ``speed`` is None, i.e. the
+    provider defaults). Reasoning effort and verbosity only exist on GPT-5
+    models; Gemini thinking budgets are not exposed by google-generativeai,
+    so its preset caps output tokens (thinking counts towards that cap).
+    """
+    if not speed:
+        return {}
+    options = dict(SPEED_PRESETS[speed].get(provider, {}))
+    if provider == 'openai' and not model.startswith('gpt-5'):
+        options = {}
+    return options
+
+
+def _stdev(values):
+    mean = sum(values) / len(values)
+    return (sum((v - mean) ** 2 for v in values) / (len(values) - 1)) ** 0.5
+
+
+def preset_stability(rows):
+    """
+    Per (provider, model, speed): run count, latency, output tokens, cost and
+    score stability from stored analyses. ``rows`` have provider, model,
+    speed, source_file, duration_ms, output_tokens, cost_usd, total_score and
+    decision; stability comes from resumes analyzed more than once with the
+    same settings (mean total-score standard deviation, and how often the
+    decision matched that resume's most common decision).
+    """
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['provider'], row['model'], row['speed'] or 'default'), []).append(row)
+
+    report = []
+    for (provider, model, speed), runs in sorted(groups.items()):
+        durations = sorted(r['duration_ms'] for r in runs if r['duration_ms'] is not None)
+        by_file = {}
+        for r in runs:
+            if r['source_file']:
+                by_file.setdefault(r['source_file'], []).append(r)
+        repeated = [file_runs for file_runs in by_file.values() if len(file_runs) > 1]
+        stdevs = [_stdev([r['total_score'] for r in file_runs]) for file_runs in repeated
+                  if all(r['total_score'] is not None for r in file_runs)]
+        matches = total = 0
+        for file_runs in repeated:
+            decisions = [r['decision'] for r in file_runs]
+            matches += max(decisions.count(d) for d in set(decisions))
+            total += len(decisions)
+        report.append({
+            'provider': provider,
+            'model': model,
+            'speed': speed,
+            'runs': len(runs),
+            'p50_s': round(durations[len(durations) // 2] / 1000, 1) if durations else None,
+            'p90_s': round(durations[min(len(durations) - 1, int(len(durations) * 0.9))] / 1000, 1)
+            if durations else None,
+            'avg_output_tokens': round(sum(r['output_tokens'] or 0 for r in runs) / len(runs)),
+            'avg_cost_usd': round(sum(r['cost_usd'] or 0 for r in runs) / len(runs), 4),
+            'repeated_resumes': len(repeated),
+            'score_stdev': round(sum(stdevs) / len(stdevs), 2) if stdevs else None,
+            'decision_agreement': round(matches / total, 2) if total else None,
+        })
+    return report
+
+
+def format_stability(report):
+    """Aligned table of preset_stability() output"""
+    if not report:
+        return "No instrumented analyses in the store."
+    headers = ['Provider', 'Model', 'Speed', 'Runs', 'p50 s', 'p90 s', 'Out tok', '$/run', 'Repeats', 'Score sd',
+               'Decision agree']
+
+    def fmt(value, spec=''):
+        return '-' if value is None else format(value, spec)
+
+    table = [headers] + [[
+        row['provider'] or '-', row['model'] or '-', row['speed'], str(row['runs']), fmt(row['p50_s']),
+        fmt(row['p90_s']), str(row['avg_output_tokens']), fmt(row['avg_cost_usd'], '.4f'),
+        str(row['repeated_resumes']), fmt(row['score_stdev']), fmt(row['decision_agreement'], '.0%'),
+    ] for row in report]
+    widths = [max(len(r[i]) for r in table) for i in range(len(headers))]
+    lines = ['  '.join(cell.ljust(widths[i]) for i, cell in enumerate(r)).rstrip() for r in table]
+    lines.insert(1, '  '.join('-' * w for w in widths))
+    return '\n'.join(lines)
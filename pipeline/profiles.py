@@ -0,0 +1,230 @@
+"""
+Role profiles
+Evaluation frameworks (pillars, weights, thresholds, flags, signals) loaded
+from versioned JSON files in profiles/ - the built-in AI PM framework is
+profiles/ai_pm.json - their compiled prompt text, and the --roles analyzer
+that scores one resume against several of them in a single request
+"""
+
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from . import telemetry
+from .instrumentation import RunStats
+from .packing import OUTPUT_HEADROOM
+from .router import DEFAULT_OUTPUT_TOKENS
+
+
+PROFILES_DIR = Path(__file__).resolve().parent.parent / 'profiles'
+# The built-in framework every other profile inherits from
+DEFAULT_PROFILE = 'ai_pm'
+
+# The report shape is fixed: profiles reword these criteria but keep their keys
+PILLAR_KEYS = ['pillar_1', 'pillar_2', 'pillar_3', 'pillar_4', 'pillar_5', 'pillar_6']
+THRESHOLD_LABELS = {
+    'personal_ai_projects': 'Personal AI Projects',
+    'building_in_public': 'Building in Public',
+    'resume_creativity': 'Resume Creativity',
+}
+QUESTION_LABELS = {
+    'paradigm_shift': 'Paradigm Shift?',
+    'future_proofing': 'Future-Proofing?',
+    'magic_wand': 'Magic Wand Test?',
+}
+FRAMEWORK_SECTIONS = ['title', 'context', 'pillars', 'minimum_thresholds', 'critical_questions', 'red_flags',
+                      'yellow_flags', 'must_have_signals', 'differentiation_signals', 'instructions']
+PILLAR_FIELDS = ['name', 'weight', 'description', 'what_exceptional_looks_like', 'what_NOT_sufficient',
+                 'strong_signals']
+
+
+def available_profiles(directory=PROFILES_DIR):
+    """Profile ids (file stems) in ``directory``"""
+    return sorted(path.stem for path in Path(directory).glob('*.json'))
+
+
+def _check(profile, source):
+    """Raise ValueError when a profile does not fit the report shape"""
+    pillars = profile['pillars']
+    if sorted(pillars) != PILLAR_KEYS:
+        raise ValueError(f"{source}: pillars must be exactly {', '.join(PILLAR_KEYS)}")
+    for key, pillar in pillars.items():
+        missing = [field for field in PILLAR_FIELDS if field not in pillar]
+        if missing:
+            raise ValueError(f"{source}: {key} is missing {', '.join(missing)}")
+    if sorted(profile['minimum_thresholds']) != sorted(THRESHOLD_LABELS):
+        raise ValueError(f"{source}: minimum_thresholds must be exactly {', '.join(THRESHOLD_LABELS)}")
+    if sorted(profile['critical_questions']) != sorted(QUESTION_LABELS):
+        raise ValueError(f"{source}: critical_questions must be exactly {', '.join(QUESTION_LABELS)}")
+    if profile.get('non_negotiable_pillar') not in PILLAR_KEYS + [None]:
+        raise ValueError(f"{source}: non_negotiable_pillar must be a pillar key or null")
+
+
+def profile_hash(profile):
+    """Content hash of a profile's data (key order and the hash itself excluded)"""
+    data = {key: value for key, value in profile.items() if key != 'source_hash'}
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _read(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except ValueError as e:
+        raise ValueError(f"{path}: invalid JSON ({e})") from e
+
+
+def load_framework(name=DEFAULT_PROFILE, directory=PROFILES_DIR):
+    """The built-in framework (profiles/ai_pm.json); every section is required"""
+    path = Path(directory) / f"{name}.json"
+    data = _read(path)
+    missing = [section for section in FRAMEWORK_SECTIONS if section not in data]
+    if missing:
+        raise ValueError(f"{path}: missing {', '.join(missing)}")
+    profile = {'id': name, 'version': None, 'non_negotiable_pillar': None, **data}
+    _check(profile, path)
+    profile['source_hash'] = profile_hash(profile)
+    return profile
+
+
+def load_profile(name, base, directory=PROFILES_DIR):
+    """
+    A role profile by id (profiles/<id>.json) or path. Sections the file
+    leaves out are inherited from ``base`` (the built-in framework, see
+    ResumeAnalyzer.default_profile); a pillar given in the file replaces the
+    base pillar as a whole. The version is the file's own, never inherited.
+    """
+    if name == base['id']:
+        return base
+    path = Path(name)
+    if path.suffix != '.json':
+        path = Path(directory) / f"{name}.json"
+    if not path.exists():
+        known = ', '.join(sorted(set(available_profiles(directory)) | {base['id']}))
+        raise ValueError(f"unknown role profile '{name}' (available: {known})")
+    data = _read(path)
+
+    profile = {**base, **data, 'id': data.get('id', path.stem), 'version': data.get('version')}
+    profile['pillars'] = {**base['pillars'], **data.get('pillars', {})}
+    _check(profile, path)
+    profile['source_hash'] = profile_hash(profile)
+    return profile
+
+
+# Compiled framework text by profile source hash (see compile_framework)
+_COMPILED = {}
+
+
+def compile_framework(profile, render):
+    """
+    The static prompt text of a profile, rendered once per process.
+
+    ``render(profile)`` returns the prompt sections ({name: text}); the
+    artifact adds the profile id and version and a hash of the rendered
+    text, which analyses record in ``_metadata.framework`` so a result can
+    be traced to the exact framework (and prompt template) it was scored on.
+    """
+    key = profile.get('source_hash') or profile_hash(profile)
+    artifact = _COMPILED.get(key)
+    if artifact is None:
+        sections = render(profile)
+        digest = hashlib.sha256('\0'.join(sections[name] for name in sorted(sections)).encode()).hexdigest()
+        artifact = {'id': profile['id'], 'version': profile.get('version'), 'hash': digest[:12], **sections}
+        _COMPILED[key] = artifact
+    return artifact
+
+
+def framework_metadata(artifact):
+    """``_metadata.framework`` of a compiled framework"""
+    return {'id': artifact['id'], 'version': artifact['version'], 'hash': artifact['hash']}
+
+
+def load_profiles(names, base, directory=PROFILES_DIR):
+    """``--roles`` value ("ai_pm,platform_pm" or "all") to a list of profiles"""
+    if names.strip() == 'all':
+        names = ','.join([base['id']] + [name for name in available_profiles(directory) if name != base['id']])
+    profiles = [load_profile(name.strip(), base, directory) for name in names.split(',') if name.strip()]
+    ids = [profile['id'] for profile in profiles]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"duplicate role profile in {', '.join(ids)}")
+    return profiles
+
+
+class RoleAnalyzer:
+    """
+    Scores a resume against several role profiles in one request.
+
+    The resume is sent once, followed by each profile's framework; the reply
+    has one analysis per role id, each returned as a normal analysis with
+    the profile's pillar names and ``_metadata.role``. The request's tokens
+    and cost are shared equally between the roles.
+    """
+
+    def __init__(self, analyzer, profiles):
+        self.analyzer = analyzer
+        self.profiles = profiles
+
+    def analyze_text(self, resume_text, stats=None):
+        """One request for every profile; returns {role id: analysis}"""
+        stats = stats or RunStats()
+        analyzer = self.analyzer
+        ids = [profile['id'] for profile in self.profiles]
+        print(f"🎭 Scoring against {len(ids)} role profile(s) ({', '.join(ids)}) with "
+              f"{analyzer.api_provider.upper()} ({analyzer.model})...")
+
+        request_stats = RunStats()
+        with request_stats.stage('prompt_build'):
+            prompt = analyzer.create_roles_prompt(resume_text, self.profiles)
+        limits = analyzer.AVAILABLE_MODELS[analyzer.api_provider][analyzer.model].get('limits', {})
+        max_tokens = min(limits.get('output', DEFAULT_OUTPUT_TOKENS * len(ids)),
+                         int(len(ids) * DEFAULT_OUTPUT_TOKENS * OUTPUT_HEADROOM) + 1000)
+        start = time.perf_counter()
+        reply = analyzer._complete_json(prompt, stats=request_stats, schema=analyzer.roles_schema(ids),
+                                        max_tokens=max_tokens)
+        request_ms = round((time.perf_counter() - start) * 1000, 1)
+
+        analyses = {}
+        # Forked before any share is added, so each role carries the extract timing once
+        per_role = [stats] + [stats.fork() for _ in self.profiles[1:]]
+        for index, (profile, role_stats) in enumerate(zip(self.profiles, per_role)):
+            analysis = analyzer.expand_role_reply(reply['roles'][profile['id']], profile)
+            role_stats.add_share(request_stats, len(ids), first=index == 0)
+            analysis['_metadata'] = {
+                'provider': analyzer.api_provider,
+                'model': analyzer.model,
+                'model_display_name': analyzer.AVAILABLE_MODELS[analyzer.api_provider][analyzer.model]['name'],
+                'visual_analysis': False,
+                **({'wire': analyzer.wire} if analyzer.wire != 'full' else {}),
+                **({'speed': analyzer.speed} if analyzer.speed else {}),
+                'framework': analyzer.framework_metadata(profile),
+                **role_stats.to_metadata(),
+                'role': {
+                    'id': profile['id'],
+                    'title': profile['title'],
+                    'weights': {key: pillar['weight'] for key, pillar in profile['pillars'].items()},
+                    'roles_in_request': len(ids),
+                    'request_ms': request_ms,
+                },
+            }
+            telemetry.record_analysis(analysis['_metadata'])
+            analyses[profile['id']] = analysis
+        return analyses
+
+    def analyze(self, resume_path, resume_text=None, stats=None):
+        """Extract (unless ``resume_text`` is given) and score against every profile"""
+        stats = stats or RunStats()
+        if resume_text is None:
+            print("📄 Extracting text...")
+            with stats.stage('extract'):
+                resume_text = self.analyzer.extract_text_from_document(str(resume_path))
+        analyses = self.analyze_text(resume_text, stats)
+        print("✅ Analysis complete!")
+        return analyses
+
+
+def format_role_fit(analyses):
+    """One line ranking a resume's role analyses by total score"""
+    ranked = sorted(analyses.items(), key=lambda item: item[1].get('total_score') or 0, reverse=True)
+    return "🎭 Role fit: " + " | ".join(f"{role} {analysis.get('total_score', 0):g}/60 {analysis.get('decision')}"
+                                       for role, analysis in ranked)
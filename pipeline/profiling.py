@@ -0,0 +1,174 @@
+"""
+Run profiling
+cProfile + tracemalloc around analysis and rendering, with per-call
+sampling so it can stay enabled on production batches
+"""
+
+import cProfile
+import functools
+import io
+import pstats
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+DEFAULT_TOP_N = 25
+TRACE_FRAMES = 5
+
+
+def _format_bytes(size):
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class RunProfiler:
+    """
+    Collects cProfile stats per section ('analyze', 'render') across a run.
+
+    Each call is profiled with probability ``sample_rate``; unsampled calls
+    cost one random() draw and run with neither cProfile nor tracemalloc on.
+    Stats from all sampled calls of a section are merged, and each sampled
+    analysis records its wall time and peak traced memory so a pathological
+    resume stands out.
+
+    tracemalloc's peak and the active cProfile are process-wide, so one
+    sampled call is profiled at a time: a call sampled while another one
+    (e.g. a render on the thread pool) is being profiled runs unprofiled and
+    is counted in ``busy``.
+    """
+
+    def __init__(self, output_dir, top_n=DEFAULT_TOP_N, sample_rate=1.0, frames=TRACE_FRAMES):
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+        self.sample_rate = sample_rate
+        self.frames = frames
+        self.stats = {}      # section -> pstats.Stats
+        self.calls = {}      # section -> [(label, seconds, peak bytes)]
+        self.busy = {}       # section -> sampled calls left unprofiled because another call was being profiled
+        self.snapshot = None  # live allocations at the end of the last profiled call
+        self._lock = threading.Lock()
+        self._active = threading.Lock()
+        self._random = random.Random()
+
+    def _sampled(self):
+        return self.sample_rate >= 1 or self._random.random() < self.sample_rate
+
+    @contextmanager
+    def section(self, name, label=''):
+        """Profile the enclosed block (current thread only) into ``name``"""
+        if not self._sampled():
+            yield
+            return
+        if not self._active.acquire(blocking=False):
+            with self._lock:
+                self.busy[name] = self.busy.get(name, 0) + 1
+            yield
+            return
+        try:
+            started_tracing = not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start(self.frames)
+            tracemalloc.reset_peak()
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError:
+                # Another profiler (a debugger, sys.monitoring tool) owns the interpreter
+                profile = None
+            start = time.perf_counter()
+            try:
+                yield
+            finally:
+                if profile:
+                    profile.disable()
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                snapshot = tracemalloc.take_snapshot() if name != 'render' else None
+                if started_tracing:
+                    tracemalloc.stop()
+                with self._lock:
+                    if profile:
+                        if name in self.stats:
+                            self.stats[name].add(profile)
+                        else:
+                            self.stats[name] = pstats.Stats(profile)
+                    self.calls.setdefault(name, []).append((label, elapsed, peak))
+                    if snapshot:
+                        self.snapshot = snapshot
+        finally:
+            self._active.release()
+
+    def wrap(self, name, func):
+        """Return ``func`` wrapped so every (sampled) call is profiled into ``name``"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.section(name, getattr(func, '__name__', '')):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _hotspots(self, stats, sort_key):
+        buffer = io.StringIO()
+        stats.stream = buffer
+        stats.sort_stats(sort_key).print_stats(self.top_n)
+        # Drop pstats' header noise up to the column titles
+        text = buffer.getvalue()
+        start = text.find('   ncalls')
+        return text[start:] if start >= 0 else text
+
+    def write_reports(self):
+        """Write <output>/profile_<timestamp>_<section>.prof files plus one text summary; returns the paths"""
+        if not self.calls:
+            return []
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        base = f"profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        paths = []
+        lines = [f"Profile {base}  (sample rate {self.sample_rate:g}, top {self.top_n})", '']
+
+        for name, calls in self.calls.items():
+            stats = self.stats.get(name)
+            prof_path = self.output_dir / f"{base}_{name}.prof"
+            if stats:
+                stats.dump_stats(str(prof_path))
+                paths.append(prof_path)
+
+            total = sum(seconds for _, seconds, _ in calls)
+            lines += [f"=== {name}: {len(calls)} profiled call(s), {total:.2f}s total"
+                      + (f"  ->  {prof_path.name}" if stats else '  (cProfile unavailable: another profiler active)')]
+            if self.busy.get(name):
+                lines.append(f"{self.busy[name]} sampled call(s) not profiled: another call was being profiled")
+            lines.append('')
+            if name != 'render':
+                lines.append('Slowest calls (wall time, peak traced memory):')
+                for label, seconds, peak in sorted(calls, key=lambda c: c[1], reverse=True)[:self.top_n]:
+                    lines.append(f"  {seconds:8.3f}s  {_format_bytes(peak):>12}  {label}")
+                lines.append('')
+            if stats:
+                lines += ['Top functions by cumulative time:', self._hotspots(stats, 'cumulative'),
+                          'Top functions by own time:', self._hotspots(stats, 'tottime')]
+
+        peak = max(p for calls in self.calls.values() for _, _, p in calls)
+        lines.append(f"=== Memory: peak traced {_format_bytes(peak)}")
+        if self.snapshot:
+            lines.append(f"Largest allocation sites live at the end of the last profiled call (top {self.top_n}):")
+            # Leave out the profiler's own bookkeeping and module imports
+            snapshot = self.snapshot.filter_traces([
+                tracemalloc.Filter(False, pattern)
+                for pattern in (tracemalloc.__file__, cProfile.__file__, pstats.__file__, __file__,
+                                '<frozen importlib._bootstrap>', '<frozen importlib._bootstrap_external>')
+            ])
+            for stat in snapshot.statistics('lineno')[:self.top_n]:
+                frame = stat.traceback[0]
+                lines.append(f"  {_format_bytes(stat.size):>12}  {stat.count:>7} blocks  {frame.filename}:{frame.lineno}")
+
+        summary_path = self.output_dir / f"{base}.txt"
+        summary_path.write_text('\n'.join(lines) + '\n')
+        paths.append(summary_path)
+        return paths
@@ -0,0 +1,194 @@
+"""
+PDF rasterization
+Renders the pages a vision request needs straight to memory - with pypdfium2
+when installed, else poppler through pdf2image (JPEG, page runs split over
+parallel pdftoppm processes) - and packs several pages into one image grid
+for the design evaluation, or keeps one legible image per page for reading
+"""
+
+import math
+import shutil
+
+import PyPDF2
+
+try:
+    import pypdfium2
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+try:
+    from pdf2image import convert_from_path
+    PDF2IMAGE_AVAILABLE = True
+except ImportError:
+    PDF2IMAGE_AVAILABLE = False
+
+
+VISION_DPI = 200
+# Pages sent for the design evaluation unless --render-pages says otherwise (resumes run one or two pages)
+DEFAULT_PAGES = '1-2'
+# pdftoppm processes per run of consecutive pages
+MAX_THREADS = 4
+# Long edge of the image sent: every vendor downscales past this, so larger grids only cost upload time and tokens
+MAX_EDGE = 2048
+# White space between grid cells, in rendered pixels
+GRID_GAP = 24
+# US Letter in PDF points, for pages whose size cannot be read
+LETTER_POINTS = (612, 792)
+
+
+def parse_pages(spec):
+    """--render-pages value ('1', '1-2', '1,3', 'all') to sorted page numbers, None for all; ValueError otherwise"""
+    spec = str(spec).strip().lower()
+    if spec == 'all':
+        return None
+    pages = set()
+    for part in spec.split(','):
+        first, dash, last = part.strip().partition('-')
+        try:
+            first = int(first)
+            last = int(last) if dash else first
+        except ValueError:
+            raise ValueError(f"invalid page selection '{spec}' (use e.g. 1, 1-2, 1,3 or all)") from None
+        if first < 1 or last < first:
+            raise ValueError(f"invalid page range '{part.strip()}' in '{spec}'")
+        pages.update(range(first, last + 1))
+    return sorted(pages)
+
+
+def select_pages(pages, page_count):
+    """The requested pages the document has (all of them for None); the first page when none of them exist"""
+    if pages is None:
+        return list(range(1, page_count + 1))
+    return [number for number in pages if number <= page_count] or [1]
+
+
+def available_engines():
+    """Renderers installed here, fastest first"""
+    engines = []
+    if PDFIUM_AVAILABLE:
+        engines.append('pdfium')
+    if PDF2IMAGE_AVAILABLE and shutil.which('pdftoppm'):
+        engines.append('poppler')
+    return engines
+
+
+def _runs(pages):
+    """[1, 2, 3, 5] -> [(1, 3), (5, 5)]"""
+    runs = []
+    for number in pages:
+        if runs and number == runs[-1][1] + 1:
+            runs[-1][1] = number
+        else:
+            runs.append([number, number])
+    return [tuple(run) for run in runs]
+
+
+def _render_pdfium(path, pages, dpi):
+    # PDFium is not thread-safe; in-process rendering is already a few tens of ms per page
+    document = pypdfium2.PdfDocument(str(path))
+    try:
+        return [document[number - 1].render(scale=dpi / 72).to_pil().convert('RGB') for number in pages]
+    finally:
+        document.close()
+
+
+def _render_poppler(path, pages, dpi, threads):
+    # No output_folder: pdftoppm writes JPEG to its stdout and pdf2image decodes it in memory
+    images = []
+    for first, last in _runs(pages):
+        images += convert_from_path(str(path), dpi=dpi, first_page=first, last_page=last, fmt='jpeg',
+                                    thread_count=min(threads, last - first + 1))
+    return images
+
+
+def render_pages(path, pages=None, dpi=VISION_DPI, engine=None, threads=MAX_THREADS):
+    """
+    PIL images of a PDF's ``pages`` (1-based numbers, None for all; missing
+    pages are dropped, see select_pages) rendered at ``dpi``. ``engine`` is
+    'pdfium' or 'poppler', by default the first of available_engines();
+    RuntimeError when none is installed.
+    """
+    engines = available_engines()
+    engine = engine or (engines[0] if engines else None)
+    if engine not in engines:
+        raise RuntimeError(f"PDF renderer '{engine}' not available (install pypdfium2, or pdf2image and poppler)"
+                           if engine else "No PDF renderer available (install pypdfium2, or pdf2image and poppler)")
+    pages = select_pages(pages, len(PyPDF2.PdfReader(str(path)).pages))
+    if engine == 'pdfium':
+        return _render_pdfium(path, pages, dpi)
+    return _render_poppler(path, pages, dpi, threads)
+
+
+def grid_shape(count):
+    """(columns, rows) of the most square grid holding ``count`` pages: 2 side by side, 3-4 as 2x2, ..."""
+    columns = math.ceil(math.sqrt(count))
+    return columns, math.ceil(count / columns)
+
+
+def grid_size(sizes, gap=GRID_GAP, max_edge=MAX_EDGE):
+    """Pixel size of the image pack_grid() makes from pages of ``sizes`` [(width, height)]"""
+    columns, rows = grid_shape(len(sizes))
+    width = columns * max(w for w, _ in sizes) + (columns - 1) * gap
+    height = rows * max(h for _, h in sizes) + (rows - 1) * gap
+    scale = min(1.0, max_edge / max(width, height))
+    return round(width * scale), round(height * scale)
+
+
+def pack_grid(images, gap=GRID_GAP, max_edge=MAX_EDGE):
+    """One image with the pages in reading order on a grid (grid_shape), scaled to about ``max_edge``"""
+    from PIL import Image
+    columns, rows = grid_shape(len(images))
+    cell_width = max(image.width for image in images)
+    cell_height = max(image.height for image in images)
+    scale = max_edge / max(columns * cell_width + (columns - 1) * gap, rows * cell_height + (rows - 1) * gap)
+    # render_grid() already renders at about this size; resizing a full-resolution sheet costs more than rendering
+    if scale < 0.98:
+        images = [image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+                  for image in images]
+        cell_width, cell_height, gap = round(cell_width * scale), round(cell_height * scale), round(gap * scale)
+    if len(images) == 1:
+        return images[0]
+    sheet = Image.new('RGB', (columns * cell_width + (columns - 1) * gap, rows * cell_height + (rows - 1) * gap),
+                      'white')
+    for index, image in enumerate(images):
+        row, column = divmod(index, columns)
+        sheet.paste(image, (column * (cell_width + gap), row * (cell_height + gap)))
+    return sheet
+
+
+def render_grid(path, pages=None, dpi=VISION_DPI, engine=None, threads=MAX_THREADS):
+    """
+    pack_grid() of a PDF's ``pages``, rendered straight at the resolution
+    the grid keeps: two pages side by side come out of the renderer at
+    about 120 dpi instead of being rendered at ``dpi`` and scaled down.
+    """
+    sizes = page_sizes(path, pages, dpi)
+    scale = grid_size(sizes)[0] / grid_size(sizes, max_edge=float('inf'))[0]
+    return pack_grid(render_pages(path, pages, max(1, int(dpi * scale)), engine, threads))
+
+
+def readable_dpi(path, pages=None, dpi=VISION_DPI, max_edge=MAX_EDGE):
+    """``dpi``, lowered only as far as needed to keep every selected page's long edge within ``max_edge``"""
+    longest = max(max(size) for size in page_sizes(path, pages, dpi))
+    return max(1, int(dpi * min(1.0, max_edge / longest)))
+
+
+def render_readable(path, pages=None, dpi=VISION_DPI, engine=None, threads=MAX_THREADS, max_edge=MAX_EDGE):
+    """
+    One image per page, for reading a page's text from the image (scanned
+    pages sent vision-first): a page keeps about ``dpi`` where a two-page
+    grid would come out near 120 dpi, too small for a scan's body text.
+    """
+    return render_pages(path, pages, readable_dpi(path, pages, dpi, max_edge), engine, threads)
+
+
+def page_sizes(path, pages=None, dpi=VISION_DPI):
+    """Rendered pixel sizes of a PDF's selected ``pages`` without rendering them (US Letter when unreadable)"""
+    try:
+        reader = PyPDF2.PdfReader(str(path))
+        boxes = [reader.pages[number - 1].mediabox for number in select_pages(pages, len(reader.pages))]
+        points = [(float(box.width), float(box.height)) for box in boxes]
+    except Exception:
+        points = [LETTER_POINTS]
+    return [tuple(round(size / 72 * dpi) for size in page) for page in points]
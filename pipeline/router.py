@@ -0,0 +1,280 @@
+"""
+Model router
+Picks a provider/model per resume from AVAILABLE_MODELS using token prices,
+measured latency, a per-resume budget and a latency SLO; triages on a cheap
+model, escalates to a frontier model only when needed and fails over when a
+provider is down or rate limited
+"""
+
+import time
+
+from . import telemetry
+from .instrumentation import RunStats
+
+
+# Typical end-to-end seconds per analysis, used until the results store has measurements
+DEFAULT_LATENCY_S = {
+    'gpt-5': 60, 'gpt-5-mini': 25, 'gpt-4o': 15,
+    'claude-sonnet-4-5-20250929': 35, 'claude-haiku-4-5': 12, 'claude-opus-4-1': 60,
+    'gemini-2.5-pro': 40, 'gemini-2.5-flash': 12,
+}
+DEFAULT_OUTPUT_TOKENS = 2500
+FALLBACK_LATENCY_S = 45
+
+# Capability tier per model for choosing the final model (3 frontier, 2 mid, 1 light); unlisted models rank 1
+CAPABILITY_RANK = {
+    'gpt-5': 3, 'claude-opus-4-1': 3, 'claude-sonnet-4-5-20250929': 3, 'gemini-2.5-pro': 3,
+    'gpt-5-mini': 2, 'gpt-4o': 2,
+    'claude-haiku-4-5': 1, 'gemini-2.5-flash': 1,
+}
+
+# Triage verdicts at least this far below the No Screen line (24/60) are accepted as-is
+CLEAR_NO_SCREEN_MARGIN = 4
+NO_SCREEN_LINE = 24
+# ...or whose non-negotiable pillar scored at most this
+CLEAR_NON_NEGOTIABLE_MAX = 4
+
+PROVIDER_COOLDOWN_S = 60
+
+_UNAVAILABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+_UNAVAILABLE_WORDS = ('rate limit', 'rate_limit', 'overloaded', 'unavailable', 'resource_exhausted', 'quota',
+                      'timed out', 'timeout', 'connection')
+
+
+def approx_tokens(text):
+    """Offline token estimate (~4 characters per token)"""
+    return max(1, len(text) // 4)
+
+
+def estimate_call(info, model, prompt_tokens, perf=None):
+    """(estimated USD, estimated p90 seconds) for one analysis, from an AVAILABLE_MODELS entry and measurements"""
+    pricing = info.get('pricing') or {}
+    output_tokens = perf['avg_output_tokens'] if perf and perf.get('avg_output_tokens') else DEFAULT_OUTPUT_TOKENS
+    cost = (prompt_tokens * pricing.get('input', 0) + output_tokens * pricing.get('output', 0)) / 1_000_000
+    latency = perf['p90_ms'] / 1000 if perf else DEFAULT_LATENCY_S.get(model, FALLBACK_LATENCY_S)
+    return cost, latency
+
+
+def is_unavailable(error):
+    """True when an exception (or its cause chain) looks like an outage or rate limit rather than a bad response"""
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        status = getattr(error, 'status_code', None) or getattr(error, 'code', None)
+        if isinstance(status, int) and status in _UNAVAILABLE_STATUS:
+            return True
+        message = str(error).lower()
+        if any(word in message for word in _UNAVAILABLE_WORDS):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def is_clear_no_screen(analysis, pillar_key):
+    """Triage result confidently below the bar (no need for a frontier model); ``pillar_key`` is the non-negotiable pillar"""
+    if analysis.get('decision') != 'No Screen':
+        return False
+    try:
+        total = float(analysis.get('total_score'))
+    except (TypeError, ValueError):
+        total = None
+    try:
+        critical = float((analysis.get('pillars', {}).get(pillar_key) or {}).get('score'))
+    except (TypeError, ValueError):
+        critical = None
+    return ((total is not None and total <= NO_SCREEN_LINE - CLEAR_NO_SCREEN_MARGIN)
+            or (critical is not None and critical <= CLEAR_NON_NEGOTIABLE_MAX))
+
+
+class ModelRouter:
+    """
+    Routes each resume across the models of the providers that have API keys.
+
+    ``make_analyzer(provider, model)`` returns a ResumeAnalyzer; ``measured``
+    is ResultsStore.model_performance() output and is refined with every
+    call this router makes. Without a budget the final model is a provider's
+    ``default_models`` entry; with one, the most capable model that fits.
+    """
+
+    def __init__(self, available_models, providers, make_analyzer, budget=None, latency_slo=None, measured=None,
+                 cooldown=PROVIDER_COOLDOWN_S, default_models=None):
+        self.available_models = available_models
+        self.default_models = default_models or {}
+        self.providers = list(providers)
+        self.make_analyzer = make_analyzer
+        self.budget = budget
+        self.latency_slo = latency_slo
+        self.cooldown = cooldown
+        self.measured = dict(measured or {})
+        self.down_until = {}
+        self._analyzers = {}
+
+    def _analyzer(self, provider, model):
+        key = (provider, model)
+        if key not in self._analyzers:
+            self._analyzers[key] = self.make_analyzer(provider, model)
+        return self._analyzers[key]
+
+    def estimate(self, provider, model, prompt_tokens):
+        """(estimated USD, estimated p90 seconds) for one analysis on a model"""
+        return estimate_call(self.available_models[provider][model], model, prompt_tokens,
+                             self.measured.get((provider, model)))
+
+    def candidates(self, prompt_tokens):
+        """Every usable model with its estimates, skipping providers in cooldown"""
+        now = time.monotonic()
+        options = []
+        for provider in self.providers:
+            if self.down_until.get(provider, 0) > now:
+                continue
+            for model in self.available_models.get(provider, {}):
+                cost, latency = self.estimate(provider, model, prompt_tokens)
+                options.append({'provider': provider, 'model': model, 'est_cost_usd': round(cost, 5),
+                                'est_latency_s': round(latency, 1), 'capability': CAPABILITY_RANK.get(model, 1)})
+        return options
+
+    def plan(self, prompt_tokens):
+        """
+        Returns (triage options, final options), each ranked best-first.
+
+        Final models are the providers' default models when there is no
+        budget, else the most capable ones (cheapest first within a tier)
+        that fit the budget and SLO; triage is the cheapest model, used only
+        when triage plus a final model still fits both limits.
+        """
+        options = self.candidates(prompt_tokens)
+        fits = [o for o in options
+                if (self.budget is None or o['est_cost_usd'] <= self.budget)
+                and (self.latency_slo is None or o['est_latency_s'] <= self.latency_slo)]
+        if not fits:
+            # Nothing meets the limits: fall back to the cheapest models so the resume is still analyzed
+            fits = sorted(options, key=lambda o: (o['est_cost_usd'], o['est_latency_s']))[:3]
+        final = fits
+        if self.budget is None:
+            final = [o for o in fits if o['model'] == self.default_models.get(o['provider'])] or fits
+        final = sorted(final, key=lambda o: (-o['capability'], o['est_cost_usd'], o['est_latency_s']))
+        triage = sorted(fits, key=lambda o: (o['est_cost_usd'], o['est_latency_s']))
+        if not final:
+            return [], []
+
+        best = final[0]
+        triage = [o for o in triage
+                  if o['model'] != best['model']
+                  and o['est_cost_usd'] < best['est_cost_usd'] / 2
+                  and (self.budget is None or o['est_cost_usd'] + best['est_cost_usd'] <= self.budget)
+                  and (self.latency_slo is None or o['est_latency_s'] + best['est_latency_s'] <= self.latency_slo)]
+        return triage, final
+
+    def observe(self, provider, model, elapsed_ms, output_tokens):
+        """Fold one finished call into the in-memory latency/output measurements"""
+        key = (provider, model)
+        perf = self.measured.get(key)
+        if not perf:
+            self.measured[key] = {'samples': 1, 'p50_ms': elapsed_ms, 'p90_ms': elapsed_ms,
+                                  'avg_output_tokens': output_tokens}
+            return
+        # Smoothed estimates; the p90 jumps to any slower call so a degrading vendor drops out of the SLO quickly
+        n = perf['samples'] + 1
+        perf['samples'] = n
+        perf['p50_ms'] = 0.8 * perf['p50_ms'] + 0.2 * elapsed_ms
+        perf['p90_ms'] = max(elapsed_ms, 0.9 * perf['p90_ms'] + 0.1 * elapsed_ms)
+        perf['avg_output_tokens'] += (output_tokens - perf['avg_output_tokens']) / n
+
+    def _attempt(self, options, resume_text, stats, steps, role):
+        """Try options in order; returns the first analysis or None when all fail"""
+        for option in options:
+            provider, model = option['provider'], option['model']
+            if self.down_until.get(provider, 0) > time.monotonic():
+                continue
+            step = {'role': role, 'provider': provider, 'model': model,
+                    'est_cost_usd': option['est_cost_usd'], 'est_latency_s': option['est_latency_s']}
+            steps.append(step)
+            cost_before, output_before = stats.cost_usd, stats.usage['output_tokens']
+            start = time.perf_counter()
+            try:
+                # Recorded once below with the stats of every call, so failovers are not counted twice
+                analysis = self._analyzer(provider, model).analyze_text(resume_text, stats=stats, record=False)
+            except Exception as e:
+                stats.retries += 1
+                step['outcome'] = f"error: {e}"
+                if is_unavailable(e):
+                    self.down_until[provider] = time.monotonic() + self.cooldown
+                    step['outcome'] = f"unavailable, {provider} paused {self.cooldown}s: {e}"
+                print(f"⚠️  {provider.upper()} {model} failed, failing over: {e}")
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            step['outcome'] = 'ok'
+            step['cost_usd'] = round(stats.cost_usd - cost_before, 6)
+            step['latency_s'] = round(elapsed_ms / 1000, 2)
+            self.observe(provider, model, elapsed_ms, stats.usage['output_tokens'] - output_before)
+            return analysis
+        return None
+
+    def analyze(self, resume_path, resume_text=None, stats=None):
+        """Extract once, triage on a cheap model, escalate when the verdict isn't a clear No Screen"""
+        stats = stats or RunStats()
+        extractor = self._analyzer(self.providers[0], None)
+        if resume_text is None:
+            print("📄 Extracting text...")
+            with stats.stage('extract'):
+                resume_text = extractor.extract_text_from_document(str(resume_path))
+
+        prompt_tokens = approx_tokens(extractor.create_analysis_prompt(resume_text))
+        triage, final = self.plan(prompt_tokens)
+        if not final:
+            raise Exception("No available model for routing (all providers paused)")
+
+        steps = []
+        reason = 'no cheaper triage model fits the budget/SLO'
+        analysis = None
+        if triage:
+            analysis = self._attempt(triage[:2], resume_text, stats, steps, 'triage')
+            if analysis is not None and is_clear_no_screen(analysis, extractor.NON_NEGOTIABLE_PILLAR):
+                reason = 'triage verdict is a clear No Screen'
+            elif analysis is not None:
+                reason = (f"triage verdict {analysis.get('decision')} ({analysis.get('total_score')}/60) "
+                          f"needs a frontier model")
+                analysis = None
+            else:
+                reason = 'triage models unavailable'
+
+        escalated = analysis is None and bool(triage)
+        if analysis is None:
+            analysis = self._attempt(final, resume_text, stats, steps, 'final')
+        if analysis is None:
+            raise Exception("All routed models failed: " + '; '.join(s['outcome'] for s in steps))
+
+        # Usage and timings cover every call made for this resume (triage + final + failovers)
+        analysis['_metadata'].update(stats.to_metadata())
+        telemetry.record_analysis(analysis['_metadata'])
+        analysis['_metadata']['routing'] = {
+            'budget_usd': self.budget,
+            'latency_slo_s': self.latency_slo,
+            'prompt_tokens_est': prompt_tokens,
+            'escalated': escalated,
+            'reason': reason,
+            'failovers': sum(1 for s in steps if s['outcome'] != 'ok'),
+            'steps': steps,
+        }
+        final_step = steps[-1]
+        print(f"🧭 Routed to {final_step['provider']}/{final_step['model']} ({reason})")
+        return analysis
+
+
+def summarize_routing(analyses):
+    """Batch totals for routed analyses: escalations, failovers and spend"""
+    routed = [a['_metadata'] for a in analyses if (a.get('_metadata') or {}).get('routing')]
+    if not routed:
+        return None
+    models = {}
+    for meta in routed:
+        key = f"{meta['provider']}/{meta['model']}"
+        models[key] = models.get(key, 0) + 1
+    return {
+        'routed': len(routed),
+        'escalated': sum(1 for m in routed if m['routing']['escalated']),
+        'settled_by_triage': sum(1 for m in routed if m['routing']['steps'][-1]['role'] == 'triage'),
+        'failovers': sum(m['routing']['failovers'] for m in routed),
+        'final_models': models,
+        'cost_usd': round(sum(m.get('cost_usd', 0) for m in routed), 4),
+    }
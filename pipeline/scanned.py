@@ -0,0 +1,246 @@
+"""
+Scanned / image-only PDF detection
+A fast check run before any API call (text yield per page, then image
+coverage from the page content streams) so resumes without a usable text
+layer get a vision-first call on only the pages that need it, or local OCR
+in a process pool, or are skipped and flagged instead of being scored on
+an empty prompt
+"""
+
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+from PyPDF2.generic import ContentStream
+
+from .rasterize import available_engines, render_pages
+
+try:
+    import pytesseract
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+
+# A page with fewer extracted characters than this has no usable text layer (a sparse real page has several hundred)
+MIN_PAGE_CHARS = 200
+# A low-text page whose images cover at least this share of its area is a scan or an exported image
+SCAN_COVERAGE = 0.5
+# Vision-first requests show at most this many pages (the first ones without a text layer)
+MAX_VISION_PAGES = 2
+OCR_DPI = 300
+
+ROUTES = ['auto', 'vision', 'ocr', 'skip']
+
+
+def _multiply(m1, m2):
+    """PDF matrix product m1 x m2 of [a b c d e f] matrices"""
+    a1, b1, c1, d1, e1, f1 = m1
+    a2, b2, c2, d2, e2, f2 = m2
+    return [a1 * a2 + b1 * c2, a1 * b2 + b1 * d2, c1 * a2 + d1 * c2, c1 * b2 + d1 * d2,
+            e1 * a2 + f1 * c2 + e2, e1 * b2 + f1 * d2 + f2]
+
+
+def image_coverage(page):
+    """
+    Share of a page's area covered by images: every image XObject or inline
+    image is drawn into the unit square mapped by the current transform, so
+    its area on the page is that matrix's determinant. Images inside form
+    XObjects are not counted.
+    """
+    resources = page.get('/Resources')
+    xobjects = resources.get_object().get('/XObject') if resources else None
+    images = set()
+    if xobjects:
+        images = {name for name, obj in xobjects.get_object().items() if obj.get_object().get('/Subtype') == '/Image'}
+    content = page.get_contents()
+    if content is None:
+        return 0.0
+    if not isinstance(content, ContentStream):
+        content = ContentStream(content, page.pdf)
+
+    matrix, stack, covered = [1, 0, 0, 1, 0, 0], [], 0.0
+    for operands, operator in content.operations:
+        if operator == b'q':
+            stack.append(matrix)
+        elif operator == b'Q':
+            matrix = stack.pop() if stack else matrix
+        elif operator == b'cm':
+            matrix = _multiply([float(value) for value in operands], matrix)
+        elif (operator == b'Do' and operands and operands[0] in images) or operator == b'INLINE IMAGE':
+            covered += abs(matrix[0] * matrix[3] - matrix[1] * matrix[2])
+    box = page.mediabox
+    area = float(box.width) * float(box.height)
+    return min(1.0, covered / area) if area else 0.0
+
+
+def inspect_pdf(path, text=None):
+    """
+    Text-layer check of one PDF, page by page: a page with little text whose
+    images cover most of it is scanned even when the other pages carry
+    plenty of text. ``text`` is the already-extracted text, if any; only a
+    one-page file with enough of it is accepted without re-reading (a total
+    cannot tell a full page 1 from a scanned page 2).
+
+    Returns {'status': 'text' | 'scanned' | 'no_text', 'pages', 'text'} plus,
+    for the last two, per-page character counts and image coverage and
+    ``scan_pages``, the pages to OCR or render ('partial' when other pages
+    have text). 'no_text' files carry neither text nor images on any page
+    (text converted to outlines, vector-only exports).
+    """
+    reader = PyPDF2.PdfReader(str(path))
+    pages = len(reader.pages)
+    if pages == 1 and text is not None and len(text.strip()) >= MIN_PAGE_CHARS:
+        return {'status': 'text', 'pages': pages, 'text': text}
+
+    page_texts = [page.extract_text() or '' for page in reader.pages]
+    text = ''.join(page_text + '\n' for page_text in page_texts).strip()
+    chars = [len(page_text.strip()) for page_text in page_texts]
+    low_text = [number for number, count in enumerate(chars, 1) if count < MIN_PAGE_CHARS]
+    if not low_text:
+        return {'status': 'text', 'pages': pages, 'text': text}
+
+    coverage = {number: round(image_coverage(reader.pages[number - 1]), 2) for number in low_text}
+    scanned = [number for number in low_text if coverage[number] >= SCAN_COVERAGE]
+    if scanned:
+        status, scan_pages = 'scanned', scanned
+    elif sum(chars) < MIN_PAGE_CHARS * pages:
+        status, scan_pages = 'no_text', low_text
+    else:
+        # Short text-only pages (a last page with a few lines) in a document that has text
+        return {'status': 'text', 'pages': pages, 'text': text}
+    return {
+        'status': status,
+        'pages': pages,
+        'text': text,
+        'chars_per_page': chars,
+        'image_coverage': [coverage.get(number, 0.0) for number in range(1, pages + 1)],
+        'scan_pages': scan_pages,
+        'partial': len(scan_pages) < pages,
+        'page_texts': page_texts,
+    }
+
+
+def rasterize_available():
+    """A PDF renderer (pypdfium2, or pdf2image and poppler) is installed"""
+    return bool(available_engines())
+
+
+def ocr_available():
+    """pytesseract, the tesseract binary and a PDF renderer are installed"""
+    return OCR_AVAILABLE and shutil.which('tesseract') is not None and rasterize_available()
+
+
+def ocr_pages(path, pages, dpi=OCR_DPI):
+    """{page number: text} of a PDF's ``pages`` through tesseract (runs in a worker process)"""
+    # One renderer thread per worker: the pool already uses every CPU
+    images = render_pages(path, pages, dpi, threads=1)
+    return {number: pytesseract.image_to_string(image) for number, image in zip(pages, images)}
+
+
+def _text_pages_usable(scan):
+    """A partial scan whose text pages carry enough text to score on their own"""
+    return scan['partial'] and sum(count for number, count in enumerate(scan['chars_per_page'], 1)
+                                   if number not in scan['scan_pages']) >= MIN_PAGE_CHARS
+
+
+def triage_scanned(paths, texts, mode='auto', vision_allowed=True, workers=None, extract_seconds=None):
+    """
+    Inspect the PDFs in ``paths`` before any API call. ``texts`` (text by
+    path, as extracted by the dedup pass) is filled in for every file read
+    here, and replaced by the OCR text of OCR'd files; ``extract_seconds``
+    gets the time spent reading files that had no text yet.
+
+    Returns {path: scan} for the PDFs with pages lacking a usable text layer
+    (see inspect_pdf), each with its ``route``: 'ocr' (text of those pages
+    recovered locally), 'vision' (analyze ``vision_pages`` as images; only
+    when ``vision_allowed``), 'text' (a partial scan analyzed on its text
+    pages alone) or 'skip'.
+    ``mode`` 'auto' prefers OCR, then vision, then skipping. A partial scan
+    with usable text pages is never skipped: it falls back to 'text'.
+    """
+    scans = {}
+    for path in paths:
+        if path.suffix.lower() != '.pdf':
+            continue
+        start = time.perf_counter()
+        try:
+            scan = inspect_pdf(path, texts.get(path))
+        except Exception:
+            # Unreadable: left to the analysis, which reports the error
+            continue
+        if texts.get(path) is None:
+            texts[path] = scan['text']
+            if extract_seconds is not None:
+                extract_seconds[path] = time.perf_counter() - start
+        if scan['status'] != 'text':
+            scans[path] = scan
+    if not scans:
+        return {}
+
+    can_vision = vision_allowed and rasterize_available()
+    fallback = 'vision' if can_vision else 'skip'
+    if mode == 'auto':
+        route = 'ocr' if ocr_available() else fallback
+    else:
+        route = mode
+    if route == 'vision' and not can_vision:
+        route = 'skip'
+
+    for path, scan in scans.items():
+        scan['route'] = 'text' if route == 'skip' and _text_pages_usable(scan) else route
+    if route == 'ocr':
+        print(f"🔠 OCR: {len(scans)} PDF(s) without a text layer...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {path: pool.submit(ocr_pages, path, scan['scan_pages']) for path, scan in scans.items()}
+            for path, future in futures.items():
+                scan = scans[path]
+                try:
+                    recovered = future.result()
+                except Exception as e:
+                    recovered = {}
+                    scan['ocr_error'] = str(e)
+                page_texts = [recovered.get(number, page_text)
+                              for number, page_text in enumerate(scan['page_texts'], 1)]
+                text = ''.join(page_text + '\n' for page_text in page_texts).strip()
+                scan['ocr_chars'] = len(text) - len(scan['text'])
+                # Judged on the recovered pages only: the text pages of a partial scan would pass any total
+                if sum(len(recovered.get(number, '').strip()) for number in scan['scan_pages']) \
+                        >= MIN_PAGE_CHARS * len(scan['scan_pages']):
+                    texts[path] = text
+                else:
+                    scan['route'] = 'text' if fallback == 'skip' and _text_pages_usable(scan) else fallback
+
+    for path, scan in scans.items():
+        del scan['page_texts']
+        del scan['text']
+        if scan['route'] == 'vision':
+            scan['vision_pages'] = (scan['scan_pages'] or [1])[:MAX_VISION_PAGES]
+        kind = 'scanned/image-only' if scan['status'] == 'scanned' else 'no text layer'
+        if scan['partial']:
+            kind += f" on page(s) {', '.join(str(number) for number in scan['scan_pages'])}"
+        action = {'ocr': 'text recovered with OCR', 'vision': f"vision-first on page(s) "
+                  f"{', '.join(str(number) for number in scan.get('vision_pages', []))}",
+                  'text': f"analyzed on the text of the other {scan['pages'] - len(scan['scan_pages'])} page(s)",
+                  'skip': 'skipped, no API call'}[scan['route']]
+        print(f"🖨️  {path.name}: {kind} ({sum(scan['chars_per_page'])} chars over {scan['pages']} page(s)) - {action}")
+    return scans
+
+
+def summarize_scans(scans, resumes):
+    """Batch view of PDFs without a text layer: how they were detected and routed, and calls avoided"""
+    if not scans:
+        return None
+    routes = {}
+    for scan in scans.values():
+        routes[scan['route']] = routes.get(scan['route'], 0) + 1
+    return {
+        'resumes': resumes,
+        'detected': len(scans),
+        'scanned': sum(1 for scan in scans.values() if scan['status'] == 'scanned'),
+        'no_text': sum(1 for scan in scans.values() if scan['status'] == 'no_text'),
+        'partial': sum(1 for scan in scans.values() if scan['partial']),
+        'routes': routes,
+        'skipped': [str(path) for path, scan in scans.items() if scan['route'] == 'skip'],
+    }
@@ -0,0 +1,375 @@
+"""
+Response schemas
+One JSON Schema per reply shape (full analysis, its compact wire form,
+--pack arrays, --roles, --fanout parts, --cascade prefilter), used for the prompt's output
+section, each vendor's structured-output feature and a fast local
+validator with cheap repairs
+"""
+
+import json
+import re
+
+
+LEVELS = ['Developing', 'Functional', 'Proficient', 'Advanced', 'Expert']
+DECISIONS = ['Strong Screen', 'Screen', 'Maybe', 'No Screen']
+LEVEL_CODES = dict(zip('DFPAE', LEVELS))
+DECISION_CODES = dict(zip(['SS', 'S', 'M', 'NS'], DECISIONS))
+
+# Keywords each vendor's structured-output feature accepts (others are stripped before sending)
+_GOOGLE_KEYWORDS = {'type', 'description', 'enum', 'properties', 'required', 'items', 'nullable', 'format'}
+_OPENAI_DROP = {'minimum', 'maximum'}
+
+_FENCE_RE = re.compile(r'```(?:json)?\s*(.*?)```', re.S)
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_NUMBER_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
+_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'boolean': bool,
+    'integer': int,
+    'number': (int, float),
+}
+
+
+def _string(description):
+    return {'type': 'string', 'description': description}
+
+
+def _strings(description):
+    return {'type': 'array', 'items': {'type': 'string'}, 'description': description}
+
+
+def _boolean(description=''):
+    return {'type': 'boolean', 'description': description} if description else {'type': 'boolean'}
+
+
+def _number(low, high, description=''):
+    schema = {'type': 'number', 'minimum': low, 'maximum': high}
+    if description:
+        schema['description'] = description
+    return schema
+
+
+def _object(properties, description=''):
+    schema = {'type': 'object', 'properties': properties, 'required': list(properties)}
+    if description:
+        schema['description'] = description
+    return schema
+
+
+def pillar_schema(name=None):
+    """One pillar's evaluation; ``name`` pins the display name (omitted from fan-out replies, filled in locally)"""
+    properties = {
+        'score': _number(0, 10),
+        'level': {'type': 'string', 'enum': LEVELS},
+        'evidence': _string('Specific examples from resume with quotes'),
+        'strengths': _strings('Strengths for this pillar'),
+        'gaps': _strings('Gaps for this pillar'),
+    }
+    if name:
+        properties = {'name': {'type': 'string', 'enum': [name]}, **properties}
+    return _object(properties)
+
+
+def _thresholds():
+    return _object({
+        'personal_ai_projects': _boolean(),
+        'building_in_public': _boolean(),
+        'resume_creativity': _boolean(),
+        'all_met': _boolean(),
+    })
+
+
+def _screening_checks():
+    """Thresholds, flags and the three critical questions (everything before the pillars)"""
+    return {
+        'candidate_name': _string('Name from resume'),
+        'minimum_thresholds_met': _thresholds(),
+        'red_flags_found': _strings('Red flags found, or empty array'),
+        'yellow_flags_found': _strings('Yellow flags found, or empty array'),
+        'critical_questions_analysis': _object({
+            'paradigm_shift_examples': _strings('Specific projects showing transformational vs incremental thinking'),
+            'future_proofing_examples': _strings('Projects architected for future AI capabilities'),
+            'magic_wand_examples': _strings('Projects designed for eventual full automation'),
+        }),
+    }
+
+
+def _signals():
+    return {
+        'must_have_signals': _object({
+            'signals_found': _strings('Which must-have signals were found'),
+            'signals_missing': _strings('Which must-have signals were missing'),
+            'all_present': _boolean(),
+        }),
+        'differentiation_signals': _object({
+            'signals_found': _strings('Which differentiation signals were found'),
+            'count': _number(0, 20),
+            'sufficient_for_strong_screen': _boolean(),
+        }),
+    }
+
+
+def _verdict():
+    return {
+        'decision': {'type': 'string', 'enum': DECISIONS},
+        'decision_rationale': _string('2-3 sentences explaining the decision based on framework'),
+        'top_strengths': _strings('Top 3 strengths'),
+        'top_concerns': _strings('Top 3 concerns'),
+        'recommendation': _string('Detailed 3-5 sentence recommendation'),
+        'suitable_roles': _strings('Specific role suggestions based on profile'),
+        'interview_focus_areas': _strings('Areas to probe deeper in interview'),
+    }
+
+
+def analysis_schema(pillar_names, design=False):
+    """
+    Full framework analysis; ``pillar_names`` maps pillar_1..pillar_6 to
+    their display names (None leaves the name out, filled in locally)
+    """
+    properties = {
+        **_screening_checks(),
+        'pillars': _object({key: pillar_schema(name) for key, name in pillar_names.items()}),
+        **_signals(),
+        'total_score': _number(0, 60, 'Sum of the six pillar scores'),
+        **_verdict(),
+    }
+    if design:
+        properties['design_evaluation'] = _object({
+            'score': _number(0, 10),
+            'comments': _string('Visual design assessment'),
+        })
+    return _object(properties)
+
+
+def compact_analysis_schema(pillar_keys, design=False):
+    """--wire compact reply: short keys, level/decision codes, no derivable fields (see pipeline/compact.py)"""
+    pillar = _object({
+        's': _number(0, 10),
+        'l': {'type': 'string', 'enum': list(LEVEL_CODES)},
+        'e': _string('evidence: specific examples with quotes'),
+        'str': _strings('strengths'),
+        'gap': _strings('gaps'),
+    })
+    properties = {
+        'n': _string('candidate name'),
+        't': _object({'ai': _boolean(), 'pub': _boolean(), 'cre': _boolean()}),
+        'rf': _strings('red flags, or empty'),
+        'yf': _strings('yellow flags, or empty'),
+        'cq': _object({
+            'ps': _strings('paradigm shift examples'),
+            'fp': _strings('future-proofing examples'),
+            'mw': _strings('magic wand examples'),
+        }),
+        'p': _object({key.rsplit('_', 1)[-1]: pillar for key in pillar_keys}),
+        'mh': _object({'f': _strings('must-haves found'), 'm': _strings('must-haves missing')}),
+        'ds': _strings('differentiation signals found'),
+        'd': {'type': 'string', 'enum': list(DECISION_CODES)},
+        'r': _string('2-3 sentence decision rationale'),
+        's': _strings('top 3 strengths'),
+        'c': _strings('top 3 concerns'),
+        'rec': _string('3-5 sentence recommendation'),
+        'roles': _strings('suitable roles'),
+        'q': _strings('interview focus areas'),
+    }
+    if design:
+        # Named in the vision instructions, so it keeps its report key
+        properties['design_evaluation'] = _object({
+            'score': _number(0, 10),
+            'comments': _string('Visual design assessment'),
+        })
+    return _object(properties)
+
+
+def packed_schema(item_schema, resume_ids):
+    """--pack reply: one ``item_schema`` analysis per resume, each tagged with the id of the resume it evaluates"""
+    item = dict(item_schema)
+    item['properties'] = {'resume_id': {'type': 'string', 'enum': list(resume_ids)}, **item_schema['properties']}
+    item['required'] = ['resume_id'] + list(item_schema['required'])
+    return _object({'analyses': {'type': 'array', 'items': item}})
+
+
+def roles_schema(item_schema, role_ids):
+    """--roles reply: one ``item_schema`` analysis per role profile, keyed by role id"""
+    return _object({'roles': _object({role_id: item_schema for role_id in role_ids})})
+
+
+# --fanout parts: thresholds/flags/signals in one call, the verdict from a short synthesis call
+FLAGS_SCHEMA = _object({**_screening_checks(), **_signals()})
+SYNTHESIS_SCHEMA = _object(_verdict())
+
+def screen_schema(pillar_key='pillar_3'):
+    """Cascade prefilter reply: thresholds, red flags and the framework's non-negotiable pillar (``pillar_key``)"""
+    return _object({
+        'candidate_name': _string('Name from resume'),
+        'minimum_thresholds_met': _thresholds(),
+        'red_flags_found': _strings('Exact red flags from the list that apply'),
+        pillar_key: _object({
+            'score': _number(0, 10),
+            'evidence': _string('One sentence quoting the resume'),
+        }),
+        'estimated_total_score': _number(0, 60),
+        'confidence': _number(0, 1),
+    })
+
+
+SCREEN_SCHEMA = screen_schema()
+
+
+# Outline placeholders wrapped in this marker lose their JSON quotes: "score": 0-10, "all_met": true/false
+_RAW = '\u2063'
+_RAW_RE = re.compile(f'"{_RAW}(.*?){_RAW}"')
+
+
+def _outline_value(schema):
+    if 'enum' in schema:
+        return '|'.join(str(v) for v in schema['enum'])
+    kind = schema.get('type')
+    if kind == 'object':
+        return {key: _outline_value(value) for key, value in schema['properties'].items()}
+    if kind == 'array':
+        return [schema.get('description') or _outline_value(schema['items'])]
+    if kind == 'boolean':
+        return f'{_RAW}true/false{_RAW}'
+    if kind in ('number', 'integer'):
+        low, high = schema.get('minimum'), schema.get('maximum')
+        return _RAW + (f"{low:g}-{high:g}" if low is not None and high is not None else 'number') + _RAW
+    return schema.get('description', 'string')
+
+
+def schema_outline(schema):
+    """Human-readable example of the reply shape for the prompt text"""
+    return _RAW_RE.sub(r'\1', json.dumps(_outline_value(schema), indent=2, ensure_ascii=False))
+
+
+def vendor_schema(schema, provider):
+    """Copy of ``schema`` restricted to what the provider's structured-output feature accepts"""
+    if isinstance(schema, list):
+        return [vendor_schema(item, provider) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    result = {}
+    for key, value in schema.items():
+        if provider == 'google' and key not in _GOOGLE_KEYWORDS:
+            continue
+        if provider == 'openai' and key in _OPENAI_DROP:
+            continue
+        if key == 'properties':
+            result[key] = {name: vendor_schema(sub, provider) for name, sub in value.items()}
+        elif key == 'items':
+            result[key] = vendor_schema(value, provider)
+        else:
+            result[key] = value
+    if provider == 'google' and 'enum' in schema:
+        result['format'] = 'enum'
+    if provider == 'openai' and schema.get('type') == 'object':
+        # Strict mode: every property required, nothing extra
+        result['required'] = list(schema.get('properties', {}))
+        result['additionalProperties'] = False
+    return result
+
+
+def validate(instance, schema, path='$'):
+    """List of schema violations (empty when valid); extra keys are allowed"""
+    errors = []
+    kind = schema.get('type')
+    expected = _TYPES.get(kind)
+    if expected and (not isinstance(instance, expected) or (kind in ('number', 'integer') and isinstance(instance, bool))):
+        return [f"{path}: expected {kind}, got {type(instance).__name__}"]
+    if 'enum' in schema and instance not in schema['enum']:
+        errors.append(f"{path}: {instance!r} is not one of {schema['enum']}")
+    if kind in ('number', 'integer'):
+        if 'minimum' in schema and instance < schema['minimum']:
+            errors.append(f"{path}: {instance} is below {schema['minimum']}")
+        if 'maximum' in schema and instance > schema['maximum']:
+            errors.append(f"{path}: {instance} is above {schema['maximum']}")
+    elif kind == 'object':
+        for key in schema.get('required', []):
+            if key not in instance:
+                errors.append(f"{path}.{key}: missing")
+        for key, sub in schema.get('properties', {}).items():
+            if key in instance:
+                errors.extend(validate(instance[key], sub, f"{path}.{key}"))
+    elif kind == 'array' and 'items' in schema:
+        for index, item in enumerate(instance):
+            errors.extend(validate(item, schema['items'], f"{path}[{index}]"))
+    return errors
+
+
+def parse_json(text):
+    """Parse a model reply that should be a JSON object, tolerating code fences, prose around it and trailing commas"""
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    fenced = _FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    start, end = text.find('{'), text.rfind('}')
+    if start < 0 or end <= start:
+        raise ValueError('no JSON object in response')
+    candidate = text[start:end + 1]
+    try:
+        return json.loads(candidate)
+    except ValueError:
+        return json.loads(_TRAILING_COMMA_RE.sub(r'\1', candidate))
+
+
+def repair(instance, schema, path='$', fixes=None):
+    """
+    Local, lossless fixes for common near-misses: numbers and booleans as
+    strings ("7/10", "yes"), wrongly cased enum values (or any value for a
+    single-value enum) and a bare string where a list is expected. Missing
+    fields and out-of-range numbers are left for validate() to report: a
+    default such as False or "" would read as the model's answer.
+
+    Returns (repaired instance, list of fixes applied).
+    """
+    fixes = [] if fixes is None else fixes
+    kind = schema.get('type')
+    if kind in ('number', 'integer') and isinstance(instance, str):
+        match = _NUMBER_RE.search(instance)
+        if match:
+            fixes.append(f"{path}: parsed number from {instance!r}")
+            instance = float(match.group())
+            instance = int(instance) if instance.is_integer() else instance
+    if kind == 'boolean' and isinstance(instance, str) and instance.strip().lower() in ('true', 'false', 'yes', 'no'):
+        fixes.append(f"{path}: parsed boolean from {instance!r}")
+        instance = instance.strip().lower() in ('true', 'yes')
+    elif kind == 'array' and isinstance(instance, str):
+        fixes.append(f"{path}: wrapped string in a list")
+        instance = [instance] if instance.strip() else []
+    elif kind == 'string' and 'enum' in schema and isinstance(instance, str) and instance not in schema['enum']:
+        # A single allowed value (e.g. the pillar name) is simply restored; otherwise match case-insensitively
+        matches = schema['enum'] if len(schema['enum']) == 1 else [
+            option for option in schema['enum'] if option.lower() == instance.strip().lower()]
+        if matches:
+            fixes.append(f"{path}: {instance!r} -> {matches[0]!r}")
+            instance = matches[0]
+
+    if kind == 'object' and isinstance(instance, dict):
+        for key, sub in schema.get('properties', {}).items():
+            if key in instance:
+                instance[key], _ = repair(instance[key], sub, f"{path}.{key}", fixes)
+    elif kind == 'array' and isinstance(instance, list) and 'items' in schema:
+        instance = [repair(item, schema['items'], f"{path}[{i}]", fixes)[0] for i, item in enumerate(instance)]
+    return instance, fixes
+
+
+def repair_prompt(text, errors, schema):
+    """Short prompt asking a cheap model to fix an invalid reply (instead of re-running the full analysis)"""
+    return f"""The JSON below does not match the required schema. Fix ONLY the listed problems and keep all other content unchanged. If the JSON is cut off, close it with the minimum needed.
+
+# PROBLEMS
+{chr(10).join('- ' + error for error in errors[:20])}
+
+# SCHEMA
+{json.dumps(schema, separators=(',', ':'))}
+
+# JSON TO FIX
+{text}
+
+Return ONLY the corrected JSON object."""
@@ -0,0 +1,454 @@
+"""
+Results store
+Appends every analysis to a local SQLite database with normalized tables for
+pillar scores, flags and signals so ranking/filter questions don't require
+globbing and parsing thousands of JSON files
+"""
+
+import json
+import re
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+DEFAULT_STORE_NAME = 'analyses.db'
+
+SCHEMA_VERSION = 5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY,
+    candidate_name TEXT,
+    decision TEXT,
+    total_score REAL,
+    weighted_score REAL,
+    provider TEXT,
+    model TEXT,
+    mode TEXT,
+    thresholds_met INTEGER,
+    analyzed_at TEXT NOT NULL,
+    source_file TEXT,
+    json_path TEXT UNIQUE,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_analyses_decision ON analyses (decision, total_score);
+CREATE INDEX IF NOT EXISTS idx_analyses_total ON analyses (total_score);
+CREATE INDEX IF NOT EXISTS idx_analyses_date ON analyses (analyzed_at);
+CREATE INDEX IF NOT EXISTS idx_analyses_candidate ON analyses (candidate_name);
+
+CREATE TABLE IF NOT EXISTS pillar_scores (
+    analysis_id INTEGER NOT NULL REFERENCES analyses (id) ON DELETE CASCADE,
+    pillar TEXT NOT NULL,
+    score REAL,
+    level TEXT,
+    PRIMARY KEY (analysis_id, pillar)
+);
+CREATE INDEX IF NOT EXISTS idx_pillar_scores ON pillar_scores (pillar, score, analysis_id);
+
+CREATE TABLE IF NOT EXISTS flags (
+    analysis_id INTEGER NOT NULL REFERENCES analyses (id) ON DELETE CASCADE,
+    severity TEXT NOT NULL,
+    flag TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_flags ON flags (severity, flag);
+CREATE INDEX IF NOT EXISTS idx_flags_analysis ON flags (analysis_id);
+
+CREATE TABLE IF NOT EXISTS signals (
+    analysis_id INTEGER NOT NULL REFERENCES analyses (id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    signal TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_signals ON signals (kind, signal);
+CREATE INDEX IF NOT EXISTS idx_signals_analysis ON signals (analysis_id);
+"""
+
+# Applied in order to stores older than the listed version (fresh stores run them all)
+MIGRATIONS = {
+    2: [
+        'ALTER TABLE analyses ADD COLUMN duration_ms REAL',
+        'ALTER TABLE analyses ADD COLUMN input_tokens INTEGER',
+        'ALTER TABLE analyses ADD COLUMN output_tokens INTEGER',
+        'ALTER TABLE analyses ADD COLUMN cost_usd REAL',
+    ],
+    3: [
+        'ALTER TABLE analyses ADD COLUMN speed TEXT',
+    ],
+    4: [
+        'ALTER TABLE analyses ADD COLUMN role TEXT',
+    ],
+    5: [
+        'ALTER TABLE analyses ADD COLUMN framework TEXT',
+        'CREATE INDEX IF NOT EXISTS idx_analyses_framework ON analyses (framework)',
+    ],
+}
+
+PILLAR_KEYS = ['pillar_1', 'pillar_2', 'pillar_3', 'pillar_4', 'pillar_5', 'pillar_6']
+
+SORT_COLUMNS = {
+    'total': 'a.total_score',
+    'weighted': 'a.weighted_score',
+    'date': 'a.analyzed_at',
+    'name': 'a.candidate_name',
+}
+
+_PILLAR_FILTER_RE = re.compile(r'^(?:pillar_?)?([1-6])\s*(>=|<=|==|=|>|<)\s*(\d+(?:\.\d+)?)$')
+
+
+def _to_number(value):
+    """Coerce an LLM-provided score to a float (None when missing/invalid)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def weighted_score(pillars, pillar_weights):
+    """Weighted score out of 100 from 0-10 pillar scores and percentage weights"""
+    if not pillar_weights:
+        return None
+    total = 0.0
+    for key, weight in pillar_weights.items():
+        score = _to_number((pillars.get(key) or {}).get('score'))
+        if score is None:
+            return None
+        total += score * weight / 10
+    return round(total, 1)
+
+
+def parse_pillar_filter(expression):
+    """Parse ``3>=7`` / ``pillar_3>=7`` into ('pillar_3', '>=', 7.0)"""
+    match = _PILLAR_FILTER_RE.match(expression.replace(' ', ''))
+    if not match:
+        raise ValueError(f"Invalid pillar filter '{expression}'. Use e.g. 3>=7 or pillar_3>=7")
+    op = '=' if match.group(2) == '==' else match.group(2)
+    return f"pillar_{match.group(1)}", op, float(match.group(3))
+
+
+def parse_date(value, end=False):
+    """
+    Parse YYYY-MM-DD[THH:MM[:SS]] or a relative age like ``30d`` / ``12h`` into an ISO string.
+
+    With ``end`` the result is an exclusive upper bound covering the whole of
+    what was named: a date runs to the next midnight, ``HH:MM`` to the next
+    minute, ``HH:MM:SS`` to the next second.
+    """
+    value = value.strip()
+    relative = re.match(r'^(\d+)([dh])$', value)
+    if relative:
+        amount = int(relative.group(1))
+        delta = timedelta(days=amount) if relative.group(2) == 'd' else timedelta(hours=amount)
+        return (datetime.now() - delta).isoformat(timespec='seconds')
+    parsed = datetime.fromisoformat(value)
+    if end:
+        clock = re.split(r'[T ]', value, 1)[1:]
+        colons = clock[0].split('+')[0].count(':') if clock else -1
+        parsed += {-1: timedelta(days=1), 1: timedelta(minutes=1)}.get(colons, timedelta(seconds=1))
+    return parsed.isoformat(timespec='seconds')
+
+
+class ResultsStore:
+    """Append-only SQLite store of analysis results"""
+
+    def __init__(self, path, pillar_weights=None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.pillar_weights = pillar_weights
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        current = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        with self.conn:
+            for version in sorted(MIGRATIONS):
+                if version > current:
+                    for statement in MIGRATIONS[version]:
+                        self.conn.execute(statement)
+            self.conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def add_analysis(self, analysis, source_file=None, json_path=None, mode='single', analyzed_at=None):
+        """Insert one analysis (and its pillar scores, flags and signals); returns its row id"""
+        with self.conn:
+            return self._insert(analysis, source_file, json_path, mode, analyzed_at)
+
+    def _insert(self, analysis, source_file, json_path, mode, analyzed_at):
+        metadata = analysis.get('_metadata', {})
+        pillars = analysis.get('pillars', {}) or {}
+        thresholds = analysis.get('minimum_thresholds_met', {}) or {}
+        usage = metadata.get('usage', {}) or {}
+        # --roles analyses are weighted by their own profile
+        role = metadata.get('role') or {}
+        analyzed_at = analyzed_at or datetime.now().isoformat(timespec='seconds')
+
+        if json_path:
+            # Re-ingesting a report replaces its previous row
+            self.conn.execute('DELETE FROM analyses WHERE json_path = ?', (str(json_path),))
+        cursor = self.conn.execute(
+            """INSERT INTO analyses (candidate_name, decision, total_score, weighted_score, provider, model,
+                                     mode, thresholds_met, analyzed_at, source_file, json_path, data,
+                                     duration_ms, input_tokens, output_tokens, cost_usd, speed, role,
+                                     framework)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            (
+                analysis.get('candidate_name'),
+                analysis.get('decision'),
+                _to_number(analysis.get('total_score')),
+                weighted_score(pillars, role.get('weights') or self.pillar_weights),
+                metadata.get('provider'),
+                metadata.get('model'),
+                mode,
+                None if 'all_met' not in thresholds else int(bool(thresholds.get('all_met'))),
+                analyzed_at,
+                str(source_file) if source_file else None,
+                str(json_path) if json_path else None,
+                json.dumps(analysis),
+                metadata.get('total_ms'),
+                usage.get('input_tokens'),
+                usage.get('output_tokens'),
+                metadata.get('cost_usd'),
+                metadata.get('speed'),
+                role.get('id'),
+                (metadata.get('framework') or {}).get('hash'),
+            )
+        )
+        analysis_id = cursor.lastrowid
+
+        self.conn.executemany(
+            'INSERT INTO pillar_scores (analysis_id, pillar, score, level) VALUES (?, ?, ?, ?)',
+            [(analysis_id, key, _to_number(data.get('score')), data.get('level'))
+             for key, data in pillars.items() if isinstance(data, dict)]
+        )
+
+        flags = [(analysis_id, 'red', flag) for flag in analysis.get('red_flags_found', []) or []]
+        flags += [(analysis_id, 'yellow', flag) for flag in analysis.get('yellow_flags_found', []) or []]
+        self.conn.executemany('INSERT INTO flags (analysis_id, severity, flag) VALUES (?, ?, ?)', flags)
+
+        must_have = analysis.get('must_have_signals', {}) or {}
+        differentiation = analysis.get('differentiation_signals', {}) or {}
+        signals = [(analysis_id, 'must_have_found', s) for s in must_have.get('signals_found', []) or []]
+        signals += [(analysis_id, 'must_have_missing', s) for s in must_have.get('signals_missing', []) or []]
+        signals += [(analysis_id, 'differentiation', s) for s in differentiation.get('signals_found', []) or []]
+        self.conn.executemany('INSERT INTO signals (analysis_id, kind, signal) VALUES (?, ?, ?)', signals)
+
+        return analysis_id
+
+    def ingest_json_files(self, paths):
+        """Backfill the store from existing analysis JSON files; returns the number ingested"""
+        count = 0
+        with self.conn:
+            for path in paths:
+                path = Path(path)
+                try:
+                    with open(path) as f:
+                        analysis = json.load(f)
+                except (OSError, ValueError):
+                    continue
+                if not isinstance(analysis, dict) or 'pillars' not in analysis:
+                    continue
+                mode = 'deep' if '_DEEP_' in path.name else (
+                    'role' if (analysis.get('_metadata') or {}).get('role') else 'single')
+                analyzed_at = datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec='seconds')
+                self._insert(analysis, None, path.resolve(), mode, analyzed_at)
+                count += 1
+        return count
+
+    def query(self, decision=None, min_total=None, max_total=None, pillar_filters=(), since=None, until=None,
+              provider=None, model=None, candidate=None, red_flags=None, role=None, framework=None,
+              sort='total', descending=True, limit=50):
+        """
+        Filter and rank stored analyses.
+
+        ``pillar_filters`` is a list of (pillar, op, value) tuples (see
+        parse_pillar_filter); ``since`` is inclusive and ``until`` exclusive
+        (parse_date(..., end=True)); ``sort`` is one of SORT_COLUMNS or a pillar key.
+        Returns a list of dict rows with pillar scores flattened in.
+        """
+        where = []
+        params = []
+
+        if decision:
+            decisions = [decision] if isinstance(decision, str) else list(decision)
+            where.append(f"a.decision IN ({', '.join('?' * len(decisions))})")
+            params.extend(decisions)
+        if min_total is not None:
+            where.append('a.total_score >= ?')
+            params.append(min_total)
+        if max_total is not None:
+            where.append('a.total_score <= ?')
+            params.append(max_total)
+        if since:
+            where.append('a.analyzed_at >= ?')
+            params.append(since)
+        if until:
+            # Exclusive: parse_date(..., end=True) gives the first moment after the named day or second
+            where.append('a.analyzed_at < ?')
+            params.append(until)
+        if provider:
+            where.append('a.provider = ?')
+            params.append(provider)
+        if model:
+            where.append('a.model = ?')
+            params.append(model)
+        if candidate:
+            where.append('a.candidate_name LIKE ?')
+            params.append(f"%{candidate}%")
+        if role:
+            where.append('a.role = ?')
+            params.append(role)
+        if framework:
+            # Compiled-framework hash (_metadata.framework.hash) or a prefix of it
+            where.append('a.framework LIKE ?')
+            params.append(f"{framework}%")
+        if red_flags is not None:
+            has_red = 'EXISTS' if red_flags else 'NOT EXISTS'
+            where.append(f"{has_red} (SELECT 1 FROM flags f WHERE f.analysis_id = a.id AND f.severity = 'red')")
+        # Pillar filters and pillar sorts join the (pillar, score) index directly (rows without
+        # a score for that pillar are excluded)
+        joins = []
+        join_params = []
+        joined = {}
+        for pillar, op, value in pillar_filters:
+            alias = joined.setdefault(pillar, f"p{len(joined)}")
+            where.append(f"{alias}.score {op} ?")
+            params.append(value)
+
+        if sort in SORT_COLUMNS:
+            order = SORT_COLUMNS[sort]
+        elif sort in PILLAR_KEYS:
+            order = f"{joined.setdefault(sort, f'p{len(joined)}')}.score"
+        else:
+            raise ValueError(f"Unknown sort key '{sort}'. Use one of: {', '.join(list(SORT_COLUMNS) + PILLAR_KEYS)}")
+
+        for pillar, alias in joined.items():
+            joins.append(f"JOIN pillar_scores {alias} ON {alias}.analysis_id = a.id AND {alias}.pillar = ?")
+            join_params.append(pillar)
+
+        sql = ("SELECT a.id, a.candidate_name, a.decision, a.total_score, a.weighted_score, a.provider, a.model, "
+               "a.mode, a.role, a.framework, a.analyzed_at, a.source_file, a.json_path FROM analyses a")
+        if joins:
+            sql += ' ' + ' '.join(joins)
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        sql += f" ORDER BY {order} IS NULL, {order} {'DESC' if descending else 'ASC'}, a.id DESC"
+        params = join_params + params
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(int(limit))
+
+        rows = [dict(row) for row in self.conn.execute(sql, params)]
+
+        # Flatten pillar scores in for the returned rows only
+        by_id = {row['id']: row for row in rows}
+        for row in rows:
+            row.update({key: None for key in PILLAR_KEYS})
+        ids = list(by_id)
+        for chunk_start in range(0, len(ids), 500):
+            chunk = ids[chunk_start:chunk_start + 500]
+            for pillar_row in self.conn.execute(
+                    f"SELECT analysis_id, pillar, score FROM pillar_scores "
+                    f"WHERE analysis_id IN ({', '.join('?' * len(chunk))})", chunk):
+                if pillar_row['pillar'] in PILLAR_KEYS:
+                    by_id[pillar_row['analysis_id']][pillar_row['pillar']] = pillar_row['score']
+        return rows
+
+    def iter_rows(self):
+        """
+        Stream every stored analysis with flattened pillar scores and red-flag
+        counts. ``deep_group`` is the report base ({base}_{provider}.json
+        without the provider) of --deep-analysis rows, None otherwise; rows of
+        one group come out consecutively.
+        """
+        pivot = ', '.join(f"MAX(CASE WHEN p.pillar = '{key}' THEN p.score END) AS {key}" for key in PILLAR_KEYS)
+        # rtrim drops the trailing "{provider}.json" (lowercase letters and dots) up to the last "_"
+        deep_group = "CASE WHEN a.mode = 'deep' THEN rtrim(a.json_path, 'abcdefghijklmnopqrstuvwxyz.') END"
+        sql = (f"SELECT a.id, a.candidate_name, a.decision, a.total_score, a.weighted_score, a.model, a.json_path, "
+               f"{pivot}, (SELECT COUNT(*) FROM flags f WHERE f.analysis_id = a.id AND f.severity = 'red') AS red_flags, "
+               f"{deep_group} AS deep_group "
+               f"FROM analyses a LEFT JOIN pillar_scores p ON p.analysis_id = a.id GROUP BY a.id "
+               f"ORDER BY deep_group, a.id")
+        for row in self.conn.execute(sql):
+            yield dict(row)
+
+    def decision_counts(self, since=None):
+        """Number of stored analyses per decision"""
+        sql = 'SELECT decision, COUNT(*) AS n FROM analyses'
+        params = []
+        if since:
+            sql += ' WHERE analyzed_at >= ?'
+            params.append(since)
+        sql += ' GROUP BY decision ORDER BY n DESC'
+        return [(row['decision'], row['n']) for row in self.conn.execute(sql, params)]
+
+    def model_performance(self, limit=2000):
+        """
+        Measured latency and output size per (provider, model) over the most
+        recent ``limit`` instrumented analyses.
+
+        Returns {(provider, model): {'samples', 'p50_ms', 'p90_ms', 'avg_output_tokens'}}.
+        """
+        samples = {}
+        rows = self.conn.execute(
+            'SELECT provider, model, duration_ms, output_tokens FROM analyses '
+            'WHERE duration_ms IS NOT NULL ORDER BY id DESC LIMIT ?', (limit,))
+        for row in rows:
+            samples.setdefault((row['provider'], row['model']), []).append(
+                (row['duration_ms'], row['output_tokens'] or 0))
+        performance = {}
+        for key, values in samples.items():
+            durations = sorted(duration for duration, _ in values)
+            performance[key] = {
+                'samples': len(values),
+                'p50_ms': durations[len(durations) // 2],
+                'p90_ms': durations[min(len(durations) - 1, int(len(durations) * 0.9))],
+                'avg_output_tokens': sum(tokens for _, tokens in values) / len(values),
+            }
+        return performance
+
+    def speed_runs(self, limit=5000):
+        """Instrumented single-mode analyses with their --speed preset (input for presets.preset_stability)"""
+        rows = self.conn.execute(
+            "SELECT provider, model, speed, source_file, duration_ms, output_tokens, cost_usd, total_score, decision "
+            "FROM analyses WHERE duration_ms IS NOT NULL AND mode = 'single' ORDER BY id DESC LIMIT ?", (limit,))
+        return [dict(row) for row in rows]
+
+
+def format_rows(rows):
+    """Render query rows as an aligned plain-text table"""
+    if not rows:
+        return "No matching analyses."
+    headers = ['Date', 'Candidate', 'Decision', 'Total', 'P1', 'P2', 'P3', 'P4', 'P5', 'P6', 'Model', 'Report']
+
+    def fmt_score(value):
+        if value is None:
+            return '-'
+        return f"{value:g}"
+
+    table = [headers]
+    for row in rows:
+        table.append([
+            (row['analyzed_at'] or '')[:16].replace('T', ' '),
+            (row['candidate_name'] or 'Unknown')[:30],
+            row['decision'] or 'Unknown',
+            fmt_score(row['total_score']),
+            *[fmt_score(row[key]) for key in PILLAR_KEYS],
+            row['model'] or '-',
+            Path(row['json_path']).name if row['json_path'] else '-',
+        ])
+    widths = [max(len(str(r[i])) for r in table) for i in range(len(headers))]
+    lines = ['  '.join(str(cell).ljust(widths[i]) for i, cell in enumerate(r)).rstrip() for r in table]
+    lines.insert(1, '  '.join('-' * w for w in widths))
+    return '\n'.join(lines)
@@ -0,0 +1,172 @@
+"""
+Optional telemetry export
+OpenTelemetry spans (OTLP) and Prometheus histograms for the analyzer.
+Everything here is a no-op until configure() enables an exporter.
+"""
+
+import atexit
+import functools
+from contextlib import contextmanager
+
+OTEL_AVAILABLE = False
+PROMETHEUS_AVAILABLE = False
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    OTEL_AVAILABLE = True
+except ImportError:
+    pass
+
+try:
+    import prometheus_client
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    pass
+
+
+SERVICE_NAME = 'aipm-resume-analyzer'
+
+# Seconds; analyses range from sub-second (cached/fast models) to minutes (deep reasoning)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+RETRY_BUCKETS = (0, 1, 2, 3, 5, 8)
+
+
+class _State:
+    tracer = None
+    tracer_provider = None
+    metrics = None
+    registry = None
+
+
+_state = _State()
+
+
+def _build_metrics(registry):
+    labels = ['provider', 'model']
+    return {
+        'latency': prometheus_client.Histogram(
+            'resume_analyzer_analysis_seconds', 'End-to-end analysis latency per resume',
+            labels, buckets=LATENCY_BUCKETS, registry=registry),
+        'stage': prometheus_client.Histogram(
+            'resume_analyzer_stage_seconds', 'Latency of each pipeline stage',
+            labels + ['stage'], buckets=LATENCY_BUCKETS, registry=registry),
+        'tokens': prometheus_client.Histogram(
+            'resume_analyzer_tokens', 'Tokens per analysis by kind (input, cached_input, output, reasoning)',
+            labels + ['kind'], buckets=TOKEN_BUCKETS, registry=registry),
+        'retries': prometheus_client.Histogram(
+            'resume_analyzer_retries',
+            'Extra API calls per analysis (remote schema repairs, provider failovers)',
+            labels, buckets=RETRY_BUCKETS, registry=registry),
+        'cost': prometheus_client.Counter(
+            'resume_analyzer_cost_usd', 'Estimated spend from the local price table',
+            labels, registry=registry),
+        'errors': prometheus_client.Counter(
+            'resume_analyzer_errors', 'Failed analyses',
+            labels, registry=registry),
+    }
+
+
+def configure(otlp_endpoint=None, metrics_port=None, metrics_file=None, service_name=SERVICE_NAME):
+    """
+    Enable exporters. Returns a list of human-readable notes about what was enabled.
+
+    ``otlp_endpoint`` is an OTLP/HTTP collector base URL (e.g. http://localhost:4318);
+    ``metrics_port`` serves Prometheus ``/metrics`` for the life of the process and
+    ``metrics_file`` writes the same exposition text at exit (node_exporter textfile
+    collector style, for batch runs that finish before a scrape).
+    """
+    notes = []
+
+    if otlp_endpoint:
+        if not OTEL_AVAILABLE:
+            notes.append("⚠️  Tracing disabled: install opentelemetry-sdk and opentelemetry-exporter-otlp-proto-http")
+        else:
+            provider = TracerProvider(resource=Resource.create({'service.name': service_name}))
+            endpoint = otlp_endpoint.rstrip('/')
+            if not endpoint.endswith('/v1/traces'):
+                endpoint += '/v1/traces'
+            provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+            _state.tracer_provider = provider
+            _state.tracer = provider.get_tracer(service_name)
+            notes.append(f"📡 Exporting spans to {endpoint}")
+
+    if metrics_port or metrics_file:
+        if not PROMETHEUS_AVAILABLE:
+            notes.append("⚠️  Metrics disabled: install prometheus-client")
+        else:
+            _state.registry = prometheus_client.CollectorRegistry()
+            _state.metrics = _build_metrics(_state.registry)
+            if metrics_port:
+                prometheus_client.start_http_server(int(metrics_port), registry=_state.registry)
+                notes.append(f"📊 Serving metrics on http://localhost:{metrics_port}/metrics")
+            if metrics_file:
+                atexit.register(prometheus_client.write_to_textfile, str(metrics_file), _state.registry)
+                notes.append(f"📊 Metrics will be written to {metrics_file}")
+
+    if _state.tracer_provider:
+        atexit.register(shutdown)
+    return notes
+
+
+def enabled():
+    return _state.tracer is not None or _state.metrics is not None
+
+
+def shutdown():
+    """Flush pending spans (safe to call more than once)"""
+    if _state.tracer_provider:
+        _state.tracer_provider.shutdown()
+        _state.tracer_provider = None
+        _state.tracer = None
+
+
+@contextmanager
+def span(name, **attributes):
+    """Open a span when tracing is enabled; otherwise do nothing"""
+    if _state.tracer is None:
+        yield None
+        return
+    with _state.tracer.start_as_current_span(
+            name, attributes={k: v for k, v in attributes.items() if v is not None}) as current:
+        yield current
+
+
+def traced(name):
+    """Decorator for ResumeAnalyzer methods: span tagged with the analyzer's provider and model"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if _state.tracer is None:
+                return func(self, *args, **kwargs)
+            with span(name, **{'llm.provider': getattr(self, 'api_provider', None),
+                               'llm.model': getattr(self, 'model', None)}):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_analysis(metadata):
+    """Observe one finished analysis's instrumentation (see RunStats.to_metadata)"""
+    metrics = _state.metrics
+    if metrics is None or not metadata:
+        return
+    labels = {'provider': metadata.get('provider', ''), 'model': metadata.get('model', '')}
+    if 'total_ms' in metadata:
+        metrics['latency'].labels(**labels).observe(metadata['total_ms'] / 1000)
+    for stage, ms in (metadata.get('timings_ms') or {}).items():
+        metrics['stage'].labels(stage=stage, **labels).observe(ms / 1000)
+    for kind, count in (metadata.get('usage') or {}).items():
+        metrics['tokens'].labels(kind=kind.replace('_tokens', ''), **labels).observe(count)
+    metrics['retries'].labels(**labels).observe(metadata.get('retries', 0))
+    if metadata.get('cost_usd'):
+        metrics['cost'].labels(**labels).inc(metadata['cost_usd'])
+
+
+def record_error(provider, model):
+    """Count a failed analysis"""
+    if _state.metrics is not None:
+        _state.metrics['errors'].labels(provider=provider or '', model=model or '').inc()
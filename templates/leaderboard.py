@@ -0,0 +1,402 @@
+"""
+Candidate leaderboard
+Ranks a batch of analyses (streamed from JSON files or the results store)
+with bounded top-k heaps and renders sortable markdown/HTML shortlists
+"""
+
+import heapq
+import html
+import json
+import operator
+from datetime import datetime
+from itertools import count, groupby
+from pathlib import Path
+
+
+PILLAR_KEYS = ['pillar_1', 'pillar_2', 'pillar_3', 'pillar_4', 'pillar_5', 'pillar_6']
+PILLAR_LABELS = ['Technical', 'Product', 'AI Depth', 'Communication', 'Strategy', 'Execution']
+
+DECISION_ORDER = ['Strong Screen', 'Screen', 'Maybe', 'No Screen']
+
+RANK_KEYS = ['total', 'weighted'] + PILLAR_KEYS
+
+_OPS = {
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+    '=': operator.eq,
+}
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def summarize_analysis(analysis, source=None, pillar_weights=None):
+    """Reduce a full analysis dict to the small row the leaderboard keeps in memory"""
+    pillars = analysis.get('pillars', {}) or {}
+    scores = {key: _to_number((pillars.get(key) or {}).get('score')) for key in PILLAR_KEYS}
+
+    weighted = _to_number(analysis.get('weighted_score'))
+    if pillar_weights and all(scores.get(key) is not None for key in pillar_weights):
+        weighted = round(sum(scores[key] * weight / 10 for key, weight in pillar_weights.items()), 1)
+
+    return {
+        'candidate_name': analysis.get('candidate_name', 'Candidate'),
+        'decision': analysis.get('decision', 'Unknown'),
+        'total': _to_number(analysis.get('total_score')),
+        'weighted': weighted,
+        **scores,
+        'red_flags': len(analysis.get('red_flags_found', []) or []),
+        'model': analysis.get('_metadata', {}).get('model_display_name', ''),
+        'source': str(source) if source else '',
+    }
+
+
+def summary_from_store_row(row):
+    """Adapt a results-store row (see ResultsStore.iter_rows) to a leaderboard summary"""
+    return {
+        'candidate_name': row['candidate_name'] or 'Candidate',
+        'decision': row['decision'] or 'Unknown',
+        'total': row['total_score'],
+        'weighted': row['weighted_score'],
+        **{key: row[key] for key in PILLAR_KEYS},
+        'red_flags': row['red_flags'],
+        'model': row['model'] or '',
+        'source': row['json_path'] or '',
+    }
+
+
+def merge_deep_summaries(rows):
+    """
+    One row for a --deep-analysis candidate from its per-provider rows, as
+    the deep report shows it: average scores, the most common decision (the
+    more cautious one on a tie) and the most red flags any provider found.
+    """
+    def average(key):
+        values = [row[key] for row in rows if row[key] is not None]
+        return round(sum(values) / len(values), 1) if values else None
+
+    decisions = [row['decision'] for row in rows]
+    decision = max(decisions, key=lambda d: (decisions.count(d),
+                                             DECISION_ORDER.index(d) if d in DECISION_ORDER else -1))
+    return {
+        'candidate_name': rows[0]['candidate_name'],
+        'decision': decision,
+        'total': average('total'),
+        'weighted': average('weighted'),
+        **{key: average(key) for key in PILLAR_KEYS},
+        'red_flags': max(row['red_flags'] for row in rows),
+        'model': ', '.join(row['model'] for row in rows if row['model']),
+        'source': rows[0]['source'],
+    }
+
+
+def merge_deep_groups(rows):
+    """
+    Yield ``(group, summary)`` rows with each run of consecutive rows sharing
+    a non-None group (the per-provider rows of one --deep-analysis
+    candidate) merged into one, as soon as the run ends
+    """
+    for group, members in groupby(rows, key=lambda item: item[0]):
+        if group is None:
+            yield from (row for _, row in members)
+        else:
+            yield merge_deep_summaries([row for _, row in members])
+
+
+def _json_rows(paths, pillar_weights):
+    for path in paths:
+        path = Path(path)
+        try:
+            with open(path) as f:
+                analysis = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not (isinstance(analysis, dict) and 'pillars' in analysis):
+            continue
+        group = path.parent / path.stem.rsplit('_', 1)[0] if '_DEEP_' in path.stem else None
+        yield group, summarize_analysis(analysis, source=path, pillar_weights=pillar_weights)
+
+
+def iter_json_summaries(paths, pillar_weights=None):
+    """
+    Stream analysis summaries from JSON files, one file in memory at a time.
+    The per-provider files of a --deep-analysis run ({base}_{provider}.json)
+    are merged into one row per candidate; give ``paths`` sorted so they are
+    adjacent (rank sorts each folder) and each group is yielded once its last
+    file is read.
+    """
+    return merge_deep_groups(_json_rows(paths, pillar_weights))
+
+
+def iter_store_summaries(rows):
+    """Leaderboard rows from ResultsStore.iter_rows(), deep-analysis providers merged per report like the JSON path"""
+    return merge_deep_groups((row['deep_group'], summary_from_store_row(row)) for row in rows)
+
+
+class Leaderboard:
+    """
+    Bounded top-k ranking over a stream of analysis summaries.
+
+    Memory is O(k x decision buckets) regardless of how many candidates are
+    added: each bucket keeps a min-heap of its k best rows and evicts the
+    weakest on overflow. Counts and averages are tracked for every row.
+    """
+
+    def __init__(self, k=50, rank_by='total', decisions=None, min_total=None, pillar_filters=(),
+                 exclude_red_flags=False, by_decision=True):
+        if rank_by not in RANK_KEYS:
+            raise ValueError(f"Unknown rank key '{rank_by}'. Use one of: {', '.join(RANK_KEYS)}")
+        self.k = k
+        self.rank_by = rank_by
+        self.decisions = set(decisions) if decisions else None
+        self.min_total = min_total
+        self.pillar_filters = list(pillar_filters)
+        self.exclude_red_flags = exclude_red_flags
+        self.by_decision = by_decision
+        self.seen = 0
+        self.matched = 0
+        self.decision_counts = {}
+        self._score_sum = 0.0
+        self._heaps = {}
+        self._tiebreak = count()
+
+    def _passes(self, row):
+        if self.decisions and row['decision'] not in self.decisions:
+            return False
+        if self.min_total is not None and (row['total'] is None or row['total'] < self.min_total):
+            return False
+        if self.exclude_red_flags and row['red_flags']:
+            return False
+        for pillar, op, value in self.pillar_filters:
+            score = row.get(pillar)
+            if score is None or not _OPS[op](score, value):
+                return False
+        return True
+
+    def _key(self, row):
+        primary = row.get(self.rank_by)
+        return (primary if primary is not None else -1, row['total'] if row['total'] is not None else -1)
+
+    def add(self, row):
+        """Offer one summary row to the leaderboard"""
+        self.seen += 1
+        if not self._passes(row):
+            return
+        self.matched += 1
+        self.decision_counts[row['decision']] = self.decision_counts.get(row['decision'], 0) + 1
+        self._score_sum += row['total'] or 0
+
+        bucket = row['decision'] if self.by_decision else 'All'
+        heap = self._heaps.setdefault(bucket, [])
+        # Later rows lose ties so the output is stable for a given input order
+        entry = (self._key(row), -next(self._tiebreak), row)
+        if len(heap) < self.k:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    def extend(self, rows):
+        for row in rows:
+            self.add(row)
+        return self
+
+    @property
+    def average_total(self):
+        return round(self._score_sum / self.matched, 1) if self.matched else 0
+
+    def buckets(self):
+        """Return [(bucket name, rows best-first)] in decision order"""
+        names = sorted(self._heaps, key=lambda d: DECISION_ORDER.index(d) if d in DECISION_ORDER else len(DECISION_ORDER))
+        return [(name, [entry[2] for entry in sorted(self._heaps[name], key=lambda e: e[:2], reverse=True)])
+                for name in names]
+
+
+def _fmt(value):
+    if value is None:
+        return '-'
+    return f"{value:g}"
+
+
+def _report_name(source):
+    """HTML report that belongs to a JSON source (deep per-provider JSONs share one report)"""
+    stem = Path(source).stem
+    if '_DEEP_' in stem:
+        stem = stem.rsplit('_', 1)[0]
+    return f"{stem}.html"
+
+
+def _md_cell(value):
+    """Text safe inside a markdown table cell"""
+    return str(value).replace('|', '\\|').replace('\n', ' ')
+
+
+def _describe_filters(board):
+    parts = []
+    if board.decisions:
+        parts.append('decision in ' + ', '.join(sorted(board.decisions)))
+    if board.min_total is not None:
+        parts.append(f"total >= {_fmt(board.min_total)}")
+    for pillar, op, value in board.pillar_filters:
+        parts.append(f"{pillar} {op} {_fmt(value)}")
+    if board.exclude_red_flags:
+        parts.append('no red flags')
+    return '; '.join(parts) or 'none'
+
+
+def render_leaderboard_markdown(board, title='Candidate Leaderboard'):
+    """Render the leaderboard as markdown tables (one per decision bucket)"""
+    date_formatted = datetime.now().strftime('%B %d, %Y at %H:%M:%S')
+    md_content = f"""# {title}
+
+**Generated**: {date_formatted}
+**Candidates scanned**: {board.seen} | **Matching filters**: {board.matched} | **Average total**: {board.average_total}/60
+**Ranked by**: {board.rank_by} | **Filters**: {_describe_filters(board)}
+
+| Decision | Candidates |
+|----------|------------|
+"""
+    for decision, n in sorted(board.decision_counts.items(),
+                              key=lambda item: DECISION_ORDER.index(item[0]) if item[0] in DECISION_ORDER else 99):
+        md_content += f"| {decision} | {n} |\n"
+
+    header = '| # | Candidate | Decision | Total | Weighted | ' + ' | '.join(PILLAR_LABELS) + ' | Red Flags | Report |\n'
+    divider = '|---|-----------|----------|-------|----------|' + '----|' * len(PILLAR_LABELS) + '-----------|--------|\n'
+
+    for bucket, rows in board.buckets():
+        md_content += f"\n## {bucket} (top {len(rows)} of {board.decision_counts.get(bucket, board.matched)})\n\n"
+        md_content += header + divider
+        for rank, row in enumerate(rows, 1):
+            report = Path(row['source']).name if row['source'] else '-'
+            md_content += (f"| {rank} | {_md_cell(row['candidate_name'])} | {_md_cell(row['decision'])} | "
+                           f"{_fmt(row['total'])} | "
+                           f"{_fmt(row['weighted'])} | " + ' | '.join(_fmt(row[key]) for key in PILLAR_KEYS) +
+                           f" | {row['red_flags']} | {report} |\n")
+
+    return md_content
+
+
+def render_leaderboard_html(board, title='Candidate Leaderboard'):
+    """Render the leaderboard as a standalone HTML page with click-to-sort tables"""
+    date_formatted = datetime.now().strftime('%B %d, %Y at %H:%M:%S')
+    esc = html.escape
+
+    sections = ""
+    for bucket, rows in board.buckets():
+        body_rows = ""
+        for rank, row in enumerate(rows, 1):
+            source = row['source']
+            report = f"<a href=\"{esc(_report_name(source))}\">{esc(Path(source).stem)}</a>" if source else '-'
+            pillar_cells = ''.join(f"<td>{_fmt(row[key])}</td>" for key in PILLAR_KEYS)
+            body_rows += (f"<tr><td>{rank}</td><td>{esc(str(row['candidate_name']))}</td>"
+                          f"<td><span class=\"decision-badge {esc(row['decision'].lower().replace(' ', '-'))}\">"
+                          f"{esc(row['decision'])}</span></td><td>{_fmt(row['total'])}</td>"
+                          f"<td>{_fmt(row['weighted'])}</td>{pillar_cells}<td>{row['red_flags']}</td>"
+                          f"<td>{report}</td></tr>\n")
+        pillar_headers = ''.join(f"<th>{label}</th>" for label in PILLAR_LABELS)
+        sections += f"""
+        <h2>{esc(bucket)} <small>(top {len(rows)} of {board.decision_counts.get(bucket, board.matched)})</small></h2>
+        <table class="sortable">
+            <thead><tr><th>#</th><th>Candidate</th><th>Decision</th><th>Total</th><th>Weighted</th>{pillar_headers}<th>Red Flags</th><th>Report</th></tr></thead>
+            <tbody>
+{body_rows}            </tbody>
+        </table>
+"""
+
+    counts = ''.join(f"<li><strong>{esc(decision)}</strong>: {n}</li>"
+                     for decision, n in sorted(board.decision_counts.items(),
+                                               key=lambda item: DECISION_ORDER.index(item[0]) if item[0] in DECISION_ORDER else 99))
+
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{esc(title)}</title>
+    <style>
+        @import url('https://fonts.googleapis.com/css2?family=Quattrocento:wght@400;700&display=swap');
+
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+
+        body {{
+            font-family: 'Quattrocento', serif;
+            line-height: 1.5;
+            color: #2D3748;
+            background: #FAFAF9;
+            padding: 20px 10px;
+        }}
+
+        .container {{
+            max-width: 1400px;
+            margin: 0 auto;
+            background: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.1);
+            overflow: hidden;
+        }}
+
+        .header {{
+            background: linear-gradient(135deg, #CC7744 0%, #B86434 100%);
+            color: white;
+            padding: 24px;
+        }}
+
+        .header h1 {{ font-size: 1.75rem; margin-bottom: 6px; }}
+        .header .meta {{ opacity: 0.9; font-size: 0.9rem; }}
+        .header ul {{ list-style: none; display: flex; gap: 16px; margin-top: 10px; }}
+
+        .content {{ padding: 24px; overflow-x: auto; }}
+        h2 {{ margin: 24px 0 10px; color: #B86434; }}
+        h2 small {{ color: #718096; font-weight: 400; font-size: 0.85rem; }}
+
+        table {{ width: 100%; border-collapse: collapse; font-size: 0.9rem; }}
+        th, td {{ padding: 6px 8px; border-bottom: 1px solid #E2E8F0; text-align: left; white-space: nowrap; }}
+        th {{ background: #F7FAFC; cursor: pointer; user-select: none; }}
+        th:hover {{ background: #EDF2F7; }}
+        tbody tr:hover {{ background: #FFFAF5; }}
+
+        .decision-badge {{ padding: 2px 8px; border-radius: 4px; color: white; font-size: 0.8rem; font-weight: 600; }}
+        .decision-badge.strong-screen {{ background: #10B981; }}
+        .decision-badge.screen {{ background: #CC7744; }}
+        .decision-badge.maybe {{ background: #F59E0B; }}
+        .decision-badge.no-screen {{ background: #EF4444; }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>{esc(title)}</h1>
+            <div class="meta">Generated {date_formatted} &middot; {board.seen} scanned &middot; {board.matched} matching &middot; average {board.average_total}/60 &middot; ranked by {esc(board.rank_by)} &middot; filters: {esc(_describe_filters(board))}</div>
+            <ul>{counts}</ul>
+        </div>
+        <div class="content">
+{sections}
+        </div>
+    </div>
+    <script>
+        // Click a column header to sort; click again to reverse
+        document.querySelectorAll('table.sortable th').forEach(function (th) {{
+            th.addEventListener('click', function () {{
+                var index = th.cellIndex;
+                var tbody = th.closest('table').querySelector('tbody');
+                var rows = Array.from(tbody.rows);
+                var ascending = th.dataset.order !== 'asc';
+                th.dataset.order = ascending ? 'asc' : 'desc';
+                rows.sort(function (a, b) {{
+                    var x = a.cells[index].innerText, y = b.cells[index].innerText;
+                    var nx = parseFloat(x), ny = parseFloat(y);
+                    var cmp = (!isNaN(nx) && !isNaN(ny)) ? nx - ny : x.localeCompare(y);
+                    return ascending ? cmp : -cmp;
+                }});
+                rows.forEach(function (row) {{ tbody.appendChild(row); }});
+            }});
+        }});
+    </script>
+</body>
+</html>
+"""
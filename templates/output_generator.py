@@ -6,9 +6,12 @@ Generates beautiful markdown and HTML reports
 from datetime import datetime
 from pathlib import Path
 
+from .similarity import merge_similar_items
+from .writer import write_text_atomic
 
-def generate_markdown(analysis, output_path):
-    """Generate markdown report"""
+
+def render_markdown(analysis):
+    """Render markdown report content"""
 
     candidate = analysis.get('candidate_name', 'Candidate')
     now = datetime.now()
@@ -262,13 +265,16 @@ This resume was analyzed using the **Applied AI PM Evaluation Framework** - an o
 *Analysis generated on {date_formatted}*
 """
 
-    # Write to file
-    with open(output_path, 'w') as f:
-        f.write(md_content)
+    return md_content
 
 
-def generate_html(analysis, output_path):
-    """Generate HTML report with beautiful CSS"""
+def generate_markdown(analysis, output_path):
+    """Write markdown report atomically"""
+    write_text_atomic(output_path, render_markdown(analysis))
+
+
+def render_html(analysis):
+    """Render HTML report content with beautiful CSS"""
 
     candidate = analysis.get('candidate_name', 'Candidate')
     now = datetime.now()
@@ -886,9 +892,32 @@ def generate_html(analysis, output_path):
 </html>
 """
 
-    # Write to file
-    with open(output_path, 'w') as f:
-        f.write(html_content)
+    return html_content
+
+
+def generate_html(analysis, output_path):
+    """Write HTML report atomically"""
+    write_text_atomic(output_path, render_html(analysis))
+
+
+def collect_provider_items(analyses, field):
+    """Flatten a list field from every provider analysis into (provider display name, item) pairs"""
+    tagged = []
+    for provider, analysis in analyses.items():
+        provider_display = analysis.get('_metadata', {}).get('model_display_name', provider.upper())
+        for item in analysis.get(field, []) or []:
+            tagged.append((provider_display, item))
+    return tagged
+
+
+def consensus_skipped(analyses):
+    """Provider calls skipped or failed in a --consensus run, as (provider label, note) pairs"""
+    for analysis in analyses.values():
+        consensus = analysis.get('_metadata', {}).get('consensus')
+        if consensus:
+            return ([(f"{s['provider'].upper()} {s['model']}", f"skipped, {s['reason']}") for s in consensus['skipped']]
+                    + [(f"{f['provider'].upper()} {f['model']}", f"failed: {f['error']}") for f in consensus['failed']])
+    return []
 
 
 def group_feedback_by_theme(feedback_items):
@@ -980,8 +1009,8 @@ def format_grouped_items_as_paragraph(items):
     return ' '.join(parts)
 
 
-def generate_aggregated_report(analyses, output_path):
-    """Generate aggregated report from multiple provider analyses"""
+def render_aggregated_report(analyses):
+    """Render aggregated markdown report from multiple provider analyses"""
 
     # Get candidate name from first analysis
     candidate = list(analyses.values())[0].get('candidate_name', 'Candidate')
@@ -1007,15 +1036,11 @@ def generate_aggregated_report(analyses, output_path):
     total_scores = {provider: a.get('total_score', 0) for provider, a in analyses.items()}
     avg_total = round(sum(total_scores.values()) / len(total_scores), 1)
 
-    # Get all strengths and concerns with provider labels
-    all_strengths = []
-    all_concerns = []
-    for provider, analysis in analyses.items():
-        provider_display = analysis.get('_metadata', {}).get('model_display_name', provider.upper())
-        for strength in analysis.get('top_strengths', []):
-            all_strengths.append(f"**[{provider_display}]** {strength}")
-        for concern in analysis.get('top_concerns', []):
-            all_concerns.append(f"**[{provider_display}]** {concern}")
+    # Get all strengths and concerns, merging near-duplicates and labelling each with every provider that raised it
+    all_strengths = [f"**[{', '.join(providers)}]** {strength}"
+                     for strength, providers in merge_similar_items(collect_provider_items(analyses, 'top_strengths'))]
+    all_concerns = [f"**[{', '.join(providers)}]** {concern}"
+                    for concern, providers in merge_similar_items(collect_provider_items(analyses, 'top_concerns'))]
 
     # Group by theme for readability
     grouped_strengths = group_feedback_by_theme(all_strengths)
@@ -1042,6 +1067,8 @@ This is an **aggregated deep analysis** using multiple AI providers to provide m
         score = analysis.get('total_score', 0)
         decision = analysis.get('decision', 'Unknown')
         md_content += f"- **{model_name}**: {score}/60 - {decision}\n"
+    for label, note in consensus_skipped(analyses):
+        md_content += f"- **{label}**: {note}\n"
 
     md_content += f"""
 **Consensus Total Score**: {avg_total}/60
@@ -1082,16 +1109,9 @@ This is an **aggregated deep analysis** using multiple AI providers to provide m
         paragraph = format_grouped_items_as_paragraph(items)
         md_content += f"{paragraph}\n\n"
 
-    # Aggregate suitable roles and interview focus areas
-    all_roles = set()
-    all_interview_areas = set()
-    for provider, analysis in analyses.items():
-        roles = analysis.get('suitable_roles', [])
-        if roles:
-            all_roles.update(roles)
-        areas = analysis.get('interview_focus_areas', [])
-        if areas:
-            all_interview_areas.update(areas)
+    # Aggregate suitable roles and interview focus areas (near-duplicates merged)
+    all_roles = merge_similar_items(collect_provider_items(analyses, 'suitable_roles'))
+    all_interview_areas = merge_similar_items(collect_provider_items(analyses, 'interview_focus_areas'))
 
     # Add Better Fit Roles section
     if all_roles:
@@ -1102,8 +1122,8 @@ This is an **aggregated deep analysis** using multiple AI providers to provide m
 Based on this candidate's profile across all provider analyses, they may be a better fit for:
 
 """
-        for role in sorted(all_roles):
-            md_content += f"- {role}\n"
+        for role, providers in sorted(all_roles):
+            md_content += f"- {role} *({', '.join(providers)})*\n"
         md_content += "\n"
 
     # Add Interview Focus Areas section
@@ -1115,8 +1135,8 @@ Based on this candidate's profile across all provider analyses, they may be a be
 If moving forward, probe these areas in depth:
 
 """
-        for area in sorted(all_interview_areas):
-            md_content += f"- {area}\n"
+        for area, providers in sorted(all_interview_areas):
+            md_content += f"- {area} *({', '.join(providers)})*\n"
         md_content += "\n"
 
     md_content += """
@@ -1211,13 +1231,16 @@ This report aggregates insights from multiple AI models to provide:
 *Deep analysis generated on {date_formatted}*
 """
 
-    # Write to file
-    with open(output_path, 'w') as f:
-        f.write(md_content)
+    return md_content
 
 
-def generate_aggregated_html(analyses, output_path):
-    """Generate aggregated HTML report from multiple provider analyses"""
+def generate_aggregated_report(analyses, output_path):
+    """Write aggregated markdown report atomically"""
+    write_text_atomic(output_path, render_aggregated_report(analyses))
+
+
+def render_aggregated_html(analyses):
+    """Render aggregated HTML report from multiple provider analyses"""
 
     # Get candidate name from first analysis
     candidate = list(analyses.values())[0].get('candidate_name', 'Candidate')
@@ -1327,15 +1350,11 @@ def generate_aggregated_html(analyses, output_path):
     consensus_building_public = any(all_building_public)
     consensus_resume_creativity = any(all_resume_creativity)
 
-    # Get all strengths and concerns with provider labels
-    all_strengths = []
-    all_concerns = []
-    for provider, analysis in analyses.items():
-        provider_display = analysis.get('_metadata', {}).get('model_display_name', provider.upper())
-        for strength in analysis.get('top_strengths', []):
-            all_strengths.append(f"<strong>[{provider_display}]</strong> {strength}")
-        for concern in analysis.get('top_concerns', []):
-            all_concerns.append(f"<strong>[{provider_display}]</strong> {concern}")
+    # Get all strengths and concerns, merging near-duplicates and labelling each with every provider that raised it
+    all_strengths = [f"<strong>[{', '.join(providers)}]</strong> {strength}"
+                     for strength, providers in merge_similar_items(collect_provider_items(analyses, 'top_strengths'))]
+    all_concerns = [f"<strong>[{', '.join(providers)}]</strong> {concern}"
+                    for concern, providers in merge_similar_items(collect_provider_items(analyses, 'top_concerns'))]
 
     # Group by theme for readability
     grouped_strengths = group_feedback_by_theme(all_strengths)
@@ -1348,6 +1367,8 @@ def generate_aggregated_html(analyses, output_path):
         score = analysis.get('total_score', 0)
         decision = analysis.get('decision', 'Unknown')
         provider_summary += f"<li><strong>{model_name}</strong>: {score}/60 - {decision}</li>\n"
+    for label, note in consensus_skipped(analyses):
+        provider_summary += f"<li><strong>{label}</strong>: <em>{note}</em></li>\n"
 
     # Build consensus table
     consensus_table_headers = ' | '.join([a.get('_metadata', {}).get('model_display_name', p) for p, a in analyses.items()])
@@ -1379,16 +1400,9 @@ def generate_aggregated_html(analyses, output_path):
         paragraph = format_grouped_items_as_paragraph(items)
         concerns_html += f"<p class='grouped-paragraph'>{paragraph}</p>\n"
 
-    # Aggregate suitable roles and interview focus areas for HTML
-    all_roles_html = set()
-    all_interview_areas_html = set()
-    for provider, analysis in analyses.items():
-        roles = analysis.get('suitable_roles', [])
-        if roles:
-            all_roles_html.update(roles)
-        areas = analysis.get('interview_focus_areas', [])
-        if areas:
-            all_interview_areas_html.update(areas)
+    # Aggregate suitable roles and interview focus areas for HTML (near-duplicates merged)
+    all_roles_html = merge_similar_items(collect_provider_items(analyses, 'suitable_roles'))
+    all_interview_areas_html = merge_similar_items(collect_provider_items(analyses, 'interview_focus_areas'))
 
     # Build Better Fit Roles HTML
     roles_html = ""
@@ -1396,8 +1410,8 @@ def generate_aggregated_html(analyses, output_path):
         roles_html = "<h2>Better Fit Roles</h2>\n"
         roles_html += "<p>Based on this candidate's profile across all provider analyses, they may be a better fit for:</p>\n"
         roles_html += "<div class='roles-list'>\n"
-        for role in sorted(all_roles_html):
-            roles_html += f"<div class='role-item'>{role}</div>\n"
+        for role, providers in sorted(all_roles_html):
+            roles_html += f"<div class='role-item'>{role} <small>({', '.join(providers)})</small></div>\n"
         roles_html += "</div>\n"
 
     # Build Interview Focus Areas HTML
@@ -1406,8 +1420,8 @@ def generate_aggregated_html(analyses, output_path):
         interview_html = "<h2>Interview Focus Areas</h2>\n"
         interview_html += "<p>If moving forward, probe these areas in depth:</p>\n"
         interview_html += "<ul class='sub-list'>\n"
-        for area in sorted(all_interview_areas_html):
-            interview_html += f"<li>{area}</li>\n"
+        for area, providers in sorted(all_interview_areas_html):
+            interview_html += f"<li>{area} <em>({', '.join(providers)})</em></li>\n"
         interview_html += "</ul>\n"
 
     # Build individual provider sections
@@ -1888,6 +1902,9 @@ def generate_aggregated_html(analyses, output_path):
 </html>
 """
 
-    # Write to file
-    with open(output_path, 'w') as f:
-        f.write(html_content)
+    return html_content
+
+
+def generate_aggregated_html(analyses, output_path):
+    """Write aggregated HTML report atomically"""
+    write_text_atomic(output_path, render_aggregated_html(analyses))
@@ -0,0 +1,206 @@
+"""
+Incremental report regeneration
+Re-renders markdown/HTML reports from stored analysis JSON (no LLM calls),
+skipping reports whose source JSON and templates are unchanged
+"""
+
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .writer import AtomicBatch, write_text_atomic
+
+
+MANIFEST_NAME = '.render_manifest.json'
+
+# Modules whose source determines report output
+TEMPLATE_MODULES = ['output_generator.py', 'similarity.py']
+
+_DEEP_JSON_RE = re.compile(r'^(?P<base>.+_DEEP_\d{8}_\d{6}(?:-\d+)?)_(?P<provider>openai|anthropic|google)\.json$')
+
+
+def template_fingerprint():
+    """Content hash of the report templates; any template edit changes it"""
+    digest = hashlib.sha256()
+    here = Path(__file__).parent
+    for name in TEMPLATE_MODULES:
+        digest.update(name.encode())
+        digest.update((here / name).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def discover_report_sets(directory, recursive=False):
+    """
+    Group analysis JSON files into report sets.
+
+    Returns {key: {'kind': 'single'|'deep', 'base': Path, 'sources': {provider_or_None: Path}}}
+    where ``base`` is the report path without extension. Deep-mode
+    ``*_DEEP_*_{provider}.json`` files are grouped into one aggregated set.
+    """
+    directory = Path(directory)
+    pattern = '**/*.json' if recursive else '*.json'
+    sets = {}
+    for path in sorted(directory.glob(pattern)):
+        if path.name.startswith('.'):
+            continue
+        deep = _DEEP_JSON_RE.match(path.name)
+        if deep:
+            base = path.with_name(deep.group('base'))
+            entry = sets.setdefault(str(base), {'kind': 'deep', 'base': base, 'sources': {}})
+            entry['sources'][deep.group('provider')] = path
+        else:
+            base = path.with_suffix('')
+            sets[str(base)] = {'kind': 'single', 'base': base, 'sources': {None: path}}
+    return sets
+
+
+def load_manifest(directory):
+    """Load the render manifest for ``directory`` (empty when missing or unreadable)"""
+    try:
+        with open(Path(directory) / MANIFEST_NAME) as f:
+            manifest = json.load(f)
+        if isinstance(manifest, dict) and isinstance(manifest.get('reports'), dict):
+            return manifest
+    except (OSError, ValueError):
+        pass
+    return {'reports': {}}
+
+
+def _source_stamps(report_set):
+    """mtime_ns of every source JSON in a report set"""
+    return {path.name: path.stat().st_mtime_ns for path in report_set['sources'].values()}
+
+
+def _output_paths(report_set, formats):
+    suffixes = []
+    if 'markdown' in formats:
+        suffixes.append('.md')
+    if 'html' in formats:
+        suffixes.append('.html')
+    base = report_set['base']
+    return [base.with_name(base.name + suffix) for suffix in suffixes]
+
+
+def _manifest_key(directory, report_set):
+    return report_set['base'].relative_to(directory).as_posix()
+
+
+def plan_rerender(directory, report_sets, manifest, fingerprint, formats, force=False):
+    """Return the keys of report sets whose outputs are stale or missing"""
+    stale = []
+    reports = manifest.get('reports', {})
+    for key, report_set in report_sets.items():
+        entry = reports.get(_manifest_key(directory, report_set))
+        if entry and entry.get('skipped') and not force:
+            # Not an analysis JSON; only look at it again if it changes
+            if entry.get('sources') != _source_stamps(report_set):
+                stale.append(key)
+            continue
+        if (force or not entry
+                or entry.get('template') != fingerprint
+                or entry.get('sources') != _source_stamps(report_set)
+                or not set(formats) <= set(entry.get('formats', []))
+                or not all(path.exists() for path in _output_paths(report_set, formats))):
+            stale.append(key)
+    return stale
+
+
+def render_report_set(kind, base, sources, formats):
+    """
+    Render one report set from its JSON sources (runs in a worker process).
+
+    Returns (base path, status) where status is 'rendered', 'skipped' (not an
+    analysis JSON) or an error message.
+    """
+    from .output_generator import (render_markdown, render_html,
+                                   render_aggregated_report, render_aggregated_html)
+    base = Path(base)
+    try:
+        analyses = {}
+        for provider, path in sources.items():
+            with open(path) as f:
+                analyses[provider] = json.load(f)
+        if not all(isinstance(a, dict) and 'pillars' in a for a in analyses.values()):
+            return str(base), 'skipped'
+
+        with AtomicBatch() as batch:
+            if kind == 'deep':
+                if 'markdown' in formats:
+                    batch.write_text(base.with_name(base.name + '.md'), render_aggregated_report(analyses))
+                if 'html' in formats:
+                    batch.write_text(base.with_name(base.name + '.html'), render_aggregated_html(analyses))
+            else:
+                analysis = analyses[None]
+                if 'markdown' in formats:
+                    batch.write_text(base.with_name(base.name + '.md'), render_markdown(analysis))
+                if 'html' in formats:
+                    batch.write_text(base.with_name(base.name + '.html'), render_html(analysis))
+        return str(base), 'rendered'
+    except Exception as e:
+        return str(base), f"error: {e}"
+
+
+def _render_task(args):
+    return render_report_set(*args)
+
+
+def rerender_directory(directory, formats=('markdown', 'html'), workers=None, force=False, recursive=False,
+                       dry_run=False):
+    """
+    Re-render stale reports under ``directory`` using a process pool.
+
+    Returns a dict with counts and per-report statuses. The manifest is kept
+    in ``directory`` and only updated for reports that rendered successfully.
+    """
+    directory = Path(directory)
+    fingerprint = template_fingerprint()
+    report_sets = discover_report_sets(directory, recursive=recursive)
+    manifest = load_manifest(directory)
+    stale = plan_rerender(directory, report_sets, manifest, fingerprint, formats, force=force)
+
+    summary = {'total': len(report_sets), 'stale': len(stale), 'rendered': 0, 'skipped': 0,
+               'errors': [], 'template': fingerprint}
+    if dry_run or not stale:
+        summary['up_to_date'] = len(report_sets) - len(stale)
+        summary['pending'] = [_manifest_key(directory, report_sets[key]) for key in stale]
+        return summary
+
+    tasks = []
+    stamps = {}
+    for key in stale:
+        report_set = report_sets[key]
+        stamps[str(report_set['base'])] = _source_stamps(report_set)
+        sources = {provider: str(path) for provider, path in report_set['sources'].items()}
+        tasks.append((report_set['kind'], str(report_set['base']), sources, list(formats)))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        results = map(_render_task, tasks)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_render_task, tasks, chunksize=max(1, len(tasks) // (workers * 8)))
+
+    reports = manifest.setdefault('reports', {})
+    try:
+        for base, status in results:
+            key = Path(base).relative_to(directory).as_posix()
+            if status == 'rendered':
+                summary['rendered'] += 1
+                reports[key] = {'template': fingerprint, 'sources': stamps[base], 'formats': sorted(formats)}
+            elif status == 'skipped':
+                summary['skipped'] += 1
+                # Not an analysis JSON - remember it so it is not re-read every run
+                reports[key] = {'sources': stamps[base], 'skipped': True}
+            else:
+                summary['errors'].append((key, status))
+    finally:
+        if workers != 1 and len(tasks) != 1:
+            executor.shutdown()
+        manifest['template'] = fingerprint
+        write_text_atomic(directory / MANIFEST_NAME, json.dumps(manifest, separators=(',', ':')))
+
+    summary['up_to_date'] = len(report_sets) - len(stale)
+    return summary
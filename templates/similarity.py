@@ -0,0 +1,171 @@
+"""
+Near-duplicate clustering for report feedback items
+Merges paraphrased strengths/concerns raised by several providers using
+word shingles, MinHash signatures and LSH banding (no external models)
+"""
+
+import re
+import zlib
+from collections import defaultdict
+
+
+# Words that carry no meaning for comparing short feedback bullets
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+    "in", "into", "is", "it", "its", "of", "on", "or", "that", "the", "their", "there",
+    "this", "to", "very", "was", "were", "while", "with", "candidate", "candidates",
+    "shows", "show", "showing", "demonstrates", "demonstrated", "evidence", "strong",
+    "clear", "clearly", "some", "any", "no", "not", "limited", "lack", "lacks"
+}
+
+# The common negations are in STOPWORDS above so they do not count toward
+# similarity, but items that differ only in polarity must never merge - see _polarity()
+NEGATIONS = {"no", "not", "lack", "lacks", "limited", "without", "missing", "absent"}
+
+# Default Jaccard similarity above which two items are considered the same point
+DEFAULT_THRESHOLD = 0.5
+
+# Below this many items an exact all-pairs comparison is faster than LSH
+EXACT_PAIRS_LIMIT = 64
+
+_TAG_RE = re.compile(r'^(?:\*\*|<strong>)?\[[^\]]+\](?:\*\*|</strong>)?\s*')
+_WORD_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def _stem(word):
+    """Very light suffix stripping so 'building'/'builds'/'build' compare equal"""
+    for suffix in ("ing", "ed", "ly", "es", "s"):
+        if word.endswith(suffix) and len(word) > len(suffix) + 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def shingle(text):
+    """Return the set of normalized content words for a feedback item"""
+    text = _TAG_RE.sub('', text.lower())
+    words = set()
+    for token in _WORD_RE.findall(text):
+        for part in token.split('-'):
+            if len(part) > 1 and part not in STOPWORDS:
+                words.add(_stem(part))
+    return frozenset(words)
+
+
+def _polarity(text):
+    """True when the item is phrased as an absence ("no public presence")"""
+    return any(word in NEGATIONS for word in _WORD_RE.findall(text.lower()))
+
+
+def jaccard(a, b):
+    """Jaccard similarity of two shingle sets (0.0 when either is empty: stopword-only items never merge)"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """MinHash signatures over shingle sets for sub-linear candidate search"""
+
+    def __init__(self, num_perm=64, seed=1):
+        self.num_perm = num_perm
+        # Deterministic (a, b) pairs for the universal hash family
+        state = seed
+        self._params = []
+        for _ in range(num_perm):
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            a = (state >> 3) % _MERSENNE_PRIME or 1
+            state = (state * 6364136223846793005 + 1442695040888963407) % (1 << 64)
+            b = (state >> 3) % _MERSENNE_PRIME
+            self._params.append((a, b))
+
+    def signature(self, shingles):
+        """Return the MinHash signature (tuple of ints) for a shingle set"""
+        if not shingles:
+            return tuple([_MERSENNE_PRIME] * self.num_perm)
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in shingles]
+        return tuple(
+            min((a * h + b) % _MERSENNE_PRIME for h in hashes)
+            for a, b in self._params
+        )
+
+
+def lsh_candidate_pairs(signatures, bands=16):
+    """Yield index pairs whose signatures collide in at least one LSH band"""
+    if not signatures:
+        return set()
+    rows = len(signatures[0]) // bands
+    pairs = set()
+    for band in range(bands):
+        buckets = defaultdict(list)
+        start = band * rows
+        for idx, sig in enumerate(signatures):
+            buckets[sig[start:start + rows]].append(idx)
+        for members in buckets.values():
+            if len(members) > 1:
+                for i, left in enumerate(members):
+                    for right in members[i + 1:]:
+                        pairs.add((left, right))
+    return pairs
+
+
+def cluster_texts(texts, threshold=DEFAULT_THRESHOLD, hasher=None):
+    """
+    Group near-duplicate texts together.
+
+    Returns a list of clusters, each a list of indices into ``texts`` in input
+    order. Small inputs are compared exhaustively; large inputs (e.g. every
+    concern across a whole requisition) use MinHash + LSH to find candidate
+    pairs, which are then verified with exact Jaccard similarity.
+    """
+    shingles = [shingle(t) for t in texts]
+    polarity = [_polarity(t) for t in texts]
+
+    if len(texts) <= EXACT_PAIRS_LIMIT:
+        pairs = ((i, j) for i in range(len(texts)) for j in range(i + 1, len(texts)))
+    else:
+        hasher = hasher or MinHasher()
+        pairs = lsh_candidate_pairs([hasher.signature(s) for s in shingles])
+
+    parent = list(range(len(texts)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in pairs:
+        if polarity[i] != polarity[j]:
+            continue
+        if jaccard(shingles[i], shingles[j]) >= threshold:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    clusters = defaultdict(list)
+    for idx in range(len(texts)):
+        clusters[find(idx)].append(idx)
+    return sorted(clusters.values(), key=lambda members: members[0])
+
+
+def merge_similar_items(tagged_items, threshold=DEFAULT_THRESHOLD):
+    """
+    Merge equivalent feedback items raised by different sources.
+
+    Input: [("GPT-5", "Strong hands-on AI building"), ("Claude", "Hands-on AI builder"), ...]
+    Output: [("Strong hands-on AI building", ["GPT-5", "Claude"]), ...]
+
+    The first item of each cluster is kept as the representative text, and every
+    source that raised an equivalent point is listed once, in first-seen order.
+    """
+    texts = [text for _, text in tagged_items]
+    merged = []
+    for members in cluster_texts(texts, threshold):
+        sources = []
+        for idx in members:
+            source = tagged_items[idx][0]
+            if source not in sources:
+                sources.append(source)
+        merged.append((texts[members[0]], sources))
+    return merged
@@ -0,0 +1,301 @@
+"""
+Report writing helpers
+Crash-safe (temp file + rename) output, batched fsyncs and a thread-pool
+rendering stage for batch runs
+"""
+
+import json
+import os
+import re
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+
+# Number of published files to fsync together
+DEFAULT_FSYNC_BATCH = 32
+
+_reserved_lock = threading.Lock()
+# Names already in each output folder, listed once per process (see reserve_base_filename)
+_existing_stems = {}
+
+
+def dump_json(data, compact=False):
+    """Serialize an analysis to JSON text (indented by default, compact on request)"""
+    if compact:
+        return json.dumps(data, separators=(',', ':'))
+    return json.dumps(data, indent=2)
+
+
+def _fsync_path(path, directory=False):
+    """fsync a file or directory by path (directory fsync is a no-op where unsupported)"""
+    flags = os.O_RDONLY
+    if directory:
+        flags |= getattr(os, 'O_DIRECTORY', 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        if directory:
+            return
+        raise
+    try:
+        os.fsync(fd)
+    except OSError:
+        if not directory:
+            raise
+    finally:
+        os.close(fd)
+
+
+class AtomicBatch:
+    """
+    Stage output files next to their destination and publish them atomically.
+
+    Each file is written to a hidden temp file in the destination folder. On
+    commit every staged file is fsynced, renamed over its final path and each
+    touched directory is fsynced once, so readers only ever see complete files
+    and a batch of N reports costs N + (number of folders) fsyncs, not 2N.
+    """
+
+    def __init__(self):
+        self._staged = []
+        self._lock = threading.Lock()
+
+    def write_text(self, path, content):
+        """Stage text content for ``path``"""
+        path = Path(path)
+        while True:
+            tmp_path = str(path.parent / f".{path.name}.{secrets.token_hex(4)}.tmp")
+            try:
+                # Created like any other file, so the published report gets the usual umask-based mode
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+                break
+            except FileExistsError:
+                continue
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._staged.append((tmp_path, path))
+        return path
+
+    def write_json(self, path, data, compact=False):
+        """Stage an analysis dict as JSON for ``path``"""
+        return self.write_text(path, dump_json(data, compact))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._staged)
+
+    def commit(self):
+        """fsync and rename every staged file into place; returns the published paths"""
+        with self._lock:
+            staged, self._staged = self._staged, []
+
+        for tmp_path, _ in staged:
+            _fsync_path(tmp_path)
+
+        directories = set()
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+            directories.add(str(path.parent))
+
+        for directory in directories:
+            _fsync_path(directory, directory=True)
+
+        return [path for _, path in staged]
+
+    def publish(self):
+        """Rename every staged file into place without fsyncing (sync_paths() makes them durable); returns the paths"""
+        with self._lock:
+            staged, self._staged = self._staged, []
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+        return [path for _, path in staged]
+
+    def abort(self):
+        """Discard staged temp files without touching the destination paths"""
+        with self._lock:
+            staged, self._staged = self._staged, []
+        for tmp_path, _ in staged:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+def sync_paths(paths):
+    """fsync published files, then each of their folders once"""
+    for path in paths:
+        _fsync_path(path)
+    for directory in {str(Path(path).parent) for path in paths}:
+        _fsync_path(directory, directory=True)
+
+
+def write_text_atomic(path, content):
+    """Write a single file atomically (temp file + fsync + rename)"""
+    with AtomicBatch() as batch:
+        batch.write_text(path, content)
+    return Path(path)
+
+
+def write_json_atomic(path, data, compact=False):
+    """Write a single JSON file atomically"""
+    return write_text_atomic(path, dump_json(data, compact))
+
+
+def safe_filename_part(name, default='Candidate'):
+    """Turn an LLM-returned candidate name into a safe filename component"""
+    name = re.sub(r'\s+', '_', str(name or '').strip())
+    name = re.sub(r'[^\w.-]', '', name).strip('._')
+    return name[:80] or default
+
+
+def reserve_base_filename(output_dir, candidate_name, infix='', timestamp=None):
+    """
+    Return a base filename ``{candidate}[_{infix}]_{timestamp}`` that is unique in ``output_dir``.
+
+    Two candidates with the same name analyzed within the same second used to
+    overwrite each other's reports; clashes now get a numeric suffix. A base is
+    claimed on disk with an O_EXCL hidden marker (``.{base}.reserved``), so
+    workers and other processes writing to the same folder never hand out the
+    same one; the folder listing is only read once, for reports written
+    before markers existed.
+    """
+    output_dir = Path(output_dir)
+    timestamp = timestamp or datetime.now().strftime('%Y%m%d_%H%M%S')
+    stem = safe_filename_part(candidate_name)
+    if infix:
+        stem = f"{stem}_{infix}"
+    base = f"{stem}_{timestamp}"
+
+    with _reserved_lock:
+        existing = _existing_stems.get(str(output_dir))
+        if existing is None:
+            existing = _existing_stems[str(output_dir)] = _list_stems(output_dir)
+        counter = 1
+        candidate = base
+        while candidate in existing or not _claim(output_dir, candidate):
+            counter += 1
+            candidate = f"{base}-{counter}"
+        existing.add(candidate)
+    return candidate
+
+
+def _claim(output_dir, base):
+    """Create ``base``'s hidden marker in ``output_dir``; False when another writer already holds the name"""
+    try:
+        fd = os.open(str(output_dir / f".{base}.reserved"), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    except FileExistsError:
+        return False
+    os.close(fd)
+    return True
+
+
+def _list_stems(output_dir):
+    """Bases taken in ``output_dir``: ``{base}.*`` files and ``{base}_{provider}.json`` deep-mode files"""
+    stems = set()
+    try:
+        names = os.listdir(output_dir)
+    except OSError:
+        return stems
+    for name in names:
+        if name.startswith('.') or '.' not in name:
+            continue
+        stem, suffix = name.rsplit('.', 1)
+        stems.add(stem)
+        if suffix == 'json' and '_' in stem:
+            stems.add(stem.rsplit('_', 1)[0])
+    return stems
+
+
+class ReportRenderer:
+    """
+    Rendering stage for batch runs.
+
+    Render callables are executed on a thread pool as soon as they are
+    submitted; each finished file is published (temp file + rename) right
+    away, so an interrupted batch keeps every report rendered so far. Only
+    the fsyncs are batched: every ``fsync_batch`` files and when the stage
+    closes.
+    """
+
+    def __init__(self, workers=4, compact_json=False, fsync_batch=DEFAULT_FSYNC_BATCH, profiler=None):
+        self.compact_json = compact_json
+        self.profiler = profiler
+        self.fsync_batch = max(1, fsync_batch)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='render')
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._unsynced = []
+        self._futures = []
+        self.published = []
+        self.errors = []
+
+    def submit(self, path, render, *args):
+        """Queue ``render(*args)`` (returning the file content) to be written to ``path``"""
+        if self.profiler:
+            render = self.profiler.wrap('render', render)
+        future = self._executor.submit(self._render_one, Path(path), render, args)
+        self._futures.append(future)
+        return future
+
+    def submit_json(self, path, data):
+        """Queue an analysis dict to be written as JSON"""
+        return self.submit(path, dump_json, data, self.compact_json)
+
+    def _render_one(self, path, render, args):
+        batch = AtomicBatch()
+        try:
+            batch.write_text(path, render(*args))
+        except Exception as e:
+            self.errors.append((path, e))
+            raise
+        published = batch.publish()
+        with self._lock:
+            self.published.extend(published)
+            self._unsynced.extend(published)
+            due = len(self._unsynced) >= self.fsync_batch
+        if due:
+            self.flush()
+        return path
+
+    def flush(self):
+        """fsync everything published so far"""
+        with self._flush_lock:
+            with self._lock:
+                unsynced, self._unsynced = self._unsynced, []
+            sync_paths(unsynced)
+
+    def close(self):
+        """Wait for all queued renders, fsync them and shut the pool down"""
+        for future in self._futures:
+            try:
+                future.result()
+            except Exception:
+                pass  # recorded in self.errors
+        self._executor.shutdown(wait=True)
+        self.flush()
+        return self.published
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,81 @@
+"""Cascade prefilter decisions (pipeline/cascade.py)"""
+
+import pytest
+
+from pipeline.cascade import CascadeAnalyzer, screening_verdict
+
+
+def screen(score, all_met=True, red_flags=(), confidence=0.9, pillar_key='pillar_3'):
+    return {
+        'candidate_name': 'Ada',
+        'minimum_thresholds_met': {'all_met': all_met, 'shipped_ai_product': all_met},
+        'red_flags_found': list(red_flags),
+        pillar_key: {'score': score, 'evidence': 'Built an eval harness'},
+        'estimated_total_score': 20,
+        'confidence': confidence,
+    }
+
+
+@pytest.mark.parametrize('reply, escalate, reason', [
+    (screen(8), True, 'clears minimum thresholds and Pillar 3'),
+    (screen(5), True, 'borderline Pillar 3 (5)'),
+    (screen(8, confidence=0.4), True, 'prefilter uncertain (confidence 0.4)'),
+    (screen(None), True, 'prefilter returned no Pillar 3 score'),
+    (screen(3), False, 'Pillar 3 3/10'),
+    (screen(8, all_met=False, red_flags=['Only corporate AI']), False, 'missing shipped ai product; 1 red flag(s)'),
+])
+def test_screening_verdict(reply, escalate, reason):
+    assert screening_verdict(reply, 'pillar_3') == (escalate, reason)
+
+
+class FakeScreener:
+    api_provider = 'openai'
+    model = 'gpt-5-mini'
+    # A framework whose non-negotiable pillar is not pillar_3
+    NON_NEGOTIABLE_PILLAR = 'pillar_1'
+    FRAMEWORK_PILLARS = {'pillar_1': {'name': 'Shipping (NON-NEGOTIABLE)'}}
+
+    def __init__(self, reply):
+        self.reply = reply
+
+    def screen_text(self, resume_text, stats=None):
+        return {**self.reply, '_metadata': {'provider': 'openai', 'model': self.model,
+                                            'model_display_name': 'GPT-5 Mini'}}
+
+
+class FakeAnalyzer:
+    api_provider = 'openai'
+    model = 'gpt-5'
+    pricing = {'input': 1.25, 'output': 10.0}
+
+    def __init__(self):
+        self.calls = 0
+
+    def create_analysis_prompt(self, resume_text):
+        return resume_text * 10
+
+    def analyze_text(self, resume_text, stats=None):
+        self.calls += 1
+        return {'decision': 'Screen', '_metadata': {'provider': 'openai'}}
+
+
+def test_screened_out_report_uses_the_framework_pillar():
+    analyzer = FakeAnalyzer()
+    cascade = CascadeAnalyzer(FakeScreener(screen(2, pillar_key='pillar_1')), analyzer)
+    analysis = cascade.analyze('resume.pdf', resume_text='resume text')
+
+    assert analyzer.calls == 0
+    assert analysis['decision'] == 'No Screen'
+    assert analysis['pillars'] == {'pillar_1': {'name': 'Shipping (NON-NEGOTIABLE)', 'score': 2,
+                                                'evidence': 'Built an eval harness', 'strengths': [], 'gaps': []}}
+    assert analysis['_metadata']['cascade']['reason'] == 'Pillar 1 2/10'
+    assert analysis['_metadata']['cascade']['avoided_cost_est_usd'] > 0
+
+
+def test_passing_candidate_gets_the_full_evaluation():
+    analyzer = FakeAnalyzer()
+    analysis = CascadeAnalyzer(FakeScreener(screen(9, pillar_key='pillar_1')), analyzer).analyze(
+        'resume.pdf', resume_text='resume text')
+
+    assert analyzer.calls == 1
+    assert analysis['_metadata']['cascade']['escalated'] is True
@@ -0,0 +1,61 @@
+"""Compact wire format round trip (pipeline/compact.py)"""
+
+from pipeline.compact import compact_analysis, expand_analysis
+from pipeline.schema import analysis_schema, compact_analysis_schema, validate
+
+
+PILLAR_NAMES = {f'pillar_{n}': f'Pillar {n}' for n in range(1, 7)}
+
+
+def full_analysis():
+    pillars = {key: {'name': name, 'score': 4 + index, 'level': 'Proficient', 'evidence': f'Evidence {index}',
+                     'strengths': [f'Strength {index}'], 'gaps': [f'Gap {index}']}
+               for index, (key, name) in enumerate(PILLAR_NAMES.items())}
+    return {
+        'candidate_name': 'Ada Lovelace',
+        'minimum_thresholds_met': {'personal_ai_projects': True, 'building_in_public': True,
+                                   'resume_creativity': False, 'all_met': False},
+        'red_flags_found': [],
+        'yellow_flags_found': ['No links or verifiable work products'],
+        'critical_questions_analysis': {'paradigm_shift_examples': ['Agentic triage'],
+                                        'future_proofing_examples': [], 'magic_wand_examples': []},
+        'pillars': pillars,
+        'must_have_signals': {'signals_found': ['Personal AI project'], 'signals_missing': ['Evals'],
+                              'all_present': False},
+        'differentiation_signals': {'signals_found': ['Ships weekly', 'Open source', 'Talks'], 'count': 3,
+                                    'sufficient_for_strong_screen': True},
+        'total_score': sum(pillar['score'] for pillar in pillars.values()),
+        'decision': 'Screen',
+        'decision_rationale': 'Solid builder.',
+        'top_strengths': ['Builds fast'],
+        'top_concerns': ['Few evals'],
+        'recommendation': 'Interview.',
+        'suitable_roles': ['AI Product Manager'],
+        'interview_focus_areas': ['Evaluation strategy'],
+        'design_evaluation': {'score': 6, 'comments': 'Clean layout'},
+    }
+
+
+def test_round_trip_restores_the_full_analysis():
+    analysis = full_analysis()
+    assert expand_analysis(compact_analysis(analysis), PILLAR_NAMES) == analysis
+
+
+def test_compact_reply_matches_its_schema_and_expands_to_a_valid_analysis():
+    analysis = full_analysis()
+    reply = compact_analysis(analysis)
+    assert validate(reply, compact_analysis_schema(list(PILLAR_NAMES), design=True)) == []
+    assert validate(expand_analysis(reply, PILLAR_NAMES), analysis_schema(PILLAR_NAMES, design=True)) == []
+
+
+def test_expand_derives_totals_and_flags():
+    reply = compact_analysis(full_analysis())
+    reply['t']['cre'] = True
+    reply['mh']['m'] = []
+    reply['ds'] = ['Ships weekly']
+    analysis = expand_analysis(reply, PILLAR_NAMES)
+    assert analysis['minimum_thresholds_met']['all_met'] is True
+    assert analysis['must_have_signals']['all_present'] is True
+    assert analysis['differentiation_signals'] == {'signals_found': ['Ships weekly'], 'count': 1,
+                                                   'sufficient_for_strong_screen': False}
+    assert analysis['total_score'] == 39
@@ -0,0 +1,72 @@
+"""Consensus deep analysis early exit (pipeline/consensus.py)"""
+
+import pytest
+
+from pipeline.consensus import ConsensusRunner, agrees, summarize_consensus
+
+
+MODELS = {
+    'openai': {'gpt-5': {'pricing': {'input': 1.25, 'output': 10.0}}},
+    'google': {'gemini-2.5-pro': {'pricing': {'input': 1.25, 'output': 12.0}}},
+    'anthropic': {'claude-sonnet-4-5-20250929': {'pricing': {'input': 3.0, 'output': 15.0}}},
+}
+DEFAULTS = {provider: next(iter(models)) for provider, models in MODELS.items()}
+
+
+class FakeAnalyzer:
+    def __init__(self, provider, reply, calls):
+        self.provider = provider
+        self.reply = reply
+        self.calls = calls
+
+    def create_analysis_prompt(self, resume_text):
+        return resume_text
+
+    def analyze_text(self, resume_text, resume_image=None, stats=None):
+        self.calls.append(self.provider)
+        if isinstance(self.reply, Exception):
+            raise self.reply
+        return {**self.reply, '_metadata': {'provider': self.provider}}
+
+
+def run(replies):
+    calls = []
+    runner = ConsensusRunner(['anthropic', 'google', 'openai'],
+                             lambda provider: FakeAnalyzer(provider, replies[provider], calls), MODELS, DEFAULTS)
+    return runner.analyze('resume.txt', resume_text='resume text'), calls
+
+
+@pytest.mark.parametrize('first, second, agreed', [
+    ({'decision': 'Screen', 'total_score': 40}, {'decision': 'Screen', 'total_score': 45}, True),
+    ({'decision': 'Screen', 'total_score': 40}, {'decision': 'Screen', 'total_score': 46}, False),
+    ({'decision': 'Screen', 'total_score': 40}, {'decision': 'Maybe', 'total_score': 40}, False),
+    ({'decision': 'Screen', 'total_score': None}, {'decision': 'Screen', 'total_score': 40}, False),
+])
+def test_agrees(first, second, agreed):
+    assert agrees(first, second) is agreed
+
+
+def test_cheapest_two_agree_and_the_rest_are_skipped():
+    analyses, calls = run({'openai': {'decision': 'Screen', 'total_score': 40},
+                           'google': {'decision': 'Screen', 'total_score': 43},
+                           'anthropic': {'decision': 'Maybe', 'total_score': 30}})
+
+    assert calls == ['openai', 'google']
+    consensus = analyses['openai']['_metadata']['consensus']
+    assert consensus['order'] == ['openai', 'google', 'anthropic']
+    assert consensus['agreed'] == ['openai', 'google']
+    assert [s['provider'] for s in consensus['skipped']] == ['anthropic']
+    summary = summarize_consensus([analyses])
+    assert (summary['agreed'], summary['skipped_calls']) == (1, 1)
+    assert summary['skipped_cost_est_usd'] > 0
+
+
+def test_disagreement_and_failures_query_every_provider():
+    analyses, calls = run({'openai': {'decision': 'Screen', 'total_score': 40},
+                           'google': RuntimeError('quota exceeded'),
+                           'anthropic': {'decision': 'No Screen', 'total_score': 18}})
+
+    assert calls == ['openai', 'google', 'anthropic']
+    consensus = analyses['anthropic']['_metadata']['consensus']
+    assert consensus['agreed'] is None and consensus['skipped'] == []
+    assert [f['provider'] for f in consensus['failed']] == ['google']
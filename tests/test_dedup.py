@@ -0,0 +1,51 @@
+"""Batch duplicate detection (pipeline/dedup.py)"""
+
+from pipeline.dedup import find_duplicates
+
+
+WORDS = ('Built an agentic support triage tool with retrieval augmented generation and shipped '
+         'it to three hundred customers in six weeks while leading evaluation design and prompt '
+         'iteration for the payments team at a fintech startup in Berlin ').split()
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return path
+
+
+def read(path):
+    return path.read_text()
+
+
+def test_exact_file_same_text_and_near_duplicate(tmp_path):
+    text = ' '.join(WORDS * 4)
+    original = write(tmp_path, 'original.txt', text)
+    copy = write(tmp_path, 'copy.txt', text)
+    reflowed = write(tmp_path, 'reflowed.txt', text.upper().replace(' ', '\n'))
+    edited = write(tmp_path, 'edited.txt', text + ' Also mentors junior PMs.')
+    other = write(tmp_path, 'other.txt', ' '.join(reversed(WORDS)) * 4)
+
+    texts, duplicates = find_duplicates([original, copy, reflowed, edited, other], read)
+
+    assert duplicates[copy] == {'canonical': original, 'match': 'exact file', 'similarity': 1.0}
+    assert duplicates[reflowed] == {'canonical': original, 'match': 'same text', 'similarity': 1.0}
+    assert duplicates[edited]['canonical'] == original
+    assert duplicates[edited]['match'] == 'near-duplicate text'
+    assert 0.9 <= duplicates[edited]['similarity'] < 1
+    assert original not in duplicates and other not in duplicates
+    assert texts[copy] == text
+
+
+def test_failed_extraction_is_not_a_duplicate(tmp_path):
+    first = write(tmp_path, 'a.txt', 'first resume')
+    second = write(tmp_path, 'b.txt', 'second resume')
+
+    def extract(path):
+        if path == second:
+            raise ValueError('unreadable')
+        return read(path)
+
+    texts, duplicates = find_duplicates([first, second], extract)
+    assert duplicates == {}
+    assert texts[second] is None
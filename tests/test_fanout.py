@@ -0,0 +1,82 @@
+"""Pillar fan-out merge (pipeline/fanout.py)"""
+
+import threading
+
+import pytest
+
+from pipeline.fanout import FanoutAnalyzer, parse_part_models
+
+
+PILLARS = {'pillar_1': {'name': 'Technical'}, 'pillar_2': {'name': 'Product'},
+           'pillar_3': {'name': 'AI Depth (NON-NEGOTIABLE)'}}
+SCORES = {'pillar_1': 7, 'pillar_2': 6.5, 'pillar_3': 8}
+
+
+class FakeAnalyzer:
+    FRAMEWORK_PILLARS = PILLARS
+    SCREENING_MODELS = {'openai': 'gpt-5-mini'}
+    AVAILABLE_MODELS = {'openai': {'gpt-5': {'name': 'GPT-5'}}}
+    api_provider = 'openai'
+    model = 'gpt-5'
+    speed = None
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def create_pillar_prompt(self, resume_text, pillar_key):
+        return pillar_key
+
+    def create_flags_prompt(self, resume_text):
+        return 'flags'
+
+    def create_synthesis_prompt(self, checks, pillars, total):
+        self.synthesis_input = (checks, pillars, total)
+        return 'synthesis'
+
+    def framework_metadata(self):
+        return {'id': 'ai_pm'}
+
+    def _complete_json(self, prompt, stats=None, schema=None, model=None):
+        with self.lock:
+            self.calls.append((prompt, model))
+        if prompt in SCORES:
+            return {'score': SCORES[prompt], 'evidence': f"{prompt} evidence", 'strengths': [], 'gaps': []}
+        if prompt == 'flags':
+            return {'candidate_name': 'Ada', 'minimum_thresholds_met': {'all_met': True}, 'red_flags_found': [],
+                    'yellow_flags_found': ['Short tenure'], 'critical_questions_analysis': {},
+                    'must_have_signals': {}, 'differentiation_signals': {}}
+        return {'decision': 'Screen', 'decision_rationale': 'Solid builder'}
+
+
+def test_parts_merge_into_one_analysis():
+    analyzer = FakeAnalyzer()
+    analysis = FanoutAnalyzer(analyzer, models={'pillar_3': 'gpt-5-pro'}).analyze_text('resume text')
+
+    assert analysis['candidate_name'] == 'Ada'
+    assert analysis['pillars']['pillar_3'] == {'name': 'AI Depth (NON-NEGOTIABLE)', 'score': 8,
+                                               'evidence': 'pillar_3 evidence', 'strengths': [], 'gaps': []}
+    assert analysis['total_score'] == 21.5
+    assert (analysis['decision'], analysis['yellow_flags_found']) == ('Screen', ['Short tenure'])
+    # The synthesis sees the merged checks and pillars, on the screening model by default
+    checks, pillars, total = analyzer.synthesis_input
+    assert (checks['candidate_name'], list(pillars), total) == ('Ada', list(PILLARS), 21.5)
+    assert sorted(analyzer.calls) == [('flags', 'gpt-5'), ('pillar_1', 'gpt-5'), ('pillar_2', 'gpt-5'),
+                                      ('pillar_3', 'gpt-5-pro'), ('synthesis', 'gpt-5-mini')]
+    fanout = analysis['_metadata']['fanout']
+    assert [call['part'] for call in fanout['calls']][-1] == 'synthesis'
+    assert len(fanout['calls']) == 5
+
+
+def test_whole_scores_stay_integers(monkeypatch):
+    monkeypatch.setitem(SCORES, 'pillar_2', 6)
+    assert FanoutAnalyzer(FakeAnalyzer()).analyze_text('resume text')['total_score'] == 21
+
+
+def test_parse_part_models():
+    assert parse_part_models(['pillar_3=gpt-5', 'synthesis = gpt-5-mini'], PILLARS, ['gpt-5', 'gpt-5-mini']) == {
+        'pillar_3': 'gpt-5', 'synthesis': 'gpt-5-mini'}
+    with pytest.raises(ValueError, match='unknown fan-out part'):
+        parse_part_models(['pillar_9=gpt-5'], PILLARS, ['gpt-5'])
+    with pytest.raises(ValueError, match='unknown model'):
+        parse_part_models(['flags=gpt-6'], PILLARS, ['gpt-5'])
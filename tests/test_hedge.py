@@ -0,0 +1,76 @@
+"""Hedged request winner selection (pipeline/hedge.py)"""
+
+import threading
+
+import pytest
+
+from pipeline import hedge
+from pipeline.hedge import HedgedAnalyzer
+
+
+class FakeAnalyzer:
+    AVAILABLE_MODELS = {
+        'openai': {'gpt-5': {'pricing': {'input': 1.25, 'output': 10.0}}},
+        'anthropic': {'claude-haiku-4-5': {'pricing': {'input': 1.0, 'output': 5.0}}},
+    }
+
+    def __init__(self, provider, model, release=None, error=None):
+        self.api_provider = provider
+        self.model = model
+        self.release = release
+        self.error = error
+        self.recorded = []
+
+    def create_analysis_prompt(self, resume_text):
+        return resume_text
+
+    def analyze_text(self, resume_text, resume_image=None, stats=None, record=True):
+        self.recorded.append(record)
+        if self.release is not None:
+            self.release.wait(5)
+        if self.error:
+            raise self.error
+        return {'decision': 'Screen', '_metadata': {'provider': self.api_provider, 'model': self.model}}
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    calls = []
+    monkeypatch.setattr(hedge.telemetry, 'record_analysis', calls.append)
+    return calls
+
+
+def test_fast_primary_is_not_hedged(recorded):
+    primary, secondary = FakeAnalyzer('openai', 'gpt-5'), FakeAnalyzer('anthropic', 'claude-haiku-4-5')
+    analysis = HedgedAnalyzer(primary, secondary, hedge_after=5).analyze('resume.pdf', resume_text='resume')
+
+    assert analysis['_metadata']['hedge']['hedged'] is False
+    assert secondary.recorded == []
+    assert [m['model'] for m in recorded] == ['gpt-5']
+
+
+def test_slow_primary_loses_and_only_the_winner_is_recorded(recorded):
+    release = threading.Event()
+    primary = FakeAnalyzer('openai', 'gpt-5', release=release)
+    secondary = FakeAnalyzer('anthropic', 'claude-haiku-4-5')
+    try:
+        analysis = HedgedAnalyzer(primary, secondary, hedge_after=0.05).analyze('resume.pdf', resume_text='resume')
+    finally:
+        release.set()
+
+    meta = analysis['_metadata']
+    assert meta['model'] == 'claude-haiku-4-5'
+    assert meta['hedge']['winner'] == 'secondary'
+    assert meta['hedge']['extra_cost_est_usd'] > 0
+    assert primary.recorded == secondary.recorded == [False]
+    assert [m['model'] for m in recorded] == ['claude-haiku-4-5']
+
+
+def test_primary_error_hedges_immediately(recorded):
+    primary = FakeAnalyzer('openai', 'gpt-5', error=RuntimeError('overloaded'))
+    secondary = FakeAnalyzer('anthropic', 'claude-haiku-4-5')
+    hedge_info = HedgedAnalyzer(primary, secondary, hedge_after=30).analyze(
+        'resume.pdf', resume_text='resume')['_metadata']['hedge']
+
+    assert (hedge_info['winner'], hedge_info['loser_error']) == ('secondary', 'overloaded')
+    assert hedge_info['reason'] == 'primary failed: overloaded'
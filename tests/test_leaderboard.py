@@ -0,0 +1,71 @@
+"""Leaderboard ordering and deep-analysis merging (templates/leaderboard.py)"""
+
+import json
+
+from pipeline.store import ResultsStore
+from templates.leaderboard import Leaderboard, iter_json_summaries, iter_store_summaries
+
+
+def analysis(name, total, decision='Screen', provider='openai'):
+    return {
+        'candidate_name': name,
+        'decision': decision,
+        'total_score': total,
+        'pillars': {'pillar_3': {'score': total / 6, 'level': 'Advanced'}},
+        'red_flags_found': [],
+        '_metadata': {'provider': provider, 'model': provider, 'model_display_name': provider},
+    }
+
+
+DEEP = {'anthropic': analysis('Dee', 50, 'Strong Screen', 'anthropic'),
+        'google': analysis('Dee', 40, 'Screen', 'google'),
+        'openai': analysis('Dee', 45, 'Strong Screen', 'openai')}
+
+
+def row(name, total, decision='Screen'):
+    return {'candidate_name': name, 'decision': decision, 'total': total, 'weighted': None,
+            'pillar_3': None, 'red_flags': 0, 'model': '', 'source': ''}
+
+
+def test_buckets_are_ranked_best_first_and_capped():
+    board = Leaderboard(k=2).extend([row('A', 30), row('B', 45), row('C', 20, 'No Screen'), row('D', 40),
+                                     row('E', 45)])
+    assert [(name, [r['candidate_name'] for r in rows]) for name, rows in board.buckets()] == [
+        ('Screen', ['B', 'E']), ('No Screen', ['C'])]
+    assert board.seen == board.matched == 5
+
+
+def write_reports(folder):
+    folder.mkdir()
+    for prov, data in DEEP.items():
+        (folder / f'Dee_DEEP_20261019_120000_{prov}.json').write_text(json.dumps(data))
+    (folder / 'Ann_20261019_120000.json').write_text(json.dumps(analysis('Ann', 42)))
+    (folder / 'Zed_20261019_120000.json').write_text(json.dumps(analysis('Zed', 30)))
+    return folder
+
+
+def test_json_deep_reports_merge_into_one_row(tmp_path):
+    folder = write_reports(tmp_path / 'out')
+    rows = list(iter_json_summaries(sorted(folder.glob('*.json'))))
+
+    assert [r['candidate_name'] for r in rows] == ['Ann', 'Dee', 'Zed']
+    dee = rows[1]
+    assert (dee['total'], dee['decision']) == (45.0, 'Strong Screen')
+    assert dee['model'] == 'anthropic, google, openai'
+
+
+def test_store_deep_rows_match_json(tmp_path):
+    folder = write_reports(tmp_path / 'out')
+    with ResultsStore(tmp_path / 'results.db') as store:
+        store.add_analysis(analysis('Ann', 42), json_path=folder / 'Ann_20261019_120000.json')
+        # Interleave another candidate between the providers: SQL ordering must still group them
+        for prov, data in DEEP.items():
+            store.add_analysis(data, json_path=folder / f'Dee_DEEP_20261019_120000_{prov}.json', mode='deep')
+            store.add_analysis(analysis('Zed', 30), json_path=folder / f'Zed_{prov}.json')
+        from_store = list(iter_store_summaries(store.iter_rows()))
+
+    from_json = list(iter_json_summaries(sorted(folder.glob('*.json'))))
+    dee = [r for r in from_store if r['candidate_name'] == 'Dee']
+    assert len(dee) == 1
+    assert (dee[0]['total'], dee[0]['decision']) == (from_json[1]['total'], from_json[1]['decision'])
+    assert len(from_store) == 5
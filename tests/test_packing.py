@@ -0,0 +1,24 @@
+"""Pack size planning (pipeline/packing.py)"""
+
+from pipeline.packing import MAX_PACK, OUTPUT_HEADROOM, plan_pack_size
+
+
+def test_budget_limits_the_pack():
+    # 1000 framework + 3 x (1000 resume + 12 delimiter + 1500 reply) = 8536 tokens
+    assert plan_pack_size(1000, [1000] * 8, 1000, 8600, {}) == 3
+    assert plan_pack_size(1000, [1000] * 8, 1000, 8500, {}) == 2
+
+
+def test_context_window_caps_the_budget():
+    assert plan_pack_size(1000, [1000] * 8, 1000, 100_000, {'context': 8600}) == 3
+
+
+def test_output_limit_caps_the_pack():
+    limits = {'output': 4 * 1000 * OUTPUT_HEADROOM}
+    assert plan_pack_size(1000, [1000] * 8, 1000, 1_000_000, limits) == 4
+
+
+def test_pack_never_exceeds_max_size_or_drops_below_one():
+    assert plan_pack_size(0, [10] * 20, 10, 1_000_000, {}) == MAX_PACK
+    assert plan_pack_size(1000, [50_000], 1000, 8000, {}) == 1
+    assert plan_pack_size(1000, [], 1000, 8000, {}) == 1
@@ -0,0 +1,34 @@
+"""Image token accounting and call estimates (pipeline/preflight.py)"""
+
+import pytest
+
+from pipeline.compact import OUTPUT_RATIO
+from pipeline.preflight import MIN_SAMPLES, estimate_call, image_tokens
+from pipeline.router import DEFAULT_OUTPUT_TOKENS
+
+
+@pytest.mark.parametrize('provider, size, tokens', [
+    # 2048x1024 -> 1536x768: 3x2 tiles
+    ('openai', (2048, 1024), 85 + 170 * 6),
+    # 4096x4096 -> 2048 -> 768x768: 2x2 tiles
+    ('openai', (4096, 4096), 85 + 170 * 4),
+    ('anthropic', (1000, 750), 1000),
+    # Capped at ~1.15 megapixels
+    ('anthropic', (1568, 1568), 1534),
+    ('google', (384, 384), 258),
+    ('google', (1700, 2200), 258 * 3 * 3),
+])
+def test_image_tokens(provider, size, tokens):
+    assert image_tokens(provider, *size) == tokens
+
+
+def test_compact_wire_scales_typical_output_only():
+    info = {'pricing': {'input': 1.0, 'output': 10.0}}
+    full = estimate_call(info, 'openai', 'gpt-5', 1000)
+    compact = estimate_call(info, 'openai', 'gpt-5', 1000, wire='compact')
+    assert full['output_tokens'] == DEFAULT_OUTPUT_TOKENS
+    assert compact['output_tokens'] == round(DEFAULT_OUTPUT_TOKENS * OUTPUT_RATIO)
+    assert compact['cost_usd'] < full['cost_usd']
+    # Measured sizes already reflect the wire format they were run with
+    perf = {'samples': MIN_SAMPLES, 'p50_ms': 20_000, 'avg_output_tokens': 1200}
+    assert estimate_call(info, 'openai', 'gpt-5', 1000, perf=perf, wire='compact')['output_tokens'] == 1200
@@ -0,0 +1,50 @@
+"""Local pre-screen features and verdicts (pipeline/prescreen.py)"""
+
+from pipeline.prescreen import extract_features, prescreen_analysis, prescreen_text
+
+
+FILLER = ' '.join(['roadmap'] * 60)
+
+BUILDER = f"""Ada Park
+github.com/adapark  adapark.substack.com  ada@studio.io
+Side projects: built a RAG chatbot with LangChain and fine-tuned embeddings; shipped an LLM eval
+harness in a weekend; deployed a machine learning reranker; prototyped ai agents with the OpenAI API.
+Led a team of four. {FILLER}
+"""
+
+MANAGER = f"""Bo Grant
+Managed a portfolio of enterprise programs. Led stakeholders and coordinated delivery; oversaw vendors,
+directed quarterly planning, aligned leadership and drove synergy with a visionary, innovative,
+transformative and cutting-edge strategy. {FILLER}
+"""
+
+
+def test_builder_resume_passes():
+    result = prescreen_text(BUILDER)
+    assert (result['verdict'], result['failed_checks']) == ('pass', [])
+    features = result['features']
+    assert features['links']['github'] == 1 and features['links']['blog'] == 1
+    assert features['speed_mentions'] == 1
+
+
+def test_manager_resume_fails_every_check():
+    result = prescreen_text(MANAGER)
+    assert result['verdict'] == 'fail'
+    assert len(result['failed_checks']) == 5
+
+
+def test_short_text_is_uncertain_never_failed():
+    assert prescreen_text('Scanned resume')['verdict'] == 'uncertain'
+
+
+def test_email_and_project_management_do_not_count():
+    features = extract_features('jane@studio.io led project management for model agent rollouts')
+    assert features['public_links'] == 0
+    assert (features['project_mentions'], features['ai_terms']) == (0, 0)
+
+
+def test_skip_report_is_a_local_no_screen():
+    analysis = prescreen_analysis(prescreen_text(MANAGER), MANAGER, 'bo.pdf')
+    assert (analysis['candidate_name'], analysis['decision'], analysis['total_score']) == ('Bo Grant', 'No Screen', 0)
+    assert analysis['minimum_thresholds_met']['building_in_public'] is False
+    assert analysis['_metadata']['provider'] == 'local'
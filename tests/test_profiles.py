@@ -0,0 +1,95 @@
+"""Role profile inheritance, validation and compiled-framework hashes (pipeline/profiles.py)"""
+
+import json
+
+import pytest
+
+from pipeline import profiles
+from pipeline.profiles import (DEFAULT_PROFILE, available_profiles, compile_framework, framework_metadata,
+                               load_framework, load_profile, profile_hash)
+
+
+@pytest.fixture(scope='module')
+def base():
+    return load_framework()
+
+
+def write(directory, name, data):
+    path = directory / f"{name}.json"
+    path.write_text(json.dumps(data))
+    return path
+
+
+def test_missing_sections_and_pillars_are_inherited(tmp_path, base):
+    pillar_1 = {**base['pillars']['pillar_1'], 'name': 'Infrastructure Depth', 'weight': 30}
+    write(tmp_path, 'infra_pm', {'version': '2026.1', 'red_flags': ['No on-call experience'],
+                                 'pillars': {'pillar_1': pillar_1}})
+    profile = load_profile('infra_pm', base, directory=tmp_path)
+
+    assert (profile['id'], profile['version']) == ('infra_pm', '2026.1')
+    assert profile['red_flags'] == ['No on-call experience']
+    assert profile['yellow_flags'] == base['yellow_flags']
+    assert profile['pillars']['pillar_1'] == pillar_1
+    assert profile['pillars']['pillar_2'] == base['pillars']['pillar_2']
+    assert profile['source_hash'] != base['source_hash']
+
+
+def test_version_is_never_inherited(tmp_path, base):
+    write(tmp_path, 'bare', {})
+    assert load_profile('bare', base, directory=tmp_path)['version'] is None
+    assert load_profile(DEFAULT_PROFILE, base) is base
+
+
+def test_shipped_profiles_load(base):
+    for name in available_profiles():
+        assert load_profile(name, base)['id'] == name
+
+
+@pytest.mark.parametrize('data, message', [
+    ({'pillars': {'pillar_7': {}}}, 'pillars must be exactly'),
+    ({'pillars': {'pillar_2': {'name': 'Product'}}}, 'pillar_2 is missing weight'),
+    ({'minimum_thresholds': {'personal_ai_projects': {}}}, 'minimum_thresholds must be exactly'),
+    ({'non_negotiable_pillar': 'pillar_9'}, 'non_negotiable_pillar must be a pillar key'),
+])
+def test_invalid_profiles_are_rejected(tmp_path, base, data, message):
+    write(tmp_path, 'broken', data)
+    with pytest.raises(ValueError, match=message):
+        load_profile('broken', base, directory=tmp_path)
+
+
+def test_unknown_profile_lists_the_available_ones(tmp_path, base):
+    write(tmp_path, 'growth_pm', {})
+    with pytest.raises(ValueError, match=r"unknown role profile 'nope' \(available: ai_pm, growth_pm\)"):
+        load_profile('nope', base, directory=tmp_path)
+
+
+def test_framework_requires_every_section(tmp_path, base):
+    write(tmp_path, 'partial', {key: value for key, value in base.items() if key not in ('red_flags', 'id')})
+    with pytest.raises(ValueError, match='missing red_flags'):
+        load_framework('partial', directory=tmp_path)
+
+
+def test_profile_hash_ignores_key_order_and_itself(base):
+    reordered = dict(reversed(list(base.items())))
+    assert profile_hash(reordered) == profile_hash(base) == base['source_hash']
+    assert profile_hash({**base, 'red_flags': []}) != base['source_hash']
+
+
+def test_framework_is_compiled_once_with_a_stable_hash(monkeypatch, base):
+    monkeypatch.setattr(profiles, '_COMPILED', {})
+    renders = []
+
+    def render(profile):
+        renders.append(profile['id'])
+        return {'context': profile['context'], 'instructions': '\n'.join(profile['instructions'])}
+
+    first = compile_framework(base, render)
+    assert compile_framework(dict(base), render) is first
+    assert renders == [DEFAULT_PROFILE]
+
+    # A fresh process renders the same text to the same hash; other text gets another one
+    monkeypatch.setattr(profiles, '_COMPILED', {})
+    assert compile_framework(base, render)['hash'] == first['hash']
+    changed = {**base, 'context': base['context'] + ' Remote-first.', 'source_hash': None}
+    assert compile_framework(changed, render)['hash'] != first['hash']
+    assert framework_metadata(first) == {'id': DEFAULT_PROFILE, 'version': base['version'], 'hash': first['hash']}
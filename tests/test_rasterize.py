@@ -0,0 +1,52 @@
+"""--render-pages parsing and image sizes (pipeline/rasterize.py)"""
+
+import PyPDF2
+import pytest
+
+from pipeline.rasterize import MAX_EDGE, grid_size, page_sizes, parse_pages, readable_dpi, select_pages
+
+
+@pytest.mark.parametrize('spec, pages', [
+    ('1', [1]),
+    ('1-2', [1, 2]),
+    (' 3, 1 ', [1, 3]),
+    ('1-3,2', [1, 2, 3]),
+    ('ALL', None),
+])
+def test_parse_pages(spec, pages):
+    assert parse_pages(spec) == pages
+
+
+@pytest.mark.parametrize('spec', ['', '0', '2-1', '1-', 'first', '1,,2'])
+def test_parse_pages_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_pages(spec)
+
+
+def test_select_pages():
+    assert select_pages(None, 3) == [1, 2, 3]
+    assert select_pages([2, 5], 3) == [2]
+    assert select_pages([4, 5], 3) == [1]
+
+
+def letter_pdf(tmp_path, pages=2):
+    writer = PyPDF2.PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(612, 792)
+    path = tmp_path / 'letter.pdf'
+    with open(path, 'wb') as f:
+        writer.write(f)
+    return path
+
+
+def test_page_images_stay_legible_where_the_grid_shrinks(tmp_path):
+    path = letter_pdf(tmp_path)
+    assert page_sizes(path, [1, 2], 200) == [(1700, 2200), (1700, 2200)]
+    # Two pages side by side in MAX_EDGE: about 120 dpi each
+    width, height = grid_size(page_sizes(path, [1, 2], 200))
+    assert width == MAX_EDGE and height < 1400
+    # One image per page: only lowered enough for the 2200px long edge to fit
+    dpi = readable_dpi(path, [1, 2], 200)
+    assert dpi == 186
+    assert max(page_sizes(path, [1], dpi)[0]) <= MAX_EDGE
+    assert readable_dpi(path, [1], 150) == 150
@@ -0,0 +1,98 @@
+"""Model router plans and failover (pipeline/router.py)"""
+
+import pytest
+
+from pipeline import router
+from pipeline.router import ModelRouter, is_clear_no_screen, is_unavailable
+
+
+MODELS = {
+    'openai': {'gpt-5': {'pricing': {'input': 1.25, 'output': 10.0}},
+               'gpt-5-mini': {'pricing': {'input': 0.25, 'output': 2.0}}},
+    'anthropic': {'claude-sonnet-4-5-20250929': {'pricing': {'input': 3.0, 'output': 15.0}},
+                  'claude-haiku-4-5': {'pricing': {'input': 1.0, 'output': 5.0}}},
+}
+DEFAULTS = {'openai': 'gpt-5', 'anthropic': 'claude-sonnet-4-5-20250929'}
+PROMPT = 'x' * 4000
+
+
+class FakeAnalyzer:
+    NON_NEGOTIABLE_PILLAR = 'pillar_3'
+
+    def __init__(self, provider, model, replies):
+        self.api_provider = provider
+        self.model = model
+        self.replies = replies
+
+    def create_analysis_prompt(self, resume_text):
+        return resume_text
+
+    def analyze_text(self, resume_text, resume_image=None, stats=None, record=True):
+        reply = self.replies.get(self.provider_model)
+        if isinstance(reply, Exception):
+            raise reply
+        return {**reply, '_metadata': {'provider': self.api_provider, 'model': self.model}}
+
+    @property
+    def provider_model(self):
+        return f"{self.api_provider}/{self.model}"
+
+
+def make_router(replies, **kwargs):
+    return ModelRouter(MODELS, ['openai', 'anthropic'], lambda p, m: FakeAnalyzer(p, m, replies),
+                       default_models=DEFAULTS, **kwargs)
+
+
+def names(options):
+    return [o['model'] for o in options]
+
+
+def test_plan_without_budget_uses_default_models_and_cheap_triage():
+    triage, final = make_router({}).plan(1000)
+    assert names(final) == ['gpt-5', 'claude-sonnet-4-5-20250929']
+    # Haiku costs more than half of GPT-5 for this prompt, so it is not worth a triage call
+    assert names(triage) == ['gpt-5-mini']
+
+
+def test_plan_with_budget_keeps_what_fits():
+    triage, final = make_router({}, budget=0.01).plan(1000)
+    assert (names(triage), names(final)) == ([], ['gpt-5-mini'])
+
+
+def test_clear_no_screen_triage_stops_there():
+    replies = {'openai/gpt-5-mini': {'decision': 'No Screen', 'total_score': 12}}
+    analysis = make_router(replies).analyze('resume.pdf', resume_text=PROMPT)
+    routing = analysis['_metadata']['routing']
+    assert analysis['_metadata']['model'] == 'gpt-5-mini'
+    assert (routing['escalated'], routing['reason']) == (False, 'triage verdict is a clear No Screen')
+
+
+def test_rate_limited_provider_fails_over_and_is_paused(monkeypatch):
+    monkeypatch.setattr(router.time, 'monotonic', lambda: 1000.0)
+    replies = {'openai/gpt-5-mini': Exception('Error code: 429 - rate limit exceeded'),
+               'anthropic/claude-sonnet-4-5-20250929': {'decision': 'Screen', 'total_score': 40}}
+    route = make_router(replies, cooldown=60)
+    analysis = route.analyze('resume.pdf', resume_text=PROMPT)
+
+    routing = analysis['_metadata']['routing']
+    assert analysis['_metadata']['model'] == 'claude-sonnet-4-5-20250929'
+    # gpt-5 is never tried: openai was paused by the triage failure
+    assert [(s['role'], s['model']) for s in routing['steps']] == [
+        ('triage', 'gpt-5-mini'), ('final', 'claude-sonnet-4-5-20250929')]
+    assert routing['failovers'] == 1
+    assert route.down_until == {'openai': 1060.0}
+
+
+@pytest.mark.parametrize('error, unavailable', [
+    (Exception('Error code: 503 overloaded'), True),
+    (Exception('connection reset'), True),
+    (ValueError('reply does not match the schema'), False),
+])
+def test_is_unavailable(error, unavailable):
+    assert is_unavailable(error) is unavailable
+
+
+def test_is_clear_no_screen_reads_the_given_pillar():
+    analysis = {'decision': 'No Screen', 'total_score': 22, 'pillars': {'pillar_1': {'score': 3}}}
+    assert is_clear_no_screen(analysis, 'pillar_1')
+    assert not is_clear_no_screen(analysis, 'pillar_3')
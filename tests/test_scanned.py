@@ -0,0 +1,62 @@
+"""Scanned-PDF triage routes (pipeline/scanned.py)"""
+
+from pathlib import Path
+
+import pytest
+
+from pipeline import scanned
+from pipeline.scanned import summarize_scans, triage_scanned
+
+
+def inspection(chars, scan_pages):
+    pages = len(chars)
+    page_texts = ['x' * count for count in chars]
+    return {
+        'status': 'scanned',
+        'pages': pages,
+        'text': '\n'.join(page_texts).strip(),
+        'chars_per_page': chars,
+        'image_coverage': [1.0 if number in scan_pages else 0.0 for number in range(1, pages + 1)],
+        'scan_pages': scan_pages,
+        'partial': len(scan_pages) < pages,
+        'page_texts': page_texts,
+    }
+
+
+FILES = {
+    'full.pdf': inspection([0], [1]),
+    'partial.pdf': inspection([900, 0], [2]),
+    # The text page is itself too short to score on
+    'thin.pdf': inspection([40, 0], [2]),
+}
+
+
+@pytest.fixture
+def no_renderer(monkeypatch):
+    monkeypatch.setattr(scanned, 'inspect_pdf', lambda path, text=None: dict(FILES[path.name]))
+    monkeypatch.setattr(scanned, 'ocr_available', lambda: False)
+    monkeypatch.setattr(scanned, 'rasterize_available', lambda: False)
+
+
+@pytest.mark.parametrize('mode', ['auto', 'skip', 'vision'])
+def test_partial_scan_with_text_pages_is_never_skipped(no_renderer, mode):
+    paths = [Path(name) for name in FILES]
+    texts = {}
+    scans = triage_scanned(paths, texts, mode)
+
+    assert {path.name: scan['route'] for path, scan in scans.items()} == {
+        'full.pdf': 'skip', 'partial.pdf': 'text', 'thin.pdf': 'skip'}
+    assert texts[Path('partial.pdf')] == 'x' * 900
+    summary = summarize_scans(scans, len(paths))
+    assert summary['routes'] == {'skip': 2, 'text': 1}
+    assert summary['skipped'] == ['full.pdf', 'thin.pdf']
+
+
+def test_vision_route_when_a_renderer_is_installed(no_renderer, monkeypatch):
+    monkeypatch.setattr(scanned, 'rasterize_available', lambda: True)
+    scans = triage_scanned([Path('partial.pdf')], {}, 'auto')
+
+    assert scans[Path('partial.pdf')]['route'] == 'vision'
+    assert scans[Path('partial.pdf')]['vision_pages'] == [2]
+    assert triage_scanned([Path('partial.pdf')], {}, 'auto', vision_allowed=False)[Path('partial.pdf')]['route'] \
+        == 'text'
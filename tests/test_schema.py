@@ -0,0 +1,74 @@
+"""Reply validation and local repair (pipeline/schema.py)"""
+
+from pipeline.schema import SCREEN_SCHEMA, analysis_schema, parse_json, repair, schema_outline, validate
+
+
+def screen_reply(**overrides):
+    reply = {
+        'candidate_name': 'Ada Lovelace',
+        'minimum_thresholds_met': {'personal_ai_projects': True, 'building_in_public': True,
+                                   'resume_creativity': False, 'all_met': False},
+        'red_flags_found': [],
+        'pillar_3': {'score': 7, 'evidence': 'Built an eval harness'},
+        'estimated_total_score': 38,
+        'confidence': 0.8,
+    }
+    reply.update(overrides)
+    return reply
+
+
+def test_valid_reply_has_no_errors():
+    assert validate(screen_reply(), SCREEN_SCHEMA) == []
+
+
+def test_validate_reports_missing_wrong_type_and_range():
+    reply = screen_reply(confidence='high', estimated_total_score=75)
+    del reply['candidate_name']
+    errors = validate(reply, SCREEN_SCHEMA)
+    assert any(error.startswith('$.candidate_name') for error in errors)
+    assert any(error.startswith('$.confidence') for error in errors)
+    assert any(error.startswith('$.estimated_total_score') for error in errors)
+
+
+def test_repair_coerces_strings_losslessly():
+    reply = screen_reply(red_flags_found='Only corporate AI experience',
+                         pillar_3={'score': '7/10', 'evidence': 'Built an eval harness'})
+    reply['minimum_thresholds_met']['all_met'] = 'no'
+    repaired, fixes = repair(reply, SCREEN_SCHEMA)
+    assert repaired['red_flags_found'] == ['Only corporate AI experience']
+    assert repaired['pillar_3']['score'] == 7
+    assert repaired['minimum_thresholds_met']['all_met'] is False
+    assert len(fixes) == 3
+    assert validate(repaired, SCREEN_SCHEMA) == []
+
+
+def test_repair_fixes_enum_case():
+    schema = analysis_schema({'pillar_1': 'Product Sense'})
+    repaired, fixes = repair({'decision': 'no screen', 'pillars': {'pillar_1': {'name': 'product'}}}, schema)
+    assert repaired['decision'] == 'No Screen'
+    # A single-value enum (the pillar name) has only one possible answer
+    assert repaired['pillars']['pillar_1']['name'] == 'Product Sense'
+    assert len(fixes) == 2
+
+
+def test_repair_leaves_missing_and_out_of_range_fields_to_validation():
+    reply = screen_reply(estimated_total_score=75)
+    del reply['minimum_thresholds_met']['all_met']
+    del reply['candidate_name']
+    repaired, fixes = repair(reply, SCREEN_SCHEMA)
+    assert fixes == []
+    assert 'candidate_name' not in repaired
+    assert 'all_met' not in repaired['minimum_thresholds_met']
+    assert repaired['estimated_total_score'] == 75
+    assert len(validate(repaired, SCREEN_SCHEMA)) == 3
+
+
+def test_parse_json_tolerates_fences_and_trailing_commas():
+    assert parse_json('Here you go:\n```json\n{"a": [1, 2,],}\n```') == {'a': [1, 2]}
+
+
+def test_outline_placeholders_are_unquoted():
+    outline = schema_outline(SCREEN_SCHEMA)
+    assert '"all_met": true/false' in outline
+    assert '"score": 0-10' in outline
+    assert '"candidate_name": "Name from resume"' in outline
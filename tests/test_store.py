@@ -0,0 +1,69 @@
+"""Results store migrations and query filters (pipeline/store.py)"""
+
+import sqlite3
+
+import pytest
+
+from pipeline.store import SCHEMA_VERSION, ResultsStore, parse_date, parse_pillar_filter
+
+
+def analysis(name, total, pillar_3, decision='Screen', red_flags=(), provider='openai'):
+    return {
+        'candidate_name': name,
+        'decision': decision,
+        'total_score': total,
+        'pillars': {'pillar_3': {'score': pillar_3, 'level': 'Advanced'}},
+        'red_flags_found': list(red_flags),
+        'minimum_thresholds_met': {'all_met': True},
+        '_metadata': {'provider': provider, 'model': 'gpt-5'},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    with ResultsStore(tmp_path / 'results.db') as store:
+        store.add_analysis(analysis('Ada', 48, 9, 'Strong Screen'), analyzed_at='2026-10-18T09:00:00')
+        store.add_analysis(analysis('Ben', 38, 6), analyzed_at='2026-10-19T23:30:00')
+        store.add_analysis(analysis('Cy', 20, 4, 'No Screen', ['Only corporate AI'], 'google'),
+                           analyzed_at='2026-10-20T08:00:00')
+        yield store
+
+
+def names(rows):
+    return [row['candidate_name'] for row in rows]
+
+
+def test_old_store_is_migrated(tmp_path):
+    path = tmp_path / 'old.db'
+    conn = sqlite3.connect(str(path))
+    conn.execute('CREATE TABLE analyses (id INTEGER PRIMARY KEY, candidate_name TEXT, decision TEXT, '
+                 'total_score REAL, weighted_score REAL, provider TEXT, model TEXT, mode TEXT, thresholds_met INTEGER, '
+                 'analyzed_at TEXT NOT NULL, source_file TEXT, json_path TEXT UNIQUE, data TEXT NOT NULL)')
+    conn.commit()
+    conn.close()
+    with ResultsStore(path) as store:
+        assert store.conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION
+        columns = {row[1] for row in store.conn.execute('PRAGMA table_info(analyses)')}
+        assert {'duration_ms', 'output_tokens', 'speed', 'role', 'framework'} <= columns
+        store.add_analysis(analysis('Ada', 48, 9))
+        assert names(store.query()) == ['Ada']
+
+
+def test_filters_and_sorting(store):
+    assert names(store.query()) == ['Ada', 'Ben', 'Cy']
+    assert names(store.query(decision=['Screen', 'Strong Screen'], sort='name', descending=False)) == ['Ada', 'Ben']
+    assert names(store.query(pillar_filters=[parse_pillar_filter('3>=6')])) == ['Ada', 'Ben']
+    assert names(store.query(red_flags=True)) == ['Cy']
+    assert names(store.query(provider='google')) == ['Cy']
+    assert store.query(limit=1)[0]['pillar_3'] == 9
+
+
+def test_date_only_until_includes_that_day(store):
+    until = parse_date('2026-10-19', end=True)
+    assert names(store.query(since=parse_date('2026-10-19'), until=until)) == ['Ben']
+    assert names(store.query(until=parse_date('2026-10-19T23:30', end=True))) == ['Ada', 'Ben']
+
+
+def test_invalid_pillar_filter():
+    with pytest.raises(ValueError):
+        parse_pillar_filter('7>=3')
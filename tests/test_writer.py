@@ -0,0 +1,32 @@
+"""Report filenames and atomic writes (templates/writer.py)"""
+
+from templates import writer
+from templates.writer import AtomicBatch, reserve_base_filename
+
+
+def test_same_second_names_get_a_suffix(tmp_path):
+    first = reserve_base_filename(tmp_path, 'Jane Doe', timestamp='20251019_101500')
+    second = reserve_base_filename(tmp_path, 'Jane Doe', timestamp='20251019_101500')
+    assert (first, second) == ('Jane_Doe_20251019_101500', 'Jane_Doe_20251019_101500-2')
+
+
+def test_names_are_claimed_on_disk_across_processes(tmp_path):
+    first = reserve_base_filename(tmp_path, 'Jane Doe', timestamp='20251019_101500')
+    # Another process: its own snapshot of the folder, taken before the first one wrote anything
+    writer._existing_stems[str(tmp_path)] = set()
+    second = reserve_base_filename(tmp_path, 'Jane Doe', timestamp='20251019_101500')
+    assert second != first
+
+
+def test_existing_reports_are_not_reused(tmp_path):
+    (tmp_path / 'Jane_Doe_DEEP_20251019_101500_openai.json').write_text('{}')
+    assert reserve_base_filename(tmp_path, 'Jane Doe', 'DEEP', '20251019_101500') == 'Jane_Doe_DEEP_20251019_101500-2'
+
+
+def test_atomic_batch_publishes_complete_files_only(tmp_path):
+    target = tmp_path / 'report.md'
+    with AtomicBatch() as batch:
+        batch.write_text(target, 'done')
+        assert not target.exists()
+    assert target.read_text() == 'done'
+    assert [path.name for path in tmp_path.iterdir()] == ['report.md']